@@ -11,11 +11,26 @@ Uso básico:
     result = compile(codigo_fonte)
     if result['success']:
         print(result['assembly'])
-"""
 
-from .main import compile, compile_file
+Em código asyncio:
+    from compiler import compile_async
+    
+    result = await compile_async(codigo_fonte, timeout=2.0)
+"""
 
 __version__ = "1.0.0"
 __author__ = "Projeto Compilador"
 
-__all__ = ['compile', 'compile_file']
+__all__ = ['compile', 'compile_file', 'compile_async']
+
+
+def __getattr__(name):
+    # Importa o pipeline só quando usado: módulos leves como compiler.client
+    # não pagam a construção do lexer PLY ao importar o pacote
+    if name in ('compile', 'compile_file'):
+        from . import main
+        return getattr(main, name)
+    if name == 'compile_async':
+        from . import aio
+        return aio.compile_async
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,169 @@
+"""
+Compilação Assíncrona - API para asyncio
+compile_async roda o pipeline num pool de processos sem bloquear o event
+loop e sem escrever no stdout. Há um limite de pedidos em andamento
+(backpressure: quem passar do limite espera uma vaga), timeout opcional por
+pedido e agrupamento: pedidos que chegam juntos vão para o mesmo worker
+numa única ida e volta
+
+Uso:
+    from compiler import compile_async
+
+    result = await compile_async(codigo, timeout=2.0)
+
+    async with AsyncCompiler(max_workers=4, max_in_flight=64) as compilador:
+        results = await asyncio.gather(*(compilador.compile(c) for c in codigos))
+"""
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .main import compile
+
+
+# Campos do resultado de compile() que voltam do worker (AST, tokens,
+# tabela de símbolos e interner ficam no processo que compilou)
+RESULT_FIELDS = ('success', 'errors', 'ir', 'algebraic_ir', 'optimized_ir', 'assembly', 'timings')
+
+
+def _compile_batch(batch):
+    """Compila uma lista de (fonte, opções) num único round trip"""
+    results = []
+    for source_code, options in batch:
+        result = compile(source_code, **options)
+        results.append({field: result.get(field) for field in RESULT_FIELDS})
+    return results
+
+
+class AsyncCompiler:
+    """
+    Compilador assíncrono com pool de processos próprio
+
+    Args:
+        max_workers (int): Processos do pool (padrão: os.cpu_count())
+        max_in_flight (int): Máximo de pedidos aceitos e ainda não terminados
+                             no pool (inclusive os que expiraram)
+        batch_size (int): Pedidos por round trip com o worker
+        batch_delay (float): Segundos que um pedido espera por companhia
+                             antes de ir sozinho para o pool
+    """
+
+    def __init__(self, max_workers=None, max_in_flight=32, batch_size=8, batch_delay=0.001):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.round_trips = 0     # lotes enviados ao pool
+        self.running = 0         # pedidos no pool ainda sem resposta
+        self._executor = None
+        self._loop = None
+        self._semaphore = None
+        self._pending = []       # (fonte, opções, future) aguardando o próximo lote
+        self._flush_handle = None
+
+    def _start(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.max_workers)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Semáforo e lote pendente pertencem a um event loop: pedidos
+            # ainda na fila de outro loop vivo ficariam sem resposta
+            if self._pending and not self._loop.is_closed():
+                raise RuntimeError("AsyncCompiler tem pedidos pendentes em outro event loop")
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._pending = []
+            self._flush_handle = None
+        return loop
+
+    async def compile(self, source_code, optimize=True, backend='ply', frame_slots=False,
+                      timeout=None):
+        """
+        Compila source_code num worker
+
+        Returns:
+            dict: success, errors, ir, algebraic_ir, optimized_ir, assembly,
+                  timings (mesmos valores de compiler.main.compile)
+
+        Raises:
+            TimeoutError: se timeout (segundos) expirar antes da resposta
+        """
+        loop = self._start()
+        options = {'optimize': optimize, 'backend': backend, 'frame_slots': frame_slots}
+        # A vaga só é devolvida quando o worker termina (ver _flush): um
+        # pedido que expira continua ocupando o pool até lá
+        await self._semaphore.acquire()
+        future = loop.create_future()
+        self._pending.append((source_code, options, future))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_delay, self._flush)
+        return await asyncio.wait_for(future, timeout)
+
+    def _flush(self):
+        """Envia os pedidos pendentes (os não cancelados) como um lote"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        semaphore = self._semaphore
+        batch = []
+        for item in self._pending:
+            if item[2].done():     # expirou antes de ir para o pool
+                semaphore.release()
+            else:
+                batch.append(item)
+        self._pending = []
+        if not batch:
+            return
+
+        futures = [future for _, _, future in batch]
+        work = self._loop.run_in_executor(self._executor, _compile_batch,
+                                          [(source, options) for source, options, _ in batch])
+        self.round_trips += 1
+        self.running += len(batch)
+
+        def deliver(work):
+            self.running -= len(futures)
+            for _ in futures:
+                semaphore.release()
+            error = work.exception() if not work.cancelled() else asyncio.CancelledError()
+            results = work.result() if error is None else None
+            for index, future in enumerate(futures):
+                if future.done():      # timeout: a resposta é descartada
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(results[index])
+
+        work.add_done_callback(deliver)
+
+    async def close(self):
+        """Envia o que estiver pendente e encerra o pool"""
+        if self._pending:
+            self._flush()
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+_default_compiler = None
+
+
+async def compile_async(source_code, optimize=True, backend='ply', frame_slots=False, timeout=None):
+    """
+    Versão assíncrona de compile() usando um AsyncCompiler compartilhado
+    (pool com os.cpu_count() processos, criado no primeiro uso)
+    """
+    global _default_compiler
+    if _default_compiler is None:
+        _default_compiler = AsyncCompiler()
+    return await _default_compiler.compile(source_code, optimize=optimize, backend=backend,
+                                           frame_slots=frame_slots, timeout=timeout)
@@ -5,6 +5,7 @@ Módulo de análise semântica e tabela de símbolos
 
 from .ast_builder import *
 from .analyzer import SemanticAnalyzer
-from .symbol_table import SymbolTable
+from .symbol_table import SymbolTable, FlatSymbolTable
+from .visitor import Visitor
 
-__all__ = ['SemanticAnalyzer', 'SymbolTable', 'build_ast', 'print_ast']
+__all__ = ['SemanticAnalyzer', 'SymbolTable', 'FlatSymbolTable', 'Visitor', 'build_ast', 'print_ast']
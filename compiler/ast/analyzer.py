@@ -4,10 +4,12 @@ Verifica tipos, escopos e declarações
 """
 from .ast_builder import *
 from .symbol_table import SymbolTable
+from .visitor import Visitor
 
-class SemanticAnalyzer:
-    def __init__(self):
-        self.symbol_table = SymbolTable()
+class SemanticAnalyzer(Visitor):
+    def __init__(self, symbol_table=None):
+        # Qualquer tabela com a API de SymbolTable (ex.: FlatSymbolTable)
+        self.symbol_table = symbol_table if symbol_table is not None else SymbolTable()
         self.errors = []
         self.current_function = None
     
@@ -20,12 +22,10 @@ class SemanticAnalyzer:
     def error(self, message):
         self.errors.append(message)
     
-    def visit(self, node):
-        if node is None:
-            return None
-        method_name = f'visit_{node.node_type}'
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
+    def resolve(self, node, symbol):
+        """Anota o nó com (nível do escopo, offset) do símbolo: o slot no frame"""
+        node.depth = symbol['level']
+        node.slot = symbol['offset']
     
     def generic_visit(self, node):
         self.error(f"Tipo de nó não suportado: {node.node_type}")
@@ -33,14 +33,26 @@ class SemanticAnalyzer:
     
     def visit_program(self, node):
         for decl in node.declarations:
-            self.visit(decl)
+            yield decl
     
     def visit_function(self, node):
+        if self.declare_function(node):
+            yield from self.analyze_function_body(node)
+    
+    def declare_function(self, node):
+        """Registra a assinatura da função no escopo atual; False se já declarada"""
         if self.symbol_table.lookup(node.name, current_scope_only=True):
             self.error(f"Função '{node.name}' já declarada")
-            return
-        
+            return False
         self.symbol_table.insert(node.name, 'function', params=node.params)
+        return True
+    
+    def analyze_function_body(self, node):
+        """
+        Analisa parâmetros e corpo de uma função já declarada
+        Só depende dos símbolos globais visíveis na declaração, então pode
+        rodar isolado (ver compiler/parallel.py) via self.run(...)
+        """
         self.symbol_table.enter_scope(node.name)
         self.current_function = node.name
         
@@ -52,8 +64,8 @@ class SemanticAnalyzer:
         
         has_return = False
         for stmt in node.body:
-            self.visit(stmt)
-            if isinstance(stmt, ReturnNode):
+            yield stmt
+            if stmt is not None and stmt.node_type == 'return':
                 has_return = True
         
         if not has_return:
@@ -66,15 +78,17 @@ class SemanticAnalyzer:
         if self.symbol_table.lookup(node.name, current_scope_only=True):
             self.error(f"Variável '{node.name}' já declarada")
             return
-        value_type = self.visit(node.value)
-        self.symbol_table.insert(node.name, value_type or 'int')
+        value_type = yield node.value
+        symbol = self.symbol_table.insert(node.name, value_type or 'int')
+        self.resolve(node, symbol)
     
     def visit_assign(self, node):
         symbol = self.symbol_table.lookup(node.name)
         if not symbol:
             self.error(f"Variável '{node.name}' não declarada")
             return
-        value_type = self.visit(node.value)
+        self.resolve(node, symbol)
+        value_type = yield node.value
         if value_type and value_type != symbol['type']:
             self.error(f"Tipo incompatível em '{node.name}'")
     
@@ -83,15 +97,15 @@ class SemanticAnalyzer:
             self.error("'return' fora de função")
             return
         if node.value:
-            return self.visit(node.value)
+            return (yield node.value)
         return None
     
     def visit_print(self, node):
-        return self.visit(node.value)
+        return (yield node.value)
     
     def visit_binop(self, node):
-        left_type = self.visit(node.left)
-        right_type = self.visit(node.right)
+        left_type = yield node.left
+        right_type = yield node.right
         if left_type and right_type and left_type != right_type:
             self.error(f"Tipos incompatíveis: {left_type} e {right_type}")
         return left_type or right_type or 'int'
@@ -104,6 +118,7 @@ class SemanticAnalyzer:
         if not symbol:
             self.error(f"Variável '{node.name}' não declarada")
             return None
+        self.resolve(node, symbol)
         return symbol['type']
     
     def visit_call(self, node):
@@ -122,7 +137,7 @@ class SemanticAnalyzer:
             self.error(f"'{node.name}' espera {expected} argumentos, recebeu {actual}")
         
         for i, arg in enumerate(node.args):
-            arg_type = self.visit(arg)
+            arg_type = yield arg
             if i < expected:
                 param = symbol['params'][i]
                 if arg_type and arg_type != param.param_type:
@@ -131,33 +146,33 @@ class SemanticAnalyzer:
         return 'int'
     
     def visit_if(self, node):
-        cond_type = self.visit(node.condition)
+        cond_type = yield node.condition
         if cond_type != 'int':
             self.error("Condição do IF deve ser do tipo int")
 
         for stmt in node.then_block:
-            self.visit(stmt)
+            yield stmt
 
         if node.else_block:
             for stmt in node.else_block:
-                self.visit(stmt)
+                yield stmt
 
     def visit_while(self, node):
-        cond_type = self.visit(node.condition)
+        cond_type = yield node.condition
         if cond_type != 'int':
             self.error("Condição do WHILE deve ser do tipo int")
 
         for stmt in node.body:
-            self.visit(stmt)
+            yield stmt
     def visit_for(self, node):
-        self.visit(node.init)
+        yield node.init
 
-        cond_type = self.visit(node.condition)
+        cond_type = yield node.condition
         if cond_type != 'int':
             self.error("Condição do for deve ser int")
 
         for stmt in node.body:
-            self.visit(stmt)
+            yield stmt
 
-        self.visit(node.increment)
+        yield node.increment
 
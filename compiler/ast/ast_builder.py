@@ -2,86 +2,166 @@
 AST - Abstract Syntax Tree
 Define estrutura e construtor de AST a partir do Parse Tree
 """
+from .trampoline import trampoline
+
+# Anotações preenchidas pela análise semântica em IdNode, AssignNode e
+# DeclAssignNode: nível do escopo do símbolo (0 = global) e slot no frame
+RESOLVED = ('depth', 'slot')
 
 class ASTNode:
-    """Nó base da AST"""
-    def __init__(self, node_type, **attrs):
-        self.node_type = node_type
-        self.__dict__.update(attrs)
+    """
+    Nó base da AST
+    Cada subclasse declara seus campos em __slots__ (sem __dict__ por nó)
+    e o tipo do nó no atributo de classe node_type; _fields são os campos
+    estruturais (sem as anotações de RESOLVED)
+    """
+    __slots__ = ()
+    node_type = None
+    _fields = ()
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = tuple(f for f in cls.__slots__ if f not in RESOLVED)
     
     def __repr__(self):
-        attrs = {k: v for k, v in self.__dict__.items() if k != 'node_type'}
+        attrs = {k: getattr(self, k) for k in self._fields}
         return f"{self.node_type}({attrs})"
 
 class ProgramNode(ASTNode):
     """Nó raiz do programa"""
+    __slots__ = ('declarations',)
+    node_type = 'program'
+    
     def __init__(self, declarations):
-        super().__init__('program', declarations=declarations)
+        self.declarations = declarations
 
 class FunctionNode(ASTNode):
     """Nó de declaração de função"""
+    __slots__ = ('name', 'params', 'body')
+    node_type = 'function'
+    
     def __init__(self, name, params, body):
-        super().__init__('function', name=name, params=params, body=body)
+        self.name = name
+        self.params = params
+        self.body = body
 
 class ParameterNode(ASTNode):
     """Nó de parâmetro de função"""
+    __slots__ = ('name', 'param_type')
+    node_type = 'parameter'
+    
     def __init__(self, name, param_type):
-        super().__init__('parameter', name=name, param_type=param_type)
+        self.name = name
+        self.param_type = param_type
 
 class DeclAssignNode(ASTNode):
     """Nó de declaração com atribuição"""
-    def __init__(self, name, value):
-        super().__init__('decl_assign', name=name, value=value)
+    __slots__ = ('name', 'value') + RESOLVED
+    node_type = 'decl_assign'
+    
+    def __init__(self, name, value, depth=None, slot=None):
+        self.name = name
+        self.value = value
+        self.depth = depth
+        self.slot = slot
 
 class AssignNode(ASTNode):
     """Nó de atribuição"""
-    def __init__(self, name, value):
-        super().__init__('assign', name=name, value=value)
+    __slots__ = ('name', 'value') + RESOLVED
+    node_type = 'assign'
+    
+    def __init__(self, name, value, depth=None, slot=None):
+        self.name = name
+        self.value = value
+        self.depth = depth
+        self.slot = slot
 
 class ReturnNode(ASTNode):
     """Nó de retorno"""
+    __slots__ = ('value',)
+    node_type = 'return'
+    
     def __init__(self, value):
-        super().__init__('return', value=value)
+        self.value = value
 
 class PrintNode(ASTNode):
     """Nó de impressão"""
+    __slots__ = ('value',)
+    node_type = 'print'
+    
     def __init__(self, value):
-        super().__init__('print', value=value)
+        self.value = value
 
 class BinOpNode(ASTNode):
     """Nó de operação binária"""
+    __slots__ = ('op', 'left', 'right')
+    node_type = 'binop'
+    
     def __init__(self, op, left, right):
-        super().__init__('binop', op=op, left=left, right=right)
+        self.op = op
+        self.left = left
+        self.right = right
 
 class NumberNode(ASTNode):
     """Nó de número literal"""
+    __slots__ = ('value',)
+    node_type = 'number'
+    
     def __init__(self, value):
-        super().__init__('number', value=value)
+        self.value = value
 
 class IdNode(ASTNode):
     """Nó de identificador"""
-    def __init__(self, name):
-        super().__init__('id', name=name)
+    __slots__ = ('name',) + RESOLVED
+    node_type = 'id'
+    
+    def __init__(self, name, depth=None, slot=None):
+        self.name = name
+        self.depth = depth
+        self.slot = slot
 
 class CallNode(ASTNode):
     """Nó de chamada de função"""
+    __slots__ = ('name', 'args')
+    node_type = 'call'
+    
     def __init__(self, name, args):
-        super().__init__('call', name=name, args=args)
+        self.name = name
+        self.args = args
+
 class IfNode(ASTNode):
+    __slots__ = ('condition', 'then_block', 'else_block')
+    node_type = 'if'
+    
     def __init__(self, condition, then_block, else_block):
-        super().__init__('if', condition=condition, then_block=then_block, else_block=else_block)
+        self.condition = condition
+        self.then_block = then_block
+        self.else_block = else_block
 
 class WhileNode(ASTNode):
+    __slots__ = ('condition', 'body')
+    node_type = 'while'
+    
     def __init__(self, condition, body):
-        super().__init__('while', condition=condition, body=body)
+        self.condition = condition
+        self.body = body
 
 class BlockNode(ASTNode):
+    __slots__ = ('statements',)
+    node_type = 'block'
+    
     def __init__(self, statements):
-        super().__init__('block', statements=statements)
+        self.statements = statements
 
 class ForNode(ASTNode):
+    __slots__ = ('init', 'condition', 'increment', 'body')
+    node_type = 'for'
+    
     def __init__(self, init, condition, increment, body):
-        super().__init__('for', init=init, condition=condition, increment=increment, body=body)
+        self.init = init
+        self.condition = condition
+        self.increment = increment
+        self.body = body
 
 
 
@@ -91,83 +171,114 @@ def build_ast(parse_tree):
     Converte Parse Tree em AST
     Recebe: tupla do parser (parse_tree)
     Retorna: ASTNode estruturado
+    Percorre a árvore com pilha explícita (sem limite de profundidade)
     """
+    return trampoline(_build_step, parse_tree)
+
+
+def _build_step(parse_tree):
+    """Passo do build_ast: folhas retornam o nó; nós compostos são geradores"""
     if not parse_tree:
         return None
     
     node_type = parse_tree[0]
     
+    # Parâmetro
+    if node_type == 'param':
+        return ParameterNode(parse_tree[1], parse_tree[2])
+    
+    # Número
+    elif node_type == 'num':
+        return NumberNode(parse_tree[1])
+    
+    # Identificador
+    elif node_type == 'id':
+        return IdNode(parse_tree[1])
+    
+    return _build_composite(parse_tree)
+
+
+def _build_composite(parse_tree):
+    """Constrói nós com filhos: cada `yield` devolve o filho já convertido"""
+    node_type = parse_tree[0]
+    
     # Programa
     if node_type == 'program':
-        declarations = [build_ast(decl) for decl in parse_tree[1]]
+        declarations = []
+        for decl in parse_tree[1]:
+            declarations.append((yield decl))
         return ProgramNode(declarations)
     
     # Função
     elif node_type == 'function':
         name = parse_tree[1]
-        params = [build_ast(p) for p in parse_tree[2]]
-        body = [build_ast(stmt) for stmt in parse_tree[3]]
+        params = []
+        for p in parse_tree[2]:
+            params.append((yield p))
+        body = []
+        for stmt in parse_tree[3]:
+            body.append((yield stmt))
         return FunctionNode(name, params, body)
     
-    # Parâmetro
-    elif node_type == 'param':
-        return ParameterNode(parse_tree[1], parse_tree[2])
-    
     # Declaração com atribuição
     elif node_type == 'decl_assign':
-        return DeclAssignNode(parse_tree[1], build_ast(parse_tree[2]))
+        return DeclAssignNode(parse_tree[1], (yield parse_tree[2]))
     
     # Atribuição
     elif node_type == 'assign':
-        return AssignNode(parse_tree[1], build_ast(parse_tree[2]))
+        return AssignNode(parse_tree[1], (yield parse_tree[2]))
     
     # Retorno
     elif node_type == 'return':
-        value = build_ast(parse_tree[1]) if parse_tree[1] else None
+        value = (yield parse_tree[1]) if parse_tree[1] else None
         return ReturnNode(value)
 
     elif node_type == 'if':
-        cond = build_ast(parse_tree[1])
-        then_block = [build_ast(s) for s in parse_tree[2]]
+        cond = yield parse_tree[1]
+        then_block = []
+        for s in parse_tree[2]:
+            then_block.append((yield s))
         else_raw = parse_tree[3]
-        else_block = [build_ast(s) for s in else_raw] if else_raw else None
+        else_block = None
+        if else_raw:
+            else_block = []
+            for s in else_raw:
+                else_block.append((yield s))
         return IfNode(cond, then_block, else_block)
 
     elif node_type == 'while':
-        cond = build_ast(parse_tree[1])
-        body = [build_ast(s) for s in parse_tree[2]]
+        cond = yield parse_tree[1]
+        body = []
+        for s in parse_tree[2]:
+            body.append((yield s))
         return WhileNode(cond, body)
 
     
     # Print
     elif node_type == 'print':
-        return PrintNode(build_ast(parse_tree[1]))
+        return PrintNode((yield parse_tree[1]))
     
     # Operações binárias
-    elif node_type in ('+', '-', '*', '/', '<', '>', '<=', '>=', '==', '!='):
-        return BinOpNode(node_type, build_ast(parse_tree[1]), build_ast(parse_tree[2]))
-    
-    # Número
-    elif node_type == 'num':
-        return NumberNode(parse_tree[1])
-    
-    # Identificador
-    elif node_type == 'id':
-        return IdNode(parse_tree[1])
+    elif node_type in ('+', '-', '*', '/', '<', '>', '<=', '>=', '==', '!=',
+                       'LT', 'GT', 'LE', 'GE', 'EQ', 'NE'):
+        left = yield parse_tree[1]
+        right = yield parse_tree[2]
+        return BinOpNode(node_type, left, right)
     
     # Chamada de função
     elif node_type == 'call':
-        args = [build_ast(arg) for arg in parse_tree[2]]
+        args = []
+        for arg in parse_tree[2]:
+            args.append((yield arg))
         return CallNode(parse_tree[1], args)
     
-    elif node_type in ('LT','GT','LE','GE','EQ','NE'):
-        return BinOpNode(node_type, build_ast(parse_tree[1]), build_ast(parse_tree[2]))
-    
     elif node_type == 'for':
-        init = build_ast(parse_tree[1])
-        cond = build_ast(parse_tree[2])
-        inc = build_ast(parse_tree[3])
-        body = [build_ast(s) for s in parse_tree[4]]
+        init = yield parse_tree[1]
+        cond = yield parse_tree[2]
+        inc = yield parse_tree[3]
+        body = []
+        for s in parse_tree[4]:
+            body.append((yield s))
         return ForNode(init, cond, inc, body)
     
     else:
@@ -175,48 +286,54 @@ def build_ast(parse_tree):
 
 
 def print_ast(node, indent=0):
-    """Imprime AST de forma legível"""
+    """Imprime AST de forma legível (pilha explícita, sem recursão)"""
+    trampoline(_print_step, (node, indent))
+
+
+def _print_step(item):
+    """Passo do print_ast: imprime o nó e faz `yield` de (filho, indentação)"""
+    node, indent = item
     prefix = "  " * indent
     
     if isinstance(node, ProgramNode):
         print(f"{prefix}PROGRAM")
         for decl in node.declarations:
-            print_ast(decl, indent + 1)
+            yield decl, indent + 1
     
     elif isinstance(node, FunctionNode):
         print(f"{prefix}FUNCTION {node.name}")
         if node.params:
             print(f"{prefix}  PARAMS:")
             for param in node.params:
-                print_ast(param, indent + 2)
+                yield param, indent + 2
         print(f"{prefix}  BODY:")
         for stmt in node.body:
-            print_ast(stmt, indent + 2)
+            yield stmt, indent + 2
     
     elif isinstance(node, ParameterNode):
         print(f"{prefix}{node.param_type} {node.name}")
     
     elif isinstance(node, DeclAssignNode):
         print(f"{prefix}DECL_ASSIGN {node.name} =")
-        print_ast(node.value, indent + 1)
+        yield node.value, indent + 1
     
     elif isinstance(node, AssignNode):
         print(f"{prefix}ASSIGN {node.name} =")
-        print_ast(node.value, indent + 1)
+        yield node.value, indent + 1
     
     elif isinstance(node, ReturnNode):
         print(f"{prefix}RETURN")
         if node.value:
-            print_ast(node.value, indent + 1)
+            yield node.value, indent + 1
     
     elif isinstance(node, PrintNode):
         print(f"{prefix}PRINT")
-        print_ast(node.value, indent + 1)
+        yield node.value, indent + 1
     
     elif isinstance(node, BinOpNode):
         print(f"{prefix}{node.op}")
-        print_ast(node.left, indent + 1)
-        print_ast(node.right, indent + 1)
+        yield node.left, indent + 1
+        yield node.right, indent + 1
     
     elif isinstance(node, NumberNode):
         print(f"{prefix}{node.value}")
@@ -227,7 +344,7 @@ def print_ast(node, indent=0):
     elif isinstance(node, CallNode):
         print(f"{prefix}CALL {node.name}")
         for arg in node.args:
-            print_ast(arg, indent + 1)
+            yield arg, indent + 1
 
 
 # Para testes
@@ -0,0 +1,303 @@
+"""
+AST Plana - Arena de nós em arrays paralelos
+Para programas gerados com milhões de nós: em vez de um objeto Python por
+nó, cada compilação usa uma arena com colunas
+    kinds   → array('B') com o código do tipo do nó (KIND_CODES)
+    offsets → array('I') com o início dos campos do nó em `fields`
+    fields  → array('I') com índices de filhos (0 = None) ou de payloads
+    data    → lista de payloads internados (nomes, operadores, literais)
+    resolved → dict índice → (depth, slot) com as anotações da análise semântica
+Listas de filhos (body, args, ...) são nós LIST: fields = [n, filho1, ..., filhoN]
+
+O acesso é feito por visões leves (FlatNode) com a mesma interface dos
+ASTNode, então SemanticAnalyzer e IRGenerator percorrem a arena sem mudanças
+"""
+from array import array
+
+from .ast_builder import (
+    RESOLVED, ProgramNode, FunctionNode, ParameterNode, DeclAssignNode, AssignNode,
+    ReturnNode, PrintNode, BinOpNode, NumberNode, IdNode, CallNode,
+    IfNode, WhileNode, BlockNode, ForNode,
+)
+from .trampoline import trampoline
+
+
+# ═══════════════════════════════════════════════════════
+# ESQUEMA DOS NÓS
+# ═══════════════════════════════════════════════════════
+
+NODE = 'node'   # índice de um nó filho
+LIST = 'list'   # índice de um nó LIST
+DATA = 'data'   # índice em FlatAST.data
+
+# Classe de nó → categoria de cada campo, na ordem de _fields
+SCHEMA = {
+    ProgramNode:    (LIST,),
+    FunctionNode:   (DATA, LIST, LIST),
+    ParameterNode:  (DATA, DATA),
+    DeclAssignNode: (DATA, NODE),
+    AssignNode:     (DATA, NODE),
+    ReturnNode:     (NODE,),
+    PrintNode:      (NODE,),
+    BinOpNode:      (DATA, NODE, NODE),
+    NumberNode:     (DATA,),
+    IdNode:         (DATA,),
+    CallNode:       (DATA, LIST),
+    IfNode:         (NODE, LIST, LIST),
+    WhileNode:      (NODE, LIST),
+    BlockNode:      (LIST,),
+    ForNode:        (NODE, NODE, NODE, LIST),
+}
+
+NODE_CLASSES = list(SCHEMA)
+# Código 0 é o nó nulo (índice 0 da arena) e o último é a lista de filhos
+KIND_NONE = 0
+KIND_CODES = {cls.node_type: code for code, cls in enumerate(NODE_CLASSES, start=1)}
+KIND_LIST = len(NODE_CLASSES) + 1
+
+
+# ═══════════════════════════════════════════════════════
+# ARENA
+# ═══════════════════════════════════════════════════════
+
+class FlatAST:
+    """Arena de uma compilação; o índice 0 é reservado para None"""
+    __slots__ = ('kinds', 'offsets', 'fields', 'data', 'resolved', '_data_index')
+
+    def __init__(self):
+        self.kinds = array('B', [KIND_NONE])
+        self.offsets = array('I', [0])
+        self.fields = array('I')
+        self.data = []
+        self.resolved = {}
+        self._data_index = {}
+
+    def intern(self, value):
+        """Índice do payload em data (valores iguais são guardados 1 vez)"""
+        index = self._data_index.get(value)
+        if index is None:
+            index = self._data_index[value] = len(self.data)
+            self.data.append(value)
+        return index
+
+    def add(self, kind, *fields):
+        """Acrescenta um nó com os campos já codificados; retorna o índice"""
+        index = len(self.kinds)
+        self.kinds.append(kind)
+        self.offsets.append(len(self.fields))
+        self.fields.extend(fields)
+        return index
+
+    def add_list(self, children):
+        """Acrescenta um nó LIST (None → 0, sem lista)"""
+        if children is None:
+            return 0
+        index = len(self.kinds)
+        self.kinds.append(KIND_LIST)
+        self.offsets.append(len(self.fields))
+        self.fields.append(len(children))
+        self.fields.extend([child or 0 for child in children])
+        return index
+
+    def node(self, index):
+        """Visão do nó no índice (None para o índice 0)"""
+        if not index:
+            return None
+        return VIEW_CLASSES[self.kinds[index]](self, index)
+
+    def children(self, index):
+        """Lista de visões dos filhos de um nó LIST"""
+        if not index:
+            return None
+        start = self.offsets[index] + 1
+        fields = self.fields
+        node = self.node
+        return [node(child) for child in fields[start:start + fields[start - 1]]]
+
+    @property
+    def root(self):
+        """Último nó acrescentado (o programa, quando construído de baixo para cima)"""
+        return self.node(len(self.kinds) - 1)
+
+    def __len__(self):
+        """Número de nós (sem contar o nulo nem as listas)"""
+        return len(self.kinds) - 1 - self.kinds.count(KIND_LIST)
+
+    def __iter__(self):
+        """Visões de todos os nós na ordem da arena (filhos antes dos pais)"""
+        for index in range(1, len(self.kinds)):
+            if self.kinds[index] != KIND_LIST:
+                yield self.node(index)
+
+    def __repr__(self):
+        return f"FlatAST({len(self)} nós, {len(self.data)} payloads)"
+
+
+# ═══════════════════════════════════════════════════════
+# VISÕES
+# ═══════════════════════════════════════════════════════
+
+class FlatNode:
+    """Visão de um nó da arena com a interface do ASTNode correspondente"""
+    __slots__ = ('arena', 'index')
+    node_type = None
+    _fields = ()
+
+    def __init__(self, arena, index):
+        self.arena = arena
+        self.index = index
+
+    def __repr__(self):
+        attrs = {k: getattr(self, k) for k in self._fields}
+        return f"{self.node_type}({attrs})"
+
+
+def _field_property(position, category):
+    if category == NODE:
+        def get(self):
+            arena = self.arena
+            return arena.node(arena.fields[arena.offsets[self.index] + position])
+    elif category == LIST:
+        def get(self):
+            arena = self.arena
+            return arena.children(arena.fields[arena.offsets[self.index] + position])
+    else:
+        def get(self):
+            arena = self.arena
+            return arena.data[arena.fields[arena.offsets[self.index] + position]]
+    return property(get)
+
+
+def _resolved_property(position):
+    """Anotação (depth ou slot) guardada em FlatAST.resolved"""
+    def get(self):
+        pair = self.arena.resolved.get(self.index)
+        return pair[position] if pair else None
+
+    def set(self, value):
+        pair = list(self.arena.resolved.get(self.index, (None, None)))
+        pair[position] = value
+        self.arena.resolved[self.index] = tuple(pair)
+    return property(get, set)
+
+
+def _make_view(cls):
+    namespace = {'__slots__': (), 'node_type': cls.node_type, '_fields': cls._fields}
+    for position, (name, category) in enumerate(zip(cls._fields, SCHEMA[cls])):
+        namespace[name] = _field_property(position, category)
+    if 'slot' in cls.__slots__:
+        for position, name in enumerate(RESOLVED):
+            namespace[name] = _resolved_property(position)
+    return type('Flat' + cls.__name__, (FlatNode,), namespace)
+
+
+VIEW_CLASSES = [None] + [_make_view(cls) for cls in NODE_CLASSES] + [None]
+
+
+# ═══════════════════════════════════════════════════════
+# EMISSOR PARA O PARSER
+# ═══════════════════════════════════════════════════════
+
+class FlatEmitter:
+    """
+    Emissor do LL1Parser (emit='flat'): grava cada nó direto na arena e
+    devolve só o índice inteiro; program() devolve a visão da raiz
+    """
+
+    def __init__(self, arena=None):
+        self.arena = arena if arena is not None else FlatAST()
+        arena = self.arena
+        add, add_list, intern = arena.add, arena.add_list, arena.intern
+        k = KIND_CODES
+
+        self.function    = lambda name, params, body: add(k['function'], intern(name), add_list(params), add_list(body))
+        self.param       = lambda name, param_type: add(k['parameter'], intern(name), intern(param_type))
+        self.decl_assign = lambda name, value: add(k['decl_assign'], intern(name), value or 0)
+        self.assign      = lambda name, value: add(k['assign'], intern(name), value or 0)
+        self.return_     = lambda value: add(k['return'], value or 0)
+        self.print_      = lambda value: add(k['print'], value or 0)
+        # else vazio vira 0 (None), como em ASTEmitter
+        self.if_         = lambda cond, then_block, else_block: add(k['if'], cond or 0, add_list(then_block), add_list(else_block or None))
+        self.while_      = lambda cond, body: add(k['while'], cond or 0, add_list(body))
+        self.for_        = lambda init, cond, increment, body: add(k['for'], init or 0, cond or 0, increment or 0, add_list(body))
+        self.binop       = lambda op, left, right: add(k['binop'], intern(op), left, right)
+        self.num         = lambda value: add(k['number'], intern(value))
+        self.id          = lambda name: add(k['id'], intern(name))
+        self.call        = lambda name, args: add(k['call'], intern(name), add_list(args))
+
+    def program(self, declarations):
+        arena = self.arena
+        return arena.node(arena.add(KIND_CODES['program'], arena.add_list(declarations)))
+
+
+# ═══════════════════════════════════════════════════════
+# CONVERSÕES
+# ═══════════════════════════════════════════════════════
+
+def to_flat(node, arena=None):
+    """
+    Converte uma AST de ASTNode para a arena (pilha explícita)
+    Retorna a visão da raiz; a arena fica em resultado.arena
+    """
+    arena = arena if arena is not None else FlatAST()
+
+    def step(item):
+        if item is None:
+            return 0
+        if isinstance(item, list):
+            return _flat_list(item)
+        return _flat_node(item)
+
+    def _flat_list(items):
+        children = []
+        for child in items:
+            children.append((yield child))
+        return arena.add_list(children)
+
+    def _flat_node(node):
+        encoded = []
+        for name, category in zip(node._fields, SCHEMA[type(node)]):
+            value = getattr(node, name)
+            if category == DATA:
+                encoded.append(arena.intern(value))
+            else:
+                encoded.append((yield value))
+        index = arena.add(KIND_CODES[node.node_type], *encoded)
+        if getattr(node, 'slot', None) is not None:
+            arena.resolved[index] = (node.depth, node.slot)
+        return index
+
+    return arena.node(trampoline(step, node))
+
+
+def from_flat(view):
+    """Reconstrói ASTNode a partir de uma visão da arena (pilha explícita)"""
+    arena = view.arena
+
+    def step(index):
+        if not index:
+            return None
+        return _node(index)
+
+    def _node(index):
+        kind = arena.kinds[index]
+        start = arena.offsets[index]
+        cls = NODE_CLASSES[kind - 1]
+        values = []
+        for position, category in enumerate(SCHEMA[cls]):
+            field = arena.fields[start + position]
+            if category == DATA:
+                values.append(arena.data[field])
+            elif category == NODE:
+                values.append((yield field))
+            elif field:
+                first = arena.offsets[field] + 1
+                items = []
+                for child in arena.fields[first:first + arena.fields[first - 1]]:
+                    items.append((yield child))
+                values.append(items)
+            else:
+                values.append(None)
+        return cls(*values, *arena.resolved.get(index, ()))
+
+    return trampoline(step, view.index)
@@ -21,6 +21,7 @@ class Scope:
             'name': name,
             'type': symbol_type,
             'scope': self.name,
+            'level': self.level,
             'offset': self.offset_counter,
             'is_param': is_param,
             **extra
@@ -28,6 +29,12 @@ class Scope:
         self.offset_counter += 1
         return self.symbols[name]
     
+    def declare(self, symbol):
+        """Registra um símbolo já montado (ex.: recebido de outro processo)"""
+        self.symbols[symbol['name']] = symbol
+        self.offset_counter = max(self.offset_counter, symbol['offset'] + 1)
+        return symbol
+    
     def lookup(self, name):
         """Busca símbolo aqui ou nos escopos pais"""
         if name in self.symbols:
@@ -68,6 +75,10 @@ class SymbolTable:
             return self.current_scope.symbols.get(name)
         return self.current_scope.lookup(name)
     
+    def declare(self, symbol):
+        """Registra no escopo atual um símbolo já montado (mantém o offset)"""
+        return self.current_scope.declare(symbol)
+    
     def is_global_scope(self):
         """Verifica se está no global"""
         return self.current_scope == self.global_scope
@@ -91,3 +102,45 @@ class SymbolTable:
             else:
                 print("  (vazio)")
         print("========================\n")
+
+
+class FlatSymbolTable(SymbolTable):
+    """
+    Tabela de símbolos com cadeia de escopos achatada
+    Mantém um único dict nome → pilha de símbolos (o mais interno no topo),
+    empilhado em insert e desempilhado em exit_scope: lookup custa o mesmo
+    em qualquer profundidade, sem subir pelos escopos pais
+    """
+    def __init__(self):
+        super().__init__()
+        self.bindings = {}
+    
+    def exit_scope(self):
+        """Volta ao escopo anterior, desfazendo os símbolos do escopo atual"""
+        scope = self.current_scope
+        super().exit_scope()
+        bindings = self.bindings
+        for name in scope.symbols:
+            stack = bindings[name]
+            stack.pop()
+            if not stack:
+                del bindings[name]
+    
+    def insert(self, name, symbol_type, is_param=False, **extra):
+        """Adiciona símbolo no escopo atual e no topo da pilha do nome"""
+        symbol = self.current_scope.insert(name, symbol_type, is_param, **extra)
+        self.bindings.setdefault(name, []).append(symbol)
+        return symbol
+    
+    def declare(self, symbol):
+        """Registra no escopo atual um símbolo já montado (mantém o offset)"""
+        self.current_scope.declare(symbol)
+        self.bindings.setdefault(symbol['name'], []).append(symbol)
+        return symbol
+    
+    def lookup(self, name, current_scope_only=False):
+        """Busca símbolo: se current_scope_only=True busca apenas no escopo atual"""
+        if current_scope_only:
+            return self.current_scope.symbols.get(name)
+        stack = self.bindings.get(name)
+        return stack[-1] if stack else None
@@ -0,0 +1,40 @@
+"""
+Trampolim - Percurso de árvores com pilha explícita
+Permite escrever visitantes "recursivos" sem consumir a pilha do Python:
+o passo de cada nó é um gerador que faz `resultado = yield filho` para
+pedir o processamento de um filho, e o trampolim empilha os geradores
+"""
+from types import GeneratorType
+
+
+def trampoline(step, root):
+    """
+    Executa step(root) sem recursão
+
+    step(item) devolve o resultado diretamente (folhas) ou um gerador;
+    cada valor produzido pelo gerador é processado com step() e o resultado
+    é enviado de volta ao gerador. O valor de retorno do gerador é o
+    resultado do item. A profundidade é limitada apenas pela memória
+    """
+    result = step(root)
+    if type(result) is not GeneratorType:
+        return result
+    return drive(step, result)
+
+
+def drive(step, generator):
+    """Executa um gerador de passo já criado (mesmo protocolo do trampoline)"""
+    stack = [generator]
+    value = None
+    while stack:
+        try:
+            child = stack[-1].send(value)
+        except StopIteration as stop:
+            stack.pop()
+            value = stop.value
+            continue
+        value = step(child)
+        if type(value) is GeneratorType:
+            stack.append(value)
+            value = None
+    return value
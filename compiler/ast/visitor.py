@@ -0,0 +1,48 @@
+"""
+Visitor - Base dos percursos sobre a AST
+Cada subclasse ganha uma tabela de despacho node_type → visit_*, montada
+uma única vez na criação da classe (em vez de f-string + getattr por nó)
+"""
+from .trampoline import trampoline, drive
+
+
+class Visitor:
+    """
+    Base de visitantes: defina visit_<node_type> e, se quiser, generic_visit
+    Métodos com filhos podem ser geradores que fazem `resultado = yield filho`;
+    o percurso usa pilha explícita (ver trampoline.py)
+    """
+    _dispatch = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = {
+            name[len('visit_'):]: getattr(cls, name)
+            for name in dir(cls)
+            if name.startswith('visit_') and callable(getattr(cls, name))
+        }
+
+    def visit(self, node):
+        """Visita node e retorna o resultado do visit_* correspondente"""
+        return trampoline(self._step(), node)
+
+    def run(self, generator):
+        """
+        Executa um gerador no estilo dos visit_* (ex.: parte de um visit_*
+        chamada isoladamente), despachando os filhos que ele produzir
+        """
+        return drive(self._step(), generator)
+
+    def _step(self):
+        dispatch = self._dispatch
+        generic = type(self).generic_visit
+
+        def step(node):
+            if node is None:
+                return None
+            return dispatch.get(node.node_type, generic)(self, node)
+
+        return step
+
+    def generic_visit(self, node):
+        raise NotImplementedError(f"Visitante não implementado: {node.node_type}")
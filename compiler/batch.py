@@ -0,0 +1,205 @@
+"""
+Compilação em Lote - Muitos arquivos num pool de processos
+Cada worker importa o compilador (e constrói as tabelas do PLY) uma única
+vez e compila os arquivos que recebe; o processo principal só distribui os
+caminhos e junta um resumo com vazão, falhas e tempo por fase
+
+Uso:
+    python -m compiler.batch tests/ "exemplos/**/*.txt" -o saida/ [-j 4]
+"""
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .lexer import BACKENDS
+from .main import compile, compile_file
+
+
+PHASES = ('lexer', 'parser', 'semantic', 'ir', 'optimizer', 'assembly')
+
+
+def expand_paths(patterns, extension='.txt'):
+    """Diretórios (recursivo, só *extension), globs e arquivos → caminhos únicos em ordem"""
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            found = sorted(glob.glob(os.path.join(pattern, '**', '*' + extension), recursive=True))
+        elif glob.has_magic(pattern):
+            found = sorted(glob.glob(pattern, recursive=True))
+        else:
+            found = [pattern]
+        for path in found:
+            if path not in seen:
+                seen.add(path)
+                paths.append(path)
+    return paths
+
+
+def output_path(path, output_dir, root=None):
+    """Assembly de path: mesmo caminho relativo dentro de output_dir, extensão .asm"""
+    base = os.path.splitext(path)[0] + '.asm'
+    if output_dir is None:
+        return base
+    relative = os.path.relpath(base, root) if root else os.path.basename(base)
+    return os.path.join(output_dir, relative)
+
+
+# ═══════════════════════════════════════════════════════
+# WORKER
+# ═══════════════════════════════════════════════════════
+
+_options = None
+
+
+def _init_worker(options):
+    """Executado uma vez por processo: opções do lote e aquecimento do pipeline"""
+    global _options
+    _options = options
+    compile("int main() { return 0; }", backend=options['backend'])
+
+
+def _compile_one(task):
+    """Compila um arquivo: (caminho, sucesso, erros, tempos, segundos, do cache)"""
+    path, target = task
+    start = time.perf_counter()
+    result = compile_file(path, optimize=_options['optimize'], backend=_options['backend'],
+                          cache_dir=_options['cache_dir'])
+    if result['success'] and target is not None:
+        os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+        with open(target, 'w', encoding='utf-8') as f:
+            for line in result['assembly']:
+                f.write(line + '\n')
+    elapsed = time.perf_counter() - start
+    return (path, result['success'], result['errors'], result.get('timings', {}),
+            elapsed, bool(result.get('cached')))
+
+
+# ═══════════════════════════════════════════════════════
+# LOTE
+# ═══════════════════════════════════════════════════════
+
+def compile_many(paths, output_dir=None, optimize=True, backend='ply', workers=None,
+                 cache_dir=None, write_outputs=True, root=None):
+    """
+    Compila vários arquivos num ProcessPoolExecutor
+
+    Args:
+        paths (list[str]): Arquivos a compilar (ver expand_paths)
+        output_dir (str): Onde gravar os .asm (padrão: ao lado de cada fonte)
+        optimize (bool): Se True, aplica otimizações
+        backend (str): Backend léxico ('ply' ou 'scanner')
+        workers (int): Processos do pool (padrão: os.cpu_count())
+        cache_dir (str): Cache de compilação em disco (ver compiler/cache.py)
+        write_outputs (bool): Se False, só compila (nenhum .asm é gravado)
+        root (str): Diretório base dos caminhos relativos dentro de output_dir
+
+    Returns:
+        dict: {
+            'files': int, 'succeeded': int, 'cached': int,
+            'failures': [(caminho, erros)],
+            'phases': dict fase → segundos somados em todos os arquivos,
+            'cpu_time': segundos somados por arquivo nos workers,
+            'wall_time': segundos do lote inteiro,
+            'throughput': arquivos por segundo
+        }
+    """
+    options = {'optimize': optimize, 'backend': backend, 'cache_dir': cache_dir}
+    tasks = [(path, output_path(path, output_dir, root) if write_outputs else None)
+             for path in paths]
+    summary = {
+        'files': len(tasks), 'succeeded': 0, 'cached': 0, 'failures': [],
+        'phases': dict.fromkeys(PHASES, 0.0), 'cpu_time': 0.0,
+        'wall_time': 0.0, 'throughput': 0.0,
+    }
+
+    start = time.perf_counter()
+    if tasks:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(options,)) as pool:
+            chunksize = max(1, len(tasks) // (workers * 8))
+            for path, success, errors, timings, elapsed, cached in pool.map(
+                    _compile_one, tasks, chunksize=chunksize):
+                summary['cpu_time'] += elapsed
+                summary['cached'] += cached
+                for phase, seconds in timings.items():
+                    summary['phases'][phase] = summary['phases'].get(phase, 0.0) + seconds
+                if success:
+                    summary['succeeded'] += 1
+                else:
+                    summary['failures'].append((path, errors))
+    summary['wall_time'] = time.perf_counter() - start
+    if summary['wall_time'] > 0:
+        summary['throughput'] = summary['files'] / summary['wall_time']
+    return summary
+
+
+def print_summary(summary):
+    """Imprime o resumo de compile_many"""
+    print("\n" + "="*50)
+    print("RESUMO DA COMPILAÇÃO EM LOTE")
+    print("="*50)
+    print(f"Arquivos:   {summary['files']}")
+    print(f"Sucesso:    {summary['succeeded']} ({summary['cached']} do cache)")
+    print(f"Falhas:     {len(summary['failures'])}")
+    print(f"Tempo:      {summary['wall_time']:.2f}s | {summary['throughput']:.1f} arquivos/s")
+
+    total = sum(summary['phases'].values())
+    if total > 0:
+        print("\nTempo por fase (soma dos workers):")
+        for phase, seconds in summary['phases'].items():
+            print(f"  {phase:<10} {seconds * 1000:10.1f} ms  {seconds / total:6.1%}")
+
+    if summary['failures']:
+        print("\nArquivos com erro:")
+        for path, errors in summary['failures']:
+            print(f"  ✗ {path}")
+            for error in errors:
+                print(f"      - {error}")
+
+
+def main(argv=None):
+    """
+    Entrada compile-many
+
+    Uso: python -m compiler.batch <dir|glob|arquivo>... [-o DIR] [-j N]
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='compile-many',
+                                     description='Compila vários arquivos em paralelo')
+    parser.add_argument('paths', nargs='+', help='Diretórios, globs ou arquivos')
+    parser.add_argument('--output-dir', '-o', help='Diretório dos .asm (padrão: ao lado do fonte)')
+    parser.add_argument('--jobs', '-j', type=int, help='Processos (padrão: nº de CPUs)')
+    parser.add_argument('--no-optimize', action='store_true', help='Desabilita otimizações')
+    parser.add_argument('--backend', choices=BACKENDS, default='ply', help='Backend léxico')
+    parser.add_argument('--cache-dir', help='Diretório do cache de compilação')
+    parser.add_argument('--ext', default='.txt', help='Extensão buscada nos diretórios')
+    parser.add_argument('--no-output', action='store_true', help='Não grava os .asm')
+
+    args = parser.parse_args(argv)
+    paths = expand_paths(args.paths, args.ext)
+    if not paths:
+        print("Nenhum arquivo encontrado")
+        return 1
+
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in paths])
+    summary = compile_many(
+        [os.path.abspath(p) for p in paths],
+        output_dir=args.output_dir,
+        optimize=not args.no_optimize,
+        backend=args.backend,
+        workers=args.jobs,
+        cache_dir=args.cache_dir,
+        write_outputs=not args.no_output,
+        root=root,
+    )
+    print_summary(summary)
+    return 0 if not summary['failures'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""
+Cache de Compilação - Resultados em disco endereçados pelo conteúdo
+A chave é o SHA-256 do fonte + versão do compilador + opções; o valor é um
+JSON compacto com o IR otimizado (quádruplas), os frames e o assembly.
+Recompilar um arquivo inalterado custa um hash e uma leitura
+
+A versão inclui um hash dos fontes do pacote que compila (compiler/ por
+padrão; o pipeline src/ passa o próprio diretório): qualquer mudança no
+compilador (um passe novo, uma correção) invalida o cache sem depender de
+alguém lembrar de mudar __version__
+
+O diretório tem tamanho máximo: cada acerto atualiza o mtime da entrada e,
+ao gravar, as entradas menos usadas recentemente são apagadas até caber
+"""
+import functools
+import hashlib
+import json
+import os
+import tempfile
+
+from .ir import IRProgram, TAC
+
+
+# Muda quando o formato das entradas muda (invalida caches antigos)
+CACHE_FORMAT = 2
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+@functools.lru_cache(maxsize=None)
+def compiler_fingerprint(package=None):
+    """SHA-256 dos arquivos .py do pacote (caminho relativo + conteúdo); padrão: compiler/"""
+    if package is None:
+        package = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for folder, dirs, files in os.walk(package):
+        dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+        for name in sorted(files):
+            if name.endswith('.py'):
+                path = os.path.join(folder, name)
+                digest.update(os.path.relpath(path, package).replace(os.sep, '/').encode())
+                digest.update(b'\0')
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+                digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def compiler_version(package=None):
+    """__version__ do pacote + hash dos fontes do compilador (package: outro pacote)"""
+    from . import __version__
+    if package is not None:
+        package = os.path.abspath(package)
+    return f"{__version__}+{compiler_fingerprint(package)[:16]}"
+
+
+class CompileCache:
+    """Cache em disco: key(fonte, **opções) → load/store de um dict JSON
+
+    package: diretório do pacote que de fato compila, cujo hash entra na
+    versão (padrão: compiler/); ignorado se version for dado
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES, version=None, package=None):
+        if version is None:
+            version = compiler_version(package)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.version = version
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, source_code, **options):
+        """Hash do fonte, da versão do compilador e das opções de compilação"""
+        digest = hashlib.sha256()
+        header = [CACHE_FORMAT, self.version, sorted(options.items())]
+        digest.update(json.dumps(header).encode())
+        digest.update(b'\0')
+        digest.update(source_code.encode('utf-8'))
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def load(self, key):
+        """Entrada gravada para key (ou None); marca como usada recentemente"""
+        path = self.path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def store(self, key, entry):
+        """Grava a entrada (escrita atômica) e aplica o limite de tamanho"""
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, separators=(',', ':'))
+            os.replace(temp_path, self.path(key))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Apaga as entradas menos usadas recentemente até caber em max_bytes"""
+        entries = []
+        total = 0
+        for item in os.scandir(self.directory):
+            if item.name.endswith('.json') and item.is_file():
+                stat = item.stat()
+                entries.append((stat.st_mtime, stat.st_size, item.path))
+                total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        """Remove todas as entradas"""
+        for item in os.scandir(self.directory):
+            if item.name.endswith('.json'):
+                os.unlink(item.path)
+
+
+# ═══════════════════════════════════════════════════════
+# FORMATO DAS ENTRADAS (pipeline compiler/)
+# ═══════════════════════════════════════════════════════
+
+def encode_program(ir_program):
+    """IRProgram → {'code': [[op, arg1, arg2, result], ...], 'frames': [[nome, layout], ...]}"""
+    return {
+        'code': [[i.op, i.arg1, i.arg2, i.result] for i in ir_program.instructions],
+        'frames': [[name, layout] for name, layout in ir_program.frames.items()],
+    }
+
+
+def decode_program(data):
+    """Inverso de encode_program"""
+    program = IRProgram()
+    program.instructions = [TAC(*row) for row in data['code']]
+    program.frames = {name: layout for name, layout in data['frames']}
+    return program
+
+
+def encode_result(result):
+    """Parte de um resultado de compile() bem-sucedido que vai para o cache"""
+    return {
+        'optimized_ir': encode_program(result['optimized_ir']),
+        'assembly': result['assembly'],
+    }
+
+
+def decode_result(entry):
+    """
+    Resultado no formato de compile() a partir de uma entrada do cache
+    (só optimized_ir e assembly; as fases intermediárias ficam None e
+    timings vazio: nenhuma fase rodou)
+    """
+    return {
+        'success': True,
+        'tokens': [],
+        'parse_tree': None,
+        'ast': None,
+        'symbol_table': None,
+        'ir': None,
+        'algebraic_ir': None,
+        'optimized_ir': decode_program(entry['optimized_ir']),
+        'assembly': entry['assembly'],
+        'interner': None,
+        'timings': {},
+        'errors': [],
+        'cached': True,
+    }
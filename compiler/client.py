@@ -0,0 +1,138 @@
+"""
+Cliente do Servidor de Compilação
+Envia o fonte para o daemon de compiler/server.py e imprime a resposta como
+o CLI de compiler/main.py. Não importa o pipeline do compilador: o custo de
+cada execução é só iniciar o Python e uma ida e volta pelo socket
+
+Uso:
+    python -m compiler.client <arquivo.txt> [--no-optimize] [--verbose] [-o saida.asm]
+    python -m compiler.client --shutdown
+"""
+import json
+import os
+import socket
+import sys
+import tempfile
+
+
+def default_socket_path():
+    """Socket padrão do usuário no diretório temporário"""
+    uid = os.getuid() if hasattr(os, 'getuid') else 0
+    return os.path.join(tempfile.gettempdir(), f"compiler-{uid}.sock")
+
+
+class CompileClient:
+    """Conexão com o servidor; vários pedidos podem usar a mesma conexão"""
+
+    def __init__(self, socket_path=None, timeout=None):
+        self.socket_path = socket_path or default_socket_path()
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(self.socket_path)
+        self.stream = self.sock.makefile('rwb')
+
+    def request(self, message):
+        """Envia um pedido (dict) e devolve a resposta (dict)"""
+        self.stream.write(json.dumps(message).encode('utf-8') + b'\n')
+        self.stream.flush()
+        line = self.stream.readline()
+        if not line:
+            raise ConnectionError("Servidor fechou a conexão")
+        return json.loads(line)
+
+    def compile(self, source_code, optimize=True, backend='ply', frame_slots=False):
+        """Compila no servidor; resposta no formato de compiler/server.py"""
+        return self.request({'source': source_code, 'optimize': optimize,
+                             'backend': backend, 'frame_slots': frame_slots})
+
+    def ping(self):
+        return self.request({'command': 'ping'})
+
+    def shutdown(self):
+        return self.request({'command': 'shutdown'})
+
+    def close(self):
+        self.stream.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    """
+    CLI com as mesmas opções de compiler/main.py, compilando no servidor
+
+    Uso: python -m compiler.client <arquivo.txt> [--no-optimize] [--verbose] [--socket CAMINHO]
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Mini-Compilador (cliente do servidor)')
+    parser.add_argument('file', nargs='?', help='Arquivo de código fonte')
+    parser.add_argument('--no-optimize', action='store_true', help='Desabilita otimizações')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Modo verboso')
+    parser.add_argument('--output', '-o', help='Arquivo de saída para assembly')
+    parser.add_argument('--backend', choices=('ply', 'scanner'), default='ply', help='Backend léxico')
+    parser.add_argument('--socket', default=default_socket_path(), help='Socket do servidor')
+    parser.add_argument('--shutdown', action='store_true', help='Encerra o servidor')
+
+    args = parser.parse_args(argv)
+    if not args.file and not args.shutdown:
+        parser.error("informe o arquivo (ou --shutdown)")
+
+    try:
+        client = CompileClient(args.socket)
+    except OSError as e:
+        print(f"✗ Servidor indisponível em {args.socket}: {e}")
+        print("  Inicie com: python -m compiler.server")
+        return 1
+
+    with client:
+        if args.shutdown:
+            client.shutdown()
+            print("Servidor encerrado")
+            return 0
+
+        try:
+            with open(args.file, 'r', encoding='utf-8') as f:
+                source_code = f.read()
+        except OSError as e:
+            print(f"\n✗ Erro ao ler arquivo: {e}")
+            return 1
+
+        result = client.compile(source_code, optimize=not args.no_optimize, backend=args.backend)
+
+    if result['success']:
+        print(f"\n✓ Compilação de '{args.file}' concluída com sucesso!")
+
+        if args.verbose:
+            from .cache import decode_program
+            print("\n=== CÓDIGO INTERMEDIÁRIO (IR) ===")
+            decode_program(result['ir']).print_code()
+            if not args.no_optimize:
+                print("\n=== CÓDIGO INTERMEDIÁRIO OTIMIZADO ===")
+                decode_program(result['optimized_ir']).print_code()
+
+        if args.output:
+            with open(args.output, 'w') as f:
+                for line in result['assembly']:
+                    f.write(line + '\n')
+            print(f"Assembly salvo em: {args.output}")
+        else:
+            print("\nCódigo Assembly:")
+            for line in result['assembly']:
+                print(line)
+        return 0
+    else:
+        print(f"\n✗ Compilação de '{args.file}' falhou!")
+        print("\nErros:")
+        for error in result['errors']:
+            print(f"  - {error}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
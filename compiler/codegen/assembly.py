@@ -4,11 +4,29 @@ Converte IR em assembly genérico (LOAD/STORE/ADD/MUL/etc)
 """
 
 class AssemblyGenerator:
-    def __init__(self):
+    def __init__(self, frame_slots=False):
+        """
+        frame_slots: Se True, variáveis são endereçadas pelo slot no frame
+                     ([FP+n] locais, [GP+n] globais) usando ir_program.frames,
+                     em vez de pelo nome
+        """
         self.code = []
         self.register_map = {}
         self.next_register = 0
         self.max_registers = 10  # R0-R9
+        self.frame_slots = frame_slots
+        self.frames = {}
+        self.frame = {}
+    
+    def address(self, var):
+        """Endereço de memória de uma variável (nome, ou slot com frame_slots)"""
+        if self.frame_slots:
+            if var in self.frame:
+                return f"[FP+{self.frame[var]}]"
+            global_frame = self.frames.get(None, {})
+            if var in global_frame:
+                return f"[GP+{global_frame[var]}]"
+        return var
     
     def allocate_register(self, var):
         if var in self.register_map:
@@ -32,7 +50,7 @@ class AssemblyGenerator:
             return self.register_map[value]
         
         reg = self.allocate_register(value)
-        self.emit(f"  LOAD {reg}, {value}")
+        self.emit(f"  LOAD {reg}, {self.address(value)}")
         return reg
     
     def emit(self, instruction):
@@ -40,6 +58,8 @@ class AssemblyGenerator:
     
     def generate(self, ir_program):
         self.code = []
+        self.frames = getattr(ir_program, 'frames', {})
+        self.frame = {}
         for instr in ir_program.get_instructions():
             self.visit_instruction(instr)
         return self.code
@@ -47,11 +67,16 @@ class AssemblyGenerator:
     def visit_instruction(self, instr):
         if instr.op == 'begin_func':
             self.emit(f"\n{instr.arg1}:")
-            self.emit("  ENTER")
+            if self.frame_slots:
+                self.frame = self.frames.get(instr.arg1, {})
+                self.emit(f"  ENTER {len(self.frame)}")
+            else:
+                self.emit("  ENTER")
             self.register_map = {}
             self.next_register = 0
         
         elif instr.op == 'end_func':
+            self.frame = {}
             self.emit("  LEAVE")
             self.emit("  RETURN")
         
@@ -65,7 +90,7 @@ class AssemblyGenerator:
                 self.emit(f"  MOVE {dest_reg}, {src_reg}")
             
             if not instr.result.startswith('t'):
-                self.emit(f"  STORE {dest_reg}, {instr.result}")
+                self.emit(f"  STORE {dest_reg}, {self.address(instr.result)}")
         
         elif instr.op == '+':
             dest_reg = self.allocate_register(instr.result)
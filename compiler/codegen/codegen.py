@@ -2,9 +2,13 @@
 CodeGen - Orquestrador do Backend do Compilador
 Coordena: IR Generation → Optimizations → Assembly Generation
 """
+import time
+
 from ..ir import IRGenerator
+from ..interner import Interner
+from ..diagnostics import QUIET
 from ..optimizer import Optimizer, ConstantFolding, DeadCodeElimination, CopyPropagation, CommonSubexpressionElimination
-from ..optimizer import PeepholeOptimizer, AlgebraicSimplification
+from ..optimizer import PeepholeOptimizer, AlgebraicSimplification, copy_program
 from .assembly import AssemblyGenerator
 
 
@@ -18,89 +22,111 @@ class CodeGenerator:
     3. Gerar código assembly genérico
     """
     
-    def __init__(self, symbol_table, enable_optimizations=True):
+    def __init__(self, symbol_table, enable_optimizations=True, interner=None, frame_slots=False,
+                 diagnostics=None):
         self.symbol_table = symbol_table
         self.enable_optimizations = enable_optimizations
+        self.frame_slots = frame_slots    # Assembly endereça variáveis por slot
+        self.interner = interner if interner is not None else Interner()
+        self.diagnostics = diagnostics or QUIET   # progresso das etapas (padrão: silencioso)
         self.ir_program = None            # IR original não otimizado
         self.algebraic_ir = None          # IR após simplificação algébrica pura
         self.optimized_ir = None          # IR totalmente otimizado
         self.assembly_code = None         # Código assembly final
+        self.timings = {}                 # etapa ('ir', 'optimizer', 'assembly') → segundos
+        self.max_passes = 10              # limite de rodadas da fase 2 (ponto fixo)
+        self.optimizer_passes = 0         # rodadas da fase 2 na última otimização
     
-    def generate(self, ast):
+    def generate(self, ast, ir_program=None):
         """
         Pipeline completo de geração de código:
         AST -> IR -> Otimizações -> Assembly
         
+        ir_program: IR já gerado (ex.: pela compilação paralela); pula a etapa 1
+        
         Retorna: (ir_program, optimized_ir, assembly_code)
         """
         # 1. Geração de IR
-        print("\n[1/4] Gerando código intermediário (IR)...")
-        ir_generator = IRGenerator(self.symbol_table)
-        self.ir_program = ir_generator.generate(ast)
+        self.diagnostics.progress('codegen', "\n[1/4] Gerando código intermediário (IR)...")
+        start = time.perf_counter()
+        if ir_program is not None:
+            self.ir_program = ir_program
+        else:
+            ir_generator = IRGenerator(self.symbol_table, self.interner)
+            self.ir_program = ir_generator.generate(ast)
+            self.timings['ir'] = time.perf_counter() - start
         
         # 2. Otimizações (se habilitadas)
         if self.enable_optimizations:
-            print("[2/4] Aplicando otimizações...")
+            self.diagnostics.progress('codegen', "[2/4] Aplicando otimizações...")
+            start = time.perf_counter()
             self.optimized_ir = self.optimize(self.ir_program)
+            self.timings['optimizer'] = time.perf_counter() - start
         else:
-            print("[2/4] Otimizações desabilitadas")
+            self.diagnostics.progress('codegen', "[2/4] Otimizações desabilitadas")
             self.optimized_ir = self.ir_program
         
         # 3. Geração de Assembly
-        print("[3/4] Gerando código assembly...")
-        asm_generator = AssemblyGenerator()
+        self.diagnostics.progress('codegen', "[3/4] Gerando código assembly...")
+        start = time.perf_counter()
+        asm_generator = AssemblyGenerator(frame_slots=self.frame_slots)
         self.assembly_code = asm_generator.generate(self.optimized_ir)
+        self.timings['assembly'] = time.perf_counter() - start
         
-        print("[4/4] Geração de código concluída ✓")
+        self.diagnostics.progress('codegen', "[4/4] Geração de código concluída ✓")
         
         return self.ir_program, self.optimized_ir, self.assembly_code
     
-    def optimize(self, ir_program):
+    def optimize(self, ir_program, all_vars_zero=None):
         """
         Pipeline de Otimizações em 2 Fases
         
         FASE 1 (Algébrica): Simplificação SIMBÓLICA - não usa valores numéricos
                            Mostra padrões matemáticos puros (a+b calculado 2x, c-c→0)
         
-        FASE 2 (Completa): Multi-pass até convergir (max 5 passadas)
+        FASE 2 (Completa): Multi-pass até o ponto fixo (max_passes rodadas)
                           Usa valores conhecidos para constant folding
+        
+        all_vars_zero: modo simbólico já decidido para o programa inteiro
+                       (ex.: otimizando uma função isolada); None = detectar
         """
         # Detecta se todas variáveis user são 0 (modo simbólico completo)
-        all_vars_zero = self._check_all_vars_zero(ir_program)
+        if all_vars_zero is None:
+            all_vars_zero = self._check_all_vars_zero(ir_program)
+        
+        # Globais ficam vivas na saída de toda função (o IR pode ser só uma função)
+        global_vars = ir_program.frames.get(None, ())
         
         # ═══ FASE 1: SIMPLIFICAÇÃO ALGÉBRICA SIMBÓLICA ═══
         # Para fins educacionais: mostra otimização sem "colar" valores
         algebraic_opt = Optimizer()
         algebraic_opt.add_optimization(AlgebraicSimplification())  # c-c→0, f/f→1
-        algebraic_opt.add_optimization(PeepholeOptimizer(symbolic_only=True))  # a+0→a, a*2→a<<1
-        algebraic_opt.add_optimization(CopyPropagation())          # t1=a; t2=t1 → t2=a
-        algebraic_opt.add_optimization(CommonSubexpressionElimination())  # Detecta (a+b) duplicado
-        algebraic_opt.add_optimization(DeadCodeElimination())      # Remove temporários mortos
+        algebraic_opt.add_optimization(PeepholeOptimizer(symbolic_only=True, interner=self.interner))  # a+0→a, a*2→a<<1
+        algebraic_opt.add_optimization(CopyPropagation(global_vars))          # t1=a; t2=t1 → t2=a
+        algebraic_opt.add_optimization(CommonSubexpressionElimination(global_vars))  # Detecta (a+b) duplicado
+        algebraic_opt.add_optimization(DeadCodeElimination(global_vars))  # Remove definições mortas
         self.algebraic_ir = algebraic_opt.optimize(ir_program)
         
         # ═══ FASE 2: OTIMIZAÇÕES COMPLETAS (MULTI-PASS) ═══
-        # Repete até convergir (nenhuma instrução removida)
-        current = ir_program
-        max_passes = 5
+        # Repete até o ponto fixo (nenhum passe mudou nada), no máximo
+        # max_passes rodadas. Os passes editam uma cópia no lugar: o IR
+        # recebido (e quem mais o compartilha) continua intacto
+        optimizer = Optimizer()
+        
+        # Ordem de otimizações segue teoria clássica de compiladores
+        optimizer.add_optimization(AlgebraicSimplification())    # Padrões matemáticos
+        optimizer.add_optimization(ConstantFolding(symbolic_only=all_vars_zero, interner=self.interner, globals=global_vars))  # Calcula constantes
+        optimizer.add_optimization(PeepholeOptimizer(interner=self.interner))  # Padrões locais + shift
+        optimizer.add_optimization(CommonSubexpressionElimination(global_vars))  # Elimina duplicatas
+        optimizer.add_optimization(CopyPropagation(global_vars))            # Propaga cópias
+        optimizer.add_optimization(DeadCodeElimination(global_vars))  # Remove código morto
         
-        for pass_num in range(max_passes):
-            optimizer = Optimizer()
-            
-            # Ordem de otimizações segue teoria clássica de compiladores
-            optimizer.add_optimization(AlgebraicSimplification())    # Padrões matemáticos
-            optimizer.add_optimization(ConstantFolding(symbolic_only=all_vars_zero))  # Calcula constantes
-            optimizer.add_optimization(PeepholeOptimizer())          # Padrões locais + shift
-            optimizer.add_optimization(CommonSubexpressionElimination())  # Elimina duplicatas
-            optimizer.add_optimization(CopyPropagation())            # Propaga cópias
-            optimizer.add_optimization(DeadCodeElimination())        # Remove código morto
-            
-            optimized = optimizer.optimize(current)
-            
-            # Convergência: se nada mudou, para
-            if len(optimized.get_instructions()) == len(current.get_instructions()):
+        current = copy_program(ir_program)
+        self.optimizer_passes = 0
+        for pass_num in range(self.max_passes):
+            self.optimizer_passes += 1
+            if not optimizer.run(current.instructions):
                 break
-            
-            current = optimized
         
         return current
     
@@ -0,0 +1,88 @@
+"""
+Diagnósticos - Destino das mensagens emitidas durante a compilação
+Progresso do backend, erros léxicos/sintáticos e avisos viram eventos
+(Diagnostic) entregues a um único destino escolhido por quem chama
+compile(): nada (padrão), uma lista, um logging.Logger ou uma função.
+Sem destino, compilar não faz nenhuma E/S no terminal
+
+Uso:
+    eventos = []
+    compile(codigo, diagnostics=Diagnostics(eventos))
+    compile(codigo, diagnostics=Diagnostics(logging.getLogger('compilador')))
+    compile(codigo, diagnostics=Diagnostics.stdout())   # comportamento antigo
+"""
+import logging
+
+
+# Tipos de evento
+PROGRESS = 'progress'
+WARNING = 'warning'
+ERROR = 'error'
+
+LOG_LEVELS = {PROGRESS: logging.INFO, WARNING: logging.WARNING, ERROR: logging.ERROR}
+
+
+class Diagnostic:
+    """Um evento: tipo (progress/warning/error), fase que o emitiu, mensagem e linha"""
+    __slots__ = ('kind', 'phase', 'message', 'line')
+
+    def __init__(self, kind, phase, message, line=None):
+        self.kind = kind
+        self.phase = phase
+        self.message = message
+        self.line = line
+
+    def __str__(self):
+        return self.message
+
+    def __repr__(self):
+        return f"Diagnostic({self.kind}, {self.phase}, {self.message!r}, line={self.line})"
+
+
+class Diagnostics:
+    """
+    Destino dos diagnósticos de uma compilação
+
+    target: None (descarta), list (acumula Diagnostic), logging.Logger
+            (nível conforme o tipo) ou função chamada com cada Diagnostic
+    """
+    __slots__ = ('_deliver',)
+
+    def __init__(self, target=None):
+        if target is None:
+            self._deliver = None
+        elif isinstance(target, list):
+            self._deliver = target.append
+        elif isinstance(target, logging.Logger):
+            self._deliver = lambda event: target.log(LOG_LEVELS[event.kind], "[%s] %s",
+                                                     event.phase, event.message)
+        elif callable(target):
+            self._deliver = target
+        else:
+            raise TypeError(f"Destino de diagnósticos inválido: {target!r}")
+
+    @classmethod
+    def stdout(cls):
+        """Imprime cada mensagem no stdout (saída dos CLIs e do modo verbose)"""
+        return cls(lambda event: print(event.message))
+
+    @property
+    def enabled(self):
+        return self._deliver is not None
+
+    def emit(self, kind, phase, message, line=None):
+        if self._deliver is not None:
+            self._deliver(Diagnostic(kind, phase, message, line))
+
+    def progress(self, phase, message):
+        self.emit(PROGRESS, phase, message)
+
+    def warning(self, phase, message, line=None):
+        self.emit(WARNING, phase, message, line)
+
+    def error(self, phase, message, line=None):
+        self.emit(ERROR, phase, message, line)
+
+
+# Destino padrão: descarta tudo
+QUIET = Diagnostics()
@@ -0,0 +1,401 @@
+"""
+Compilação Incremental - Recompila só as funções que mudaram
+O fonte é relexado (barato) e dividido em unidades de topo: cada função é
+um intervalo de tokens identificado pelo hash do seu conteúdo. Para cada
+função o IncrementalCompiler guarda da execução anterior a AST, os erros
+semânticos, o IR, o IR otimizado e o assembly; a função só é refeita se o
+hash mudou ou se mudou a assinatura de algum global que ela referencia
+(função chamada, tipo/slot de variável global, ou um nome que passou a
+existir/deixou de existir antes dela)
+
+O IR de cada função é gerado com numeração local (t0, L0, ...) e
+renumerado na junção pelos totais das unidades anteriores, então os nomes
+de temporários e labels continuam únicos no programa (e iguais aos do
+compile() em série). Statements de topo são reanalisados a cada execução,
+pois alteram o escopo global
+"""
+import hashlib
+import re
+import time
+
+from .lexer import iter_tokens
+from .parser import parse_ll1, T_INT, T_ID, T_LPAREN, T_LBRACE, T_RBRACE
+from .token_buffer import TokenBuffer
+from .interner import Interner
+from .ast import SemanticAnalyzer, FlatSymbolTable
+from .ast.ast_builder import ProgramNode
+from .ir import IRGenerator, IRProgram, TAC
+from .codegen import CodeGenerator
+from .codegen.assembly import AssemblyGenerator
+
+
+# ═══════════════════════════════════════════════════════
+# UNIDADES DE TOPO
+# ═══════════════════════════════════════════════════════
+
+def split_units(buffer):
+    """
+    Divide os tokens em unidades de topo: ('function', início, fim) para
+    INT ID ( ... { ... } e ('statements', início, fim) para os trechos
+    entre funções. Retorna None se as chaves não fecharem
+    """
+    kinds = buffer.kinds
+    n = len(kinds)
+    units = []
+    statements_start = None
+    depth = 0
+    i = 0
+    while i < n:
+        if (depth == 0 and kinds[i] == T_INT and i + 2 < n
+                and kinds[i + 1] == T_ID and kinds[i + 2] == T_LPAREN):
+            if statements_start is not None:
+                units.append(('statements', statements_start, i))
+                statements_start = None
+            try:
+                j = kinds.index(T_LBRACE, i)
+            except ValueError:
+                return None
+            level = 0
+            while j < n:
+                if kinds[j] == T_LBRACE:
+                    level += 1
+                elif kinds[j] == T_RBRACE:
+                    level -= 1
+                    if level == 0:
+                        break
+                j += 1
+            if j == n:
+                return None
+            units.append(('function', i, j + 1))
+            i = j + 1
+            continue
+
+        if statements_start is None:
+            statements_start = i
+        if kinds[i] == T_LBRACE:
+            depth += 1
+        elif kinds[i] == T_RBRACE:
+            depth -= 1
+        i += 1
+
+    if depth != 0:
+        return None
+    if statements_start is not None:
+        units.append(('statements', statements_start, n))
+    return units
+
+
+def span_hash(buffer, start, end):
+    """Hash do conteúdo (tipos e valores, sem linhas) de um intervalo de tokens"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(buffer.kinds[start:end].tobytes())
+    digest.update(repr(buffer.values[start:end]).encode())
+    return digest.hexdigest()
+
+
+def signature(symbol):
+    """O que uma função usa de um símbolo global (None = não visível)"""
+    if symbol is None:
+        return None
+    if symbol['type'] == 'function':
+        return ('function', tuple(p.param_type for p in symbol.get('params', [])))
+    return (symbol['type'], symbol['offset'])
+
+
+class _RecordingTable(FlatSymbolTable):
+    """
+    Tabela do passo global; durante a análise de uma função só mostra os
+    globais declarados antes dela (offset < visible) e registra a
+    assinatura de cada nome livre consultado em deps
+    """
+    def __init__(self):
+        super().__init__()
+        self.visible = None
+        self.deps = {}
+
+    def visible_symbol(self, name):
+        stack = self.bindings.get(name)
+        symbol = stack[0] if stack else None
+        if symbol is not None and self.visible is not None and symbol['offset'] >= self.visible:
+            return None
+        return symbol
+
+    def lookup(self, name, current_scope_only=False):
+        symbol = super().lookup(name, current_scope_only)
+        if current_scope_only or self.visible is None:
+            return symbol
+        if symbol is None or symbol['level'] == 0:
+            symbol = self.visible_symbol(name)
+            self.deps[name] = signature(symbol)
+        return symbol
+
+
+# ═══════════════════════════════════════════════════════
+# CACHE POR UNIDADE
+# ═══════════════════════════════════════════════════════
+
+class _Unit:
+    """Resultado de uma unidade (função ou statements de topo) com numeração local"""
+    __slots__ = ('ast', 'deps', 'errors', 'ir', 'temps', 'labels', 'frames',
+                 'vars_zero', 'optimized', 'placed')
+
+    def __init__(self, ast):
+        self.ast = ast          # FunctionNode ou lista de statements
+        self.deps = None        # nome livre → signature() na última análise (None = nunca analisada)
+        self.errors = []
+        self.ir = None          # lista de TAC, numeração local
+        self.temps = 0
+        self.labels = 0
+        self.frames = {}
+        self.vars_zero = True   # contribuição para o modo simbólico do otimizador
+        self.optimized = {}     # all_vars_zero → (algébrico, otimizado)
+        self.placed = None      # (bases, ir, algébrico, otimizado, assembly) renumerados
+
+
+_LABEL_RE = re.compile(r'^(\D+)(\d+)$')
+
+
+def _renumber(instructions, mapping):
+    """Cópia das instruções com temporários/labels trocados por mapping"""
+    if not mapping:
+        return instructions
+
+    def rename(value):
+        if isinstance(value, str):
+            return mapping.get(value, value)
+        if isinstance(value, list):
+            return [mapping.get(v, v) if isinstance(v, str) else v for v in value]
+        return value
+
+    return [TAC(i.op, rename(i.arg1), rename(i.arg2), rename(i.result)) for i in instructions]
+
+
+# ═══════════════════════════════════════════════════════
+# DRIVER
+# ═══════════════════════════════════════════════════════
+
+class IncrementalCompiler:
+    """
+    Driver incremental: chame compile(source) a cada versão do arquivo
+    Retorna o mesmo dict de compiler.main.compile (mesmas chaves, inclusive
+    timings e algebraic_ir), mais result['incremental'] = {'reused': [...],
+    'recompiled': [...], 'fallback': bool}
+    Se alguma unidade tiver erro sintático, recompila tudo com compile()
+    (fallback = True)
+    """
+
+    def __init__(self, optimize=True, backend='ply'):
+        self.optimize = optimize
+        self.backend = backend
+        self.interner = Interner()   # compartilhado entre execuções (o cache guarda nomes)
+        self.cache = {}              # hash do intervalo de tokens → _Unit
+
+    def compile(self, source_code):
+        result = {
+            'success': False,
+            'tokens': [],
+            'parse_tree': None,
+            'ast': None,
+            'symbol_table': None,
+            'ir': None,
+            'algebraic_ir': None,
+            'optimized_ir': None,
+            'assembly': [],
+            'interner': self.interner,
+            'timings': {},
+            'errors': [],
+            'incremental': {'reused': [], 'recompiled': [], 'fallback': False},
+        }
+        timings = result['timings']
+        start = time.perf_counter()
+        buffer = TokenBuffer.from_tokens(iter_tokens(source_code, self.backend, self.interner))
+        result['tokens'] = buffer
+        timings['lexer'] = time.perf_counter() - start
+
+        # ===== PARSING POR UNIDADE (funções inalteradas vêm do cache) =====
+        start = time.perf_counter()
+        spans = split_units(buffer)
+        if spans is None:
+            return self._full_compile(source_code)
+        units = []
+        cache = {}
+        for kind, start, end in spans:
+            key = span_hash(buffer, start, end) if kind == 'function' else None
+            unit = self.cache.get(key) if key else None
+            if unit is None:
+                program, errors = parse_ll1(buffer[start:end], emit='ast')
+                if errors or program is None:
+                    return self._full_compile(source_code)
+                if kind == 'function':
+                    if len(program.declarations) != 1:
+                        return self._full_compile(source_code)
+                    unit = _Unit(program.declarations[0])
+                else:
+                    unit = _Unit(program.declarations)
+            if key:
+                cache[key] = unit
+            units.append((kind, unit))
+        self.cache = cache   # descarta funções que não existem mais
+
+        declarations = []
+        for kind, unit in units:
+            declarations.extend([unit.ast] if kind == 'function' else unit.ast)
+        result['ast'] = ProgramNode(declarations)
+        timings['parser'] = time.perf_counter() - start
+
+        # ===== PASSO GLOBAL + ANÁLISE DAS FUNÇÕES ALTERADAS =====
+        start = time.perf_counter()
+        table = _RecordingTable()
+        analyzer = SemanticAnalyzer(table)
+        result['symbol_table'] = table
+        reused = result['incremental']['reused']
+        recompiled = result['incremental']['recompiled']
+        errors = []
+
+        for kind, unit in units:
+            if kind == 'statements':
+                first_error = len(analyzer.errors)
+                for stmt in unit.ast:
+                    analyzer.visit(stmt)
+                unit.errors = analyzer.errors[first_error:]
+                unit.ir = None
+                errors.extend(unit.errors)
+                continue
+
+            node = unit.ast
+            first_error = len(analyzer.errors)
+            if not analyzer.declare_function(node):
+                errors.extend(analyzer.errors[first_error:])
+                unit.ir = None
+                continue
+
+            table.visible = len(table.global_scope.symbols)
+            if unit.deps is not None and all(signature(table.visible_symbol(name)) == sig
+                                             for name, sig in unit.deps.items()):
+                reused.append(node.name)
+            else:
+                recompiled.append(node.name)
+                table.deps = {}
+                analyzer.errors = []
+                analyzer.run(analyzer.analyze_function_body(node))
+                unit.deps = table.deps
+                unit.errors = analyzer.errors
+                unit.ir = None
+                unit.optimized = {}
+                unit.placed = None
+                analyzer.errors = []
+            table.visible = None
+            errors.extend(unit.errors)
+        timings['semantic'] = time.perf_counter() - start
+
+        if errors:
+            result['errors'] = errors
+            return result
+
+        # ===== IR LOCAL, OTIMIZAÇÃO E ASSEMBLY POR UNIDADE =====
+        start = time.perf_counter()
+        for kind, unit in units:
+            if unit.ir is None:
+                self._lower(unit, table)
+        all_vars_zero = all(unit.vars_zero for _, unit in units)
+        timings['ir'] = time.perf_counter() - start
+        if self.optimize:
+            timings['optimizer'] = 0.0
+        timings['assembly'] = 0.0
+
+        ir_program, algebraic_ir, optimized_ir = IRProgram(), IRProgram(), IRProgram()
+        assembly = []
+        temp_base = label_base = 0
+        for kind, unit in units:
+            bases = (temp_base, label_base, all_vars_zero)
+            if unit.placed is None or unit.placed[0] != bases:
+                unit.placed = (bases,) + self._place(unit, table, temp_base, label_base,
+                                                     all_vars_zero, timings)
+            _, ir, algebraic, optimized, unit_assembly = unit.placed
+            ir_program.instructions.extend(ir)
+            if algebraic is not None:
+                algebraic_ir.instructions.extend(algebraic)
+            optimized_ir.instructions.extend(optimized)
+            assembly.extend(unit_assembly)
+            self._merge_frames(ir_program.frames, unit.frames)
+            temp_base += unit.temps
+            label_base += unit.labels
+        optimized_ir.frames = algebraic_ir.frames = ir_program.frames
+
+        result['ir'] = ir_program
+        result['algebraic_ir'] = algebraic_ir if self.optimize else None
+        result['optimized_ir'] = optimized_ir if self.optimize else ir_program
+        result['assembly'] = assembly
+        result['success'] = True
+        return result
+
+    def _full_compile(self, source_code):
+        """Sem divisão confiável (erro sintático): compilação completa, cache limpo"""
+        from .main import compile as full_compile
+        self.cache = {}
+        result = full_compile(source_code, self.optimize, backend=self.backend)
+        result['incremental'] = {'reused': [], 'recompiled': [], 'fallback': True}
+        return result
+
+    def _lower(self, unit, table):
+        """Gera o IR da unidade com numeração local (t0, L0, ...)"""
+        generator = IRGenerator(table, self.interner)
+        if isinstance(unit.ast, list):
+            for stmt in unit.ast:
+                generator.visit(stmt)
+        else:
+            generator.visit(unit.ast)
+        unit.ir = generator.ir_program.instructions
+        unit.temps = generator.temp_counter
+        unit.labels = generator.label_count
+        unit.frames = generator.ir_program.frames
+        unit.vars_zero = CodeGenerator._check_all_vars_zero(None, generator.ir_program)
+        unit.optimized = {}
+        unit.placed = None
+
+    def _place(self, unit, table, temp_base, label_base, all_vars_zero, timings):
+        """IR, IR algébrico, IR otimizado e assembly da unidade já renumerados"""
+        if all_vars_zero not in unit.optimized:
+            program = IRProgram()
+            program.instructions = unit.ir
+            program.frames = unit.frames    # globais do layout: vivas na saída da função
+            if self.optimize:
+                start = time.perf_counter()
+                codegen = CodeGenerator(table, interner=self.interner)
+                optimized = codegen.optimize(program, all_vars_zero=all_vars_zero)
+                unit.optimized[all_vars_zero] = (codegen.algebraic_ir.instructions,
+                                                 optimized.instructions)
+                timings['optimizer'] += time.perf_counter() - start
+            else:
+                unit.optimized[all_vars_zero] = (None, unit.ir)
+        algebraic, optimized = unit.optimized[all_vars_zero]
+
+        temp = self.interner.temp
+        mapping = {}
+        if temp_base:
+            mapping.update((temp(k), temp(k + temp_base)) for k in range(unit.temps))
+        if label_base:
+            for instr in unit.ir:
+                if instr.op == 'LABEL':
+                    prefix, number = _LABEL_RE.match(instr.result).groups()
+                    mapping[instr.result] = self.interner.label(prefix, int(number) + label_base)
+
+        ir = _renumber(unit.ir, mapping)
+        optimized = _renumber(optimized, mapping)
+        algebraic = _renumber(algebraic, mapping) if algebraic is not None else None
+        program = IRProgram()
+        program.instructions = optimized
+        start = time.perf_counter()
+        assembly = AssemblyGenerator().generate(program)
+        timings['assembly'] += time.perf_counter() - start
+        return ir, algebraic, optimized, assembly
+
+    @staticmethod
+    def _merge_frames(frames, unit_frames):
+        for name, layout in unit_frames.items():
+            if name is None:
+                global_frame = frames.setdefault(None, {})
+                for var, slot in layout.items():
+                    global_frame.setdefault(var, slot)
+            else:
+                frames[name] = layout
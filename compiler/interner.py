@@ -0,0 +1,66 @@
+"""
+Interner - Tabela de nomes canônicos de uma compilação
+Cada identificador, temporário, label e constante do TAC existe uma única
+vez: o lexer/scanner, a AST, a tabela de símbolos e o IR compartilham o
+mesmo objeto str (comparações viram comparações de identidade) e cada nome
+recebe um ID inteiro pequeno
+"""
+
+
+class Interner:
+    """Mapa nome ↔ ID para uma compilação (não compartilhar entre compilações)"""
+    __slots__ = ('_ids', 'names', '_temps', '_consts')
+
+    def __init__(self):
+        self._ids = {}       # str → ID
+        self.names = []      # ID → str canônica
+        self._temps = {}     # n → 't{n}'
+        self._consts = {}    # valor → str canônica do literal
+
+    def intern(self, name):
+        """Versão canônica de name (registra na primeira ocorrência)"""
+        index = self._ids.get(name)
+        if index is None:
+            self._ids[name] = len(self.names)
+            self.names.append(name)
+            return name
+        return self.names[index]
+
+    def id_of(self, name):
+        """ID inteiro de name (registra na primeira ocorrência)"""
+        index = self._ids.get(name)
+        if index is None:
+            index = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+    def name_of(self, index):
+        """Nome canônico de um ID"""
+        return self.names[index]
+
+    def temp(self, n):
+        """Temporário t{n} canônico"""
+        temp = self._temps.get(n)
+        if temp is None:
+            temp = self._temps[n] = self.intern(f"t{n}")
+        return temp
+
+    def label(self, base, n):
+        """Label {base}{n} canônico"""
+        return self.intern(f"{base}{n}")
+
+    def const(self, value):
+        """Literal do TAC (str(value)) canônico"""
+        text = self._consts.get(value)
+        if text is None:
+            text = self._consts[value] = self.intern(str(value))
+        return text
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._ids
+
+    def __repr__(self):
+        return f"Interner({len(self.names)} nomes)"
@@ -5,5 +5,8 @@ Three-Address Code (TAC) e Quádruplas
 
 from .ir import TAC, IRProgram
 from .ir_generator import IRGenerator
+from .cfg import BasicBlock, CFG, build_cfgs
+from .columnar import ColumnarIR, TACView, copy_propagation
+from .ssa import SSAForm
 
-__all__ = ['TAC', 'IRProgram', 'IRGenerator']
+__all__ = ['TAC', 'IRProgram', 'IRGenerator', 'BasicBlock', 'CFG', 'build_cfgs', 'ColumnarIR', 'TACView', 'copy_propagation', 'SSAForm']
@@ -0,0 +1,309 @@
+"""
+CFG - Blocos Básicos e Grafo de Fluxo de Controle do TAC
+Divide cada função em blocos básicos (sequências sem desvio no meio) ligados
+por listas de predecessores e sucessores, calcula dominadores
+(Cooper-Harvey-Kennedy sobre a pós-ordem reversa) e detecta laços naturais
+pelas arestas de retorno. Tudo em tempo linear no tamanho da função (os
+dominadores convergem em poucas passadas nos grafos estruturados que o
+IRGenerator produz)
+
+Uso:
+    for cfg in build_cfgs(ir_program):
+        for block in cfg.blocks:
+            print(cfg.name, block, block.succs, cfg.instructions_of(block))
+        cfg.loops()
+"""
+
+# Operações que desviam para o label em result
+JUMP_OPS = ('GOTO', 'IF_GOTO', 'IF_FALSE_GOTO')
+CONDITIONAL_JUMPS = ('IF_GOTO', 'IF_FALSE_GOTO')
+
+# Depois destas o bloco acaba; nas duas primeiras não há queda para o seguinte
+NO_FALLTHROUGH = ('GOTO', 'return')
+ENDS_BLOCK = JUMP_OPS + ('return', 'end_func')
+
+
+def leader_mask(ops):
+    """
+    bytearray com 1 nas instruções que começam um bloco básico
+
+    ops: lista com o nome da operação de cada instrução. Líderes são a
+    primeira instrução, todo LABEL e begin_func e toda instrução depois de
+    um desvio, return ou end_func
+    """
+    mask = bytearray(len(ops))
+    ends_block = True
+    for index, op in enumerate(ops):
+        if ends_block or op == 'LABEL' or op == 'begin_func':
+            mask[index] = 1
+        ends_block = op in ENDS_BLOCK
+    return mask
+
+
+class BasicBlock:
+    """Instruções [start, end) de um CFG, com as arestas do grafo (índices de bloco)"""
+    __slots__ = ('index', 'start', 'end', 'label', 'preds', 'succs')
+
+    def __init__(self, index, start, end, label=None):
+        self.index = index
+        self.start = start
+        self.end = end
+        self.label = label      # label do LABEL inicial, se houver
+        self.preds = []
+        self.succs = []
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __repr__(self):
+        label = f" {self.label}" if self.label else ""
+        return f"B{self.index}[{self.start}:{self.end}]{label}"
+
+
+class Loop:
+    """Laço natural: cabeçalho, blocos do corpo (inclui o cabeçalho) e arestas de retorno"""
+    __slots__ = ('header', 'blocks', 'back_edges')
+
+    def __init__(self, header):
+        self.header = header
+        self.blocks = {header}
+        self.back_edges = []
+
+    def __contains__(self, block):
+        return block in self.blocks
+
+    def __repr__(self):
+        return f"Loop(header=B{self.header}, blocks={sorted(self.blocks)})"
+
+
+class CFG:
+    """
+    Grafo de fluxo de controle de um trecho do programa (uma função)
+
+    Args:
+        instructions (list[TAC]): Lista de instruções do programa
+        start, end (int): Trecho [start, end) que forma o grafo
+        name (str): Nome da função (None = código global)
+    """
+
+    def __init__(self, instructions, start=0, end=None, name=None):
+        self.instructions = instructions
+        self.start = start
+        self.end = len(instructions) if end is None else end
+        self.name = name
+        self.blocks = []
+        self.block_of_label = {}
+        self._order = None
+        self._idom = None
+        self._dom_interval = None
+        self._loops = None
+        self._build()
+
+    def _build(self):
+        instructions = self.instructions
+        ops = [instructions[i].op for i in range(self.start, self.end)]
+        mask = leader_mask(ops)
+        leaders = [self.start + i for i, leader in enumerate(mask) if leader]
+        leaders.append(self.end)
+
+        for index in range(len(leaders) - 1):
+            first = instructions[leaders[index]]
+            label = first.result if first.op == 'LABEL' else None
+            block = BasicBlock(index, leaders[index], leaders[index + 1], label)
+            self.blocks.append(block)
+            if label is not None:
+                self.block_of_label[label] = index
+
+        for block in self.blocks:
+            last = instructions[block.end - 1]
+            if last.op in JUMP_OPS:
+                target = self.block_of_label.get(last.result)
+                if target is not None:
+                    self._edge(block.index, target)
+            if last.op not in NO_FALLTHROUGH and block.index + 1 < len(self.blocks):
+                self._edge(block.index, block.index + 1)
+
+    def _edge(self, source, target):
+        if target not in self.blocks[source].succs:
+            self.blocks[source].succs.append(target)
+            self.blocks[target].preds.append(source)
+
+    def instructions_of(self, block):
+        """Instruções de um bloco (BasicBlock ou índice)"""
+        if not isinstance(block, BasicBlock):
+            block = self.blocks[block]
+        return self.instructions[block.start:block.end]
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def __repr__(self):
+        return f"CFG({self.name!r}, {len(self.blocks)} blocks)"
+
+    # ---------------------------------------------------
+    # ORDEM E DOMINADORES
+    # ---------------------------------------------------
+    def reverse_postorder(self):
+        """Blocos alcançáveis a partir da entrada (bloco 0) em pós-ordem reversa"""
+        if self._order is None:
+            order = []
+            if self.blocks:
+                visited = {0}
+                stack = [(0, iter(self.blocks[0].succs))]
+                while stack:
+                    block, successors = stack[-1]
+                    for succ in successors:
+                        if succ not in visited:
+                            visited.add(succ)
+                            stack.append((succ, iter(self.blocks[succ].succs)))
+                            break
+                    else:
+                        stack.pop()
+                        order.append(block)
+                order.reverse()
+            self._order = order
+        return self._order
+
+    def dominators(self):
+        """
+        Dominador imediato de cada bloco (lista por índice; a entrada domina
+        a si mesma, blocos inalcançáveis ficam None)
+        """
+        if self._idom is None:
+            order = self.reverse_postorder()
+            number = {block: position for position, block in enumerate(order)}
+            idom = [None] * len(self.blocks)
+            if order:
+                idom[order[0]] = order[0]
+
+            def intersect(a, b):
+                while a != b:
+                    while number[a] > number[b]:
+                        a = idom[a]
+                    while number[b] > number[a]:
+                        b = idom[b]
+                return a
+
+            changed = True
+            while changed:
+                changed = False
+                for block in order[1:]:
+                    new_idom = None
+                    for pred in self.blocks[block].preds:
+                        if idom[pred] is None:
+                            continue
+                        new_idom = pred if new_idom is None else intersect(pred, new_idom)
+                    if idom[block] != new_idom:
+                        idom[block] = new_idom
+                        changed = True
+            self._idom = idom
+        return self._idom
+
+    def dominance_frontiers(self):
+        """
+        Fronteira de dominância de cada bloco (lista de conjuntos por índice):
+        onde a dominância de um bloco acaba, é onde os phis do SSA entram
+        """
+        idom = self.dominators()
+        frontiers = [set() for _ in self.blocks]
+        for block in self.blocks:
+            if idom[block.index] is None:
+                continue
+            preds = [pred for pred in block.preds if idom[pred] is not None]
+            if len(preds) < 2:
+                continue
+            for pred in preds:
+                runner = pred
+                while runner != idom[block.index]:
+                    frontiers[runner].add(block.index)
+                    runner = idom[runner]
+        return frontiers
+
+    def dominator_tree(self):
+        """Filhos de cada bloco na árvore de dominadores (lista por índice)"""
+        idom = self.dominators()
+        children = [[] for _ in self.blocks]
+        for block in self.reverse_postorder()[1:]:
+            children[idom[block]].append(block)
+        return children
+
+    def _number_dominator_tree(self):
+        """Intervalos [entrada, saída] da DFS na árvore: a domina b ⇔ intervalo de a contém o de b"""
+        enter = [-1] * len(self.blocks)
+        leave = [-1] * len(self.blocks)
+        order = self.reverse_postorder()
+        if order:
+            children = self.dominator_tree()
+            clock = 0
+            stack = [(order[0], iter(children[order[0]]))]
+            enter[order[0]] = clock
+            while stack:
+                block, pending = stack[-1]
+                child = next(pending, None)
+                clock += 1
+                if child is None:
+                    leave[block] = clock
+                    stack.pop()
+                else:
+                    enter[child] = clock
+                    stack.append((child, iter(children[child])))
+        self._dom_interval = (enter, leave)
+
+    def dominates(self, a, b):
+        """True se o bloco a domina o bloco b (todo caminho da entrada até b passa por a)"""
+        if self._dom_interval is None:
+            self._number_dominator_tree()
+        enter, leave = self._dom_interval
+        if enter[a] < 0 or enter[b] < 0:
+            return False
+        return enter[a] <= enter[b] and leave[b] <= leave[a]
+
+    # ---------------------------------------------------
+    # LAÇOS
+    # ---------------------------------------------------
+    def loops(self):
+        """Laços naturais (um por cabeçalho), a partir das arestas u → h com h dominando u"""
+        if self._loops is None:
+            idom = self.dominators()
+            by_header = {}
+            for tail in self.reverse_postorder():
+                for header in self.blocks[tail].succs:
+                    if not self.dominates(header, tail):
+                        continue
+                    loop = by_header.get(header)
+                    if loop is None:
+                        loop = by_header[header] = Loop(header)
+                    loop.back_edges.append((tail, header))
+                    # Corpo: tudo (alcançável) que chega a tail sem passar pelo cabeçalho
+                    stack = [tail]
+                    while stack:
+                        block = stack.pop()
+                        if block not in loop.blocks and idom[block] is not None:
+                            loop.blocks.add(block)
+                            stack.extend(self.blocks[block].preds)
+            self._loops = [by_header[header] for header in sorted(by_header)]
+        return self._loops
+
+
+def build_cfgs(ir_program):
+    """
+    Um CFG por função (begin_func..end_func) e um por trecho de código
+    global entre funções (name=None)
+
+    ir_program: IRProgram (inclusive ColumnarIR) ou sequência de TAC
+    """
+    instructions = ir_program.get_instructions() if hasattr(ir_program, 'get_instructions') else ir_program
+    cfgs = []
+    start = 0
+    name = None
+    for index, instr in enumerate(instructions):
+        if instr.op == 'begin_func':
+            if index > start:
+                cfgs.append(CFG(instructions, start, index))
+            start, name = index, instr.arg1
+        elif instr.op == 'end_func':
+            cfgs.append(CFG(instructions, start, index + 1, name))
+            start, name = index + 1, None
+    if start < len(instructions):
+        cfgs.append(CFG(instructions, start, len(instructions), name))
+    return cfgs
@@ -0,0 +1,346 @@
+"""
+IR Colunar - TAC guardado em arrays em vez de um objeto por instrução
+Cada instrução ocupa uma posição em quatro colunas: o código da operação
+(array('B')) e os IDs dos três operandos (array('i'), -1 = None). Os IDs
+apontam para a tabela de operandos do programa (nomes, literais e listas de
+argumentos de call, cada valor distinto guardado uma vez)
+
+ColumnarIR é um IRProgram: get_instructions()/instructions devolvem visões
+(TACView) com op/arg1/arg2/result, então os passes existentes rodam sem
+mudança; passes novos podem percorrer as colunas direto (ver
+copy_propagation abaixo)
+"""
+from array import array
+
+from .cfg import leader_mask
+from .liveness import FUNCTION_OPS, LABEL_OPS, is_variable
+from .ir import IRProgram, TAC
+
+
+# ═══════════════════════════════════════════════════════
+# CÓDIGOS DE OPERAÇÃO
+# ═══════════════════════════════════════════════════════
+
+OPCODE_NAMES = [
+    'assign', '+', '-', '*', '/', '<<',
+    '<', '>', '<=', '>=', '==', '!=',
+    'call', 'param', 'return', 'print', 'begin_func', 'end_func',
+    'LABEL', 'GOTO', 'IF_GOTO', 'IF_FALSE_GOTO',
+]
+OPCODES = {name: code for code, name in enumerate(OPCODE_NAMES)}
+
+NONE = -1   # ID de operando ausente
+DELETED = 255   # Código de uma instrução removida (lápide) até a compactação
+
+
+def opcode(op):
+    """Código de op (operações novas ganham o próximo código livre)"""
+    code = OPCODES.get(op)
+    if code is None:
+        if len(OPCODE_NAMES) >= DELETED:
+            raise ValueError(f"Códigos de operação esgotados: {op!r}")
+        code = OPCODES[op] = len(OPCODE_NAMES)
+        OPCODE_NAMES.append(op)
+    return code
+
+
+# ═══════════════════════════════════════════════════════
+# VISÕES
+# ═══════════════════════════════════════════════════════
+
+def _column(name):
+    def get(self):
+        return self._ir.operand(getattr(self._ir, name)[self._index])
+
+    def set(self, value):
+        getattr(self._ir, name)[self._index] = self._ir.operand_id(value)
+
+    return property(get, set)
+
+
+class TACView(TAC):
+    """Uma instrução de um ColumnarIR com a interface de TAC (leitura e escrita)"""
+    __slots__ = ('_ir', '_index')
+
+    def __init__(self, ir, index):
+        self._ir = ir
+        self._index = index
+
+    @property
+    def op(self):
+        return OPCODE_NAMES[self._ir.ops[self._index]]
+
+    @op.setter
+    def op(self, value):
+        self._ir.ops[self._index] = opcode(value)
+
+    arg1 = _column('arg1')
+    arg2 = _column('arg2')
+    result = _column('result')
+
+
+class InstructionList:
+    """
+    Sequência de TACView sobre as colunas (o que IRProgram.instructions é
+    para TAC). Aceita as escritas dos passes: instructions[i] = None deixa
+    uma lápide (lida de volta como None) e instructions[:] = [...] regrava
+    as colunas, como compact() faz
+    """
+    __slots__ = ('_ir',)
+
+    def __init__(self, ir):
+        self._ir = ir
+
+    def __len__(self):
+        return len(self._ir.ops)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TACView(self._ir, i) for i in range(*index.indices(len(self._ir.ops)))]
+        if index < 0:
+            index += len(self._ir.ops)
+        if not 0 <= index < len(self._ir.ops):
+            raise IndexError("índice de instrução fora do programa")
+        return None if self._ir.ops[index] == DELETED else TACView(self._ir, index)
+
+    def __setitem__(self, index, value):
+        ir = self._ir
+        if isinstance(index, slice):
+            # Lê todas as linhas antes de escrever: as visões apontam para as colunas
+            rows = [self._row(tac) for tac in value]
+            for column, kind, values in zip((ir.ops, ir.arg1, ir.arg2, ir.result),
+                                            ('B', 'i', 'i', 'i'), zip(*rows) if rows else ((),) * 4):
+                column[index] = array(kind, values)
+            return
+        if index < 0:
+            index += len(ir.ops)
+        if not 0 <= index < len(ir.ops):
+            raise IndexError("índice de instrução fora do programa")
+        op, arg1, arg2, result = self._row(value)
+        ir.ops[index] = op
+        ir.arg1[index] = arg1
+        ir.arg2[index] = arg2
+        ir.result[index] = result
+
+    def _row(self, tac):
+        """(código, IDs dos operandos) de tac (None = lápide)"""
+        ir = self._ir
+        if tac is None:
+            return DELETED, NONE, NONE, NONE
+        if isinstance(tac, TACView) and tac._ir is ir:
+            index = tac._index
+            return ir.ops[index], ir.arg1[index], ir.arg2[index], ir.result[index]
+        return (opcode(tac.op), ir.operand_id(tac.arg1),
+                ir.operand_id(tac.arg2), ir.operand_id(tac.result))
+
+    def __iter__(self):
+        ir = self._ir
+        for index in range(len(ir.ops)):
+            yield None if ir.ops[index] == DELETED else TACView(ir, index)
+
+    def append(self, tac):
+        self._ir.add(tac)
+
+    def extend(self, tacs):
+        for tac in tacs:
+            self._ir.add(tac)
+
+
+# ═══════════════════════════════════════════════════════
+# PROGRAMA
+# ═══════════════════════════════════════════════════════
+
+class ColumnarIR(IRProgram):
+    """IRProgram em colunas: ops, arg1, arg2, result + tabela de operandos"""
+
+    def __init__(self, operands=None):
+        self.ops = array('B')
+        self.arg1 = array('i')
+        self.arg2 = array('i')
+        self.result = array('i')
+        # Tabela de operandos: ID → valor e valor → ID (listas viram tuplas).
+        # Programas derivados (compact) compartilham a tabela
+        if operands is None:
+            operands = ([], {})
+        self.operands, self._operand_ids = operands
+        self.frames = {}
+
+    @property
+    def instructions(self):
+        return InstructionList(self)
+
+    @instructions.setter
+    def instructions(self, tacs):
+        for column in (self.ops, self.arg1, self.arg2, self.result):
+            del column[:]
+        for tac in tacs:
+            self.add(tac)
+
+    # ---------------------------------------------------
+    # OPERANDOS
+    # ---------------------------------------------------
+    def operand_id(self, value):
+        """ID de value na tabela de operandos (registra na primeira ocorrência)"""
+        if value is None:
+            return NONE
+        key = tuple(value) if isinstance(value, list) else value
+        index = self._operand_ids.get(key)
+        if index is None:
+            index = self._operand_ids[key] = len(self.operands)
+            self.operands.append(key)
+        return index
+
+    def operand(self, index):
+        """Valor do operando index (None para NONE; listas saem como list)"""
+        if index == NONE:
+            return None
+        value = self.operands[index]
+        return list(value) if type(value) is tuple else value
+
+    # ---------------------------------------------------
+    # API DE IRProgram
+    # ---------------------------------------------------
+    def add(self, tac):
+        self.append(tac.op, tac.arg1, tac.arg2, tac.result)
+
+    def append(self, op, arg1=None, arg2=None, result=None):
+        operand_id = self.operand_id
+        self.ops.append(opcode(op))
+        self.arg1.append(operand_id(arg1))
+        self.arg2.append(operand_id(arg2))
+        self.result.append(operand_id(result))
+
+    def emit(self, op, arg1=None, arg2=None, result=None):
+        self.append(op, arg1, arg2, result)
+        return TACView(self, len(self.ops) - 1)
+
+    def get_instructions(self):
+        return InstructionList(self)
+
+    def __len__(self):
+        return len(self.ops)
+
+    def __repr__(self):
+        return f"ColumnarIR({len(self.ops)} instructions, {len(self.operands)} operands)"
+
+    # ---------------------------------------------------
+    # CONVERSÕES E OPERAÇÕES POR COLUNA
+    # ---------------------------------------------------
+    @classmethod
+    def from_program(cls, ir_program):
+        """Converte um IRProgram (TAC) para colunas"""
+        columnar = cls()
+        for tac in ir_program.get_instructions():
+            columnar.add(tac)
+        columnar.frames = ir_program.frames
+        return columnar
+
+    def to_program(self):
+        """IRProgram com objetos TAC independentes das colunas"""
+        program = IRProgram()
+        operand = self.operand
+        program.instructions = [
+            TAC(OPCODE_NAMES[op], operand(a1), operand(a2), operand(r))
+            for op, a1, a2, r in zip(self.ops, self.arg1, self.arg2, self.result)
+        ]
+        program.frames = self.frames
+        return program
+
+    def derived(self):
+        """Programa vazio com a mesma tabela de operandos e os mesmos frames"""
+        program = ColumnarIR((self.operands, self._operand_ids))
+        program.frames = self.frames
+        return program
+
+    def copy(self):
+        """Cópia das colunas (a tabela de operandos só cresce: é compartilhada)"""
+        program = self.derived()
+        for column, source in ((program.ops, self.ops), (program.arg1, self.arg1),
+                               (program.arg2, self.arg2), (program.result, self.result)):
+            column.extend(source)
+        return program
+
+    def compact(self, keep):
+        """Novo programa só com as instruções i em que keep[i] é verdadeiro"""
+        program = self.derived()
+        for column, source in ((program.ops, self.ops), (program.arg1, self.arg1),
+                               (program.arg2, self.arg2), (program.result, self.result)):
+            column.extend(value for value, kept in zip(source, keep) if kept)
+        return program
+
+    def _global_ids(self):
+        """IDs dos nomes definidos fora de funções (global_names pelas colunas)"""
+        begin, end = OPCODES['begin_func'], OPCODES['end_func']
+        skipped = {OPCODES[op] for op in LABEL_OPS + FUNCTION_OPS}
+        ids = set()
+        depth = 0
+        for op, result in zip(self.ops, self.result):
+            if op == begin:
+                depth += 1
+            elif op == end:
+                depth -= 1
+            elif depth == 0 and result != NONE and op not in skipped and op != DELETED:
+                ids.add(result)
+        return {index for index in ids if is_variable(self.operands[index])}
+
+    def literal_mask(self):
+        """bytearray: 1 nas posições da tabela de operandos que são literais inteiros"""
+        mask = bytearray(len(self.operands))
+        for index, value in enumerate(self.operands):
+            try:
+                int(value)
+                mask[index] = 1
+            except (ValueError, TypeError):
+                pass
+        return mask
+
+
+# ═══════════════════════════════════════════════════════
+# PASSES POR COLUNA
+# ═══════════════════════════════════════════════════════
+
+def copy_propagation(ir, globals=()):
+    """
+    CopyPropagation percorrendo as colunas: mesmo resultado de
+    CopyPropagation(globals).apply, comparando IDs inteiros em vez de
+    strings e sem criar objetos TAC
+    """
+    if not isinstance(ir, ColumnarIR):
+        ir = ColumnarIR.from_program(ir)
+    literal = ir.literal_mask()
+    leaders = leader_mask([OPCODE_NAMES[op] for op in ir.ops])
+    assign, call = OPCODES['assign'], OPCODES['call']
+    global_ids = set(ir._global_ids()) | {ir._operand_ids[name] for name in globals
+                                          if name in ir._operand_ids}
+    out = ir.derived()
+    out_ops, out_arg1, out_arg2, out_result = out.ops, out.arg1, out.arg2, out.result
+    copies = {}        # ID da cópia → ID do original
+    copied_from = {}   # ID do original → IDs das cópias
+
+    def kill(var):
+        copies.pop(var, None)
+        for copy in copied_from.pop(var, ()):
+            if copies.get(copy) == var:
+                del copies[copy]
+
+    for op, a1, a2, r, leader in zip(ir.ops, ir.arg1, ir.arg2, ir.result, leaders):
+        if leader:
+            copies.clear()
+            copied_from.clear()
+        if op == assign and not (a1 != NONE and literal[a1]):
+            kill(r)
+            copies[r] = a1
+            copied_from.setdefault(a1, []).append(r)
+        else:
+            a1 = copies.get(a1, a1)
+            a2 = copies.get(a2, a2)
+            if r != NONE:
+                kill(r)
+            if op == call:
+                for var in global_ids:
+                    kill(var)
+        out_ops.append(op)
+        out_arg1.append(a1)
+        out_arg2.append(a2)
+        out_result.append(r)
+    return out
@@ -46,6 +46,9 @@ class IRProgram:
     """Representa um programa em IR (lista de instruções TAC)"""
     def __init__(self):
         self.instructions = []
+        # Layout dos frames: função (None = escopo global) → {variável: slot}
+        # Os slots vêm da análise semântica; o tamanho do frame é len(layout)
+        self.frames = {}
     
     def add(self, tac):
         """Adiciona uma instrução TAC"""
@@ -3,12 +3,20 @@ Gerador de IR (Código Intermediário)
 Converte AST em TAC (Three-Address Code)
 """
 from ..ast.ast_builder import *
+from ..ast.visitor import Visitor
+from ..interner import Interner
 from .ir import IRProgram
 
-class IRGenerator:
-    def __init__(self, symbol_table):
+class IRGenerator(Visitor):
+    def __init__(self, symbol_table, interner=None, ir_program=None):
         self.symbol_table = symbol_table
-        self.ir_program = IRProgram()
+        # Temporários, labels e literais saem canônicos do interner da
+        # compilação (o mesmo usado pelo lexer, quando compartilhado)
+        self.interner = interner if interner is not None else Interner()
+        # ir_program: destino das instruções (ex.: um ColumnarIR vazio)
+        self.ir_program = ir_program if ir_program is not None else IRProgram()
+        self.global_frame = self.ir_program.frames.setdefault(None, {})
+        self.frame = self.global_frame
         self.temp_counter = 0
         self.label_count = 0    # ← FALTAVA ISSO!
 
@@ -16,15 +24,21 @@ class IRGenerator:
     # FERRAMENTAS INTERNAS
     # ---------------------------------------------------
     def new_temp(self):
-        temp = f"t{self.temp_counter}"
+        temp = self.interner.temp(self.temp_counter)
         self.temp_counter += 1
         return temp
 
     def new_label(self, base="L"):
-        label = f"{base}{self.label_count}"
+        label = self.interner.label(base, self.label_count)
         self.label_count += 1
         return label
 
+    def record_slot(self, node):
+        """Registra o slot resolvido pela análise semântica no layout do frame"""
+        if node.slot is not None:
+            frame = self.global_frame if node.depth == 0 else self.frame
+            frame[self.interner.intern(node.name)] = node.slot
+
     def emit(self, op, a1=None, a2=None, res=None):
         """Facilita a escrita de quádruplas"""
         self.ir_program.emit(op, a1, a2, res)
@@ -36,88 +50,83 @@ class IRGenerator:
         self.visit(ast_node)
         return self.ir_program
 
-    # ---------------------------------------------------
-    # VISITADOR GENÉRICO
-    # ---------------------------------------------------
-    def visit(self, node):
-        if node is None:
-            return None
-        method_name = f'visit_{node.node_type}'
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
-
-    def generic_visit(self, node):
-        raise NotImplementedError(f"Visitante não implementado: {node.node_type}")
-
     # ---------------------------------------------------
     # PROGRAMA E FUNÇÃO
     # ---------------------------------------------------
     def visit_program(self, node):
         for decl in node.declarations:
-            self.visit(decl)
+            yield decl
 
     def visit_function(self, node):
         self.emit('begin_func', node.name)
+        # Parâmetros ocupam os primeiros slots, na ordem da declaração
+        self.frame = self.ir_program.frames.setdefault(node.name, {})
+        for slot, param in enumerate(node.params):
+            self.frame[self.interner.intern(param.name)] = slot
 
         for stmt in node.body:
-            self.visit(stmt)
+            yield stmt
 
+        self.frame = self.global_frame
         self.emit('end_func', node.name)
 
     # ---------------------------------------------------
     # ATRIBUIÇÃO, DECLARAÇÃO, RETORNO, PRINT
     # ---------------------------------------------------
     def visit_decl_assign(self, node):
-        val = self.visit(node.value)
-        self.emit('assign', val, None, node.name)
+        val = yield node.value
+        self.record_slot(node)
+        self.emit('assign', val, None, self.interner.intern(node.name))
 
     def visit_assign(self, node):
-        val = self.visit(node.value)
-        self.emit('assign', val, None, node.name)
+        val = yield node.value
+        self.record_slot(node)
+        self.emit('assign', val, None, self.interner.intern(node.name))
 
     def visit_return(self, node):
         if node.value:
-            val = self.visit(node.value)
+            val = yield node.value
             self.emit('return', val)
         else:
             self.emit('return')
 
     def visit_print(self, node):
-        val = self.visit(node.value)
+        val = yield node.value
         self.emit('print', val)
 
     # ---------------------------------------------------
     # EXPRESSÕES
     # ---------------------------------------------------
     def visit_binop(self, node):
-        left_result = self.visit(node.left)
-        right_result = self.visit(node.right)
+        left_result = yield node.left
+        right_result = yield node.right
         temp = self.new_temp()
         self.ir_program.emit(node.op, left_result, right_result, temp)
         return temp
 
     def visit_number(self, node):
-        return str(node.value)
+        return self.interner.const(node.value)
 
     def visit_id(self, node):
-        return node.name
+        self.record_slot(node)
+        return self.interner.intern(node.name)
 
     def visit_call(self, node):
         args = []
         for arg in node.args:
-            temp = self.visit(arg)
+            temp = yield arg
             self.emit('param', temp)
             args.append(temp)
 
         ret = self.new_temp()
-        self.emit('call', node.name, args, ret)
+        self.emit('call', self.interner.intern(node.name), args, ret)
         return ret
 
     # ---------------------------------------------------
     #  IF / ELSE
     # ---------------------------------------------------
     def visit_if(self, node):
-        cond = self.visit(node.condition)
+        cond = yield node.condition
 
         Ltrue = self.new_label("Ltrue")
         Lfalse = self.new_label("Lfalse")
@@ -131,7 +140,7 @@ class IRGenerator:
         # bloco THEN
         self.emit("LABEL", None, None, Ltrue)
         for stmt in node.then_block:
-            self.visit(stmt)
+            yield stmt
 
         if node.else_block:
             # pular o else
@@ -140,7 +149,7 @@ class IRGenerator:
             # bloco ELSE
             self.emit("LABEL", None, None, Lfalse)
             for stmt in node.else_block:
-                self.visit(stmt)
+                yield stmt
 
             # fim do if-else
             self.emit("LABEL", None, None, Lend)
@@ -160,14 +169,14 @@ class IRGenerator:
         self.emit("LABEL", None, None, Lbegin)
 
         # avalia condição
-        cond = self.visit(node.condition)
+        cond = yield node.condition
 
         # if cond == false goto Lend
         self.emit("IF_FALSE_GOTO", cond, None, Lend)
 
         # corpo
         for stmt in node.body:
-            self.visit(stmt)
+            yield stmt
 
         # volta ao início
         self.emit("GOTO", None, None, Lbegin)
@@ -176,7 +185,7 @@ class IRGenerator:
         self.emit("LABEL", None, None, Lend)
     def visit_for(self, node):
         # init
-        self.visit(node.init)
+        yield node.init
 
         # labels
         begin = self.new_label("Lbegin")
@@ -185,15 +194,15 @@ class IRGenerator:
         self.ir_program.emit('LABEL', None, None, begin)
 
         # condition
-        cond_result = self.visit(node.condition)
+        cond_result = yield node.condition
         self.ir_program.emit('IF_FALSE_GOTO', cond_result, None, end)
 
         # body
         for stmt in node.body:
-            self.visit(stmt)
+            yield stmt
 
         # increment
-        self.visit(node.increment)
+        yield node.increment
 
         # loop
         self.ir_program.emit('GOTO', None, None, begin)
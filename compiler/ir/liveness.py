@@ -0,0 +1,173 @@
+"""
+Liveness - Análise de Variáveis Vivas sobre o CFG
+Fluxo de dados para trás com lista de trabalho: cada bloco tem conjuntos
+gen/kill e live_in/live_out guardados como inteiros (bit i = variável i da
+função). Um bloco só volta para a lista quando o live_in de um sucessor
+muda, então o custo fica perto de linear no tamanho da função
+
+Variáveis globais (e tudo definido no código global) estão vivas na saída
+de toda função e são lidas por toda chamada: a função chamada pode usá-las
+"""
+from .cfg import JUMP_OPS
+
+# Em LABEL e nos desvios result é um label; em begin_func/end_func arg1 é o
+# nome da função; em call arg1 é o nome da função chamada
+LABEL_OPS = JUMP_OPS + ('LABEL',)
+FUNCTION_OPS = ('begin_func', 'end_func')
+
+
+def is_variable(value):
+    """True para nomes de variáveis e temporários (não literais nem listas)"""
+    if not isinstance(value, str) or not value:
+        return False
+    return not value.lstrip('-').isdigit()
+
+
+def uses(instr):
+    """Variáveis lidas por instr"""
+    op = instr.op
+    if op in FUNCTION_OPS or op == 'LABEL' or op == 'GOTO':
+        return []
+    names = []
+    for value in ((instr.arg2,) if op == 'call' else (instr.arg1, instr.arg2)):
+        if isinstance(value, list):
+            names.extend(arg for arg in value if is_variable(arg))
+        elif is_variable(value):
+            names.append(value)
+    return names
+
+
+def definition(instr):
+    """Variável escrita por instr (None se não escreve nenhuma)"""
+    if instr.op in LABEL_OPS or instr.op in FUNCTION_OPS:
+        return None
+    return instr.result if is_variable(instr.result) else None
+
+
+def global_names(instructions):
+    """Nomes definidos fora de qualquer função (variáveis globais)"""
+    names = set()
+    depth = 0
+    for instr in instructions:
+        if instr.op == 'begin_func':
+            depth += 1
+        elif instr.op == 'end_func':
+            depth -= 1
+        elif depth == 0:
+            name = definition(instr)
+            if name is not None:
+                names.add(name)
+    return names
+
+
+class Liveness:
+    """
+    Variáveis vivas na entrada e na saída de cada bloco de um CFG
+
+    Args:
+        cfg (CFG): Grafo da função
+        globals (set[str]): Vivas na saída da função e lidas por toda chamada
+    """
+
+    def __init__(self, cfg, globals=()):
+        self.cfg = cfg
+        self.index = {}    # variável → bit
+        self.names = []    # bit → variável
+        for name in sorted(globals):
+            self.bit(name)
+        self.globals_mask = (1 << len(self.names)) - 1
+        self.live_in = [0] * len(cfg.blocks)
+        self.live_out = [0] * len(cfg.blocks)
+        self.iterations = 0     # blocos processados pela lista de trabalho
+        # Por instrução do trecho (índice - cfg.start): variável definida e usadas
+        self.defs = [None] * (cfg.end - cfg.start)
+        self.uses = [()] * (cfg.end - cfg.start)
+        self._solve()
+
+    def bit(self, name):
+        index = self.index.get(name)
+        if index is None:
+            index = self.index[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+    def _mask(self, names):
+        """Inteiro com os bits das variáveis em names"""
+        if not names:
+            return 0
+        bits = bytearray((len(self.names) + 8) // 8)
+        for name in names:
+            index = self.bit(name)
+            if index >= len(bits) * 8:
+                bits.extend(bytes(index // 8 + 1 - len(bits)))
+            bits[index >> 3] |= 1 << (index & 7)
+        return int.from_bytes(bits, 'little')
+
+    def names_in(self, mask):
+        """Conjunto de nomes com bit ligado em mask"""
+        names = set()
+        while mask:
+            low = mask & -mask
+            names.add(self.names[low.bit_length() - 1])
+            mask ^= low
+        return names
+
+    def _solve(self):
+        cfg = self.cfg
+        instructions = cfg.instructions
+        defs, uses_of = self.defs, self.uses
+        gen = []
+        kill = []
+        for block in cfg.blocks:
+            # Percurso para trás: usado antes de ser definido no bloco → gen
+            used, defined = set(), set()
+            calls = False
+            for index in range(block.end - 1, block.start - 1, -1):
+                instr = instructions[index]
+                name = defs[index - cfg.start] = definition(instr)
+                if name is not None:
+                    used.discard(name)
+                    defined.add(name)
+                read = uses_of[index - cfg.start] = uses(instr)
+                used.update(read)
+                calls = calls or instr.op == 'call'
+            # Uma chamada lê as globais (conservador: entram no gen do bloco inteiro)
+            gen.append(self._mask(used) | (self.globals_mask if calls else 0))
+            kill.append(self._mask(defined))
+
+        blocks = cfg.blocks
+        # Pós-ordem (reverso da RPO) primeiro: sucessores tendem a sair antes
+        worklist = list(cfg.reverse_postorder())
+        pending = set(worklist)
+        worklist[:0] = [b.index for b in blocks if b.index not in pending]
+        pending.update(worklist)
+        live_in, live_out = self.live_in, self.live_out
+        while worklist:
+            index = worklist.pop()
+            pending.discard(index)
+            self.iterations += 1
+            succs = blocks[index].succs
+            if succs:
+                out = 0
+                for succ in succs:
+                    out |= live_in[succ]
+            else:
+                out = self.globals_mask
+            live_out[index] = out
+            new_in = gen[index] | (out & ~kill[index])
+            if new_in != live_in[index]:
+                live_in[index] = new_in
+                for pred in blocks[index].preds:
+                    if pred not in pending:
+                        pending.add(pred)
+                        worklist.append(pred)
+
+    def live_at_exit(self, block):
+        """Nomes vivos na saída de block (BasicBlock ou índice)"""
+        index = block if isinstance(block, int) else block.index
+        return self.names_in(self.live_out[index])
+
+    def live_at_entry(self, block):
+        """Nomes vivos na entrada de block (BasicBlock ou índice)"""
+        index = block if isinstance(block, int) else block.index
+        return self.names_in(self.live_in[index])
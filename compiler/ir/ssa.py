@@ -0,0 +1,388 @@
+"""
+SSA - Forma de Atribuição Única Estática para o TAC
+Cada definição de uma variável local ganha um nome próprio (x.1, x.2, ...)
+e, onde caminhos com versões diferentes se encontram, um phi escolhe a
+versão conforme o predecessor. Os phis entram pelas fronteiras de
+dominância (só para variáveis vivas entre blocos: SSA semi-podado) e a
+renomeação percorre a árvore de dominadores
+
+Sobre o SSA, cada nome tem uma única definição e uma lista de usos, então
+análises esparsas (constants) só revisitam os usos de um nome quando o
+valor dele muda, em vez de varrer o programa inteiro
+
+Variáveis globais não são renomeadas (uma chamada pode alterá-las); a
+versão 0 de cada local é o próprio nome: o valor que chega na entrada
+(parâmetros ou variável ainda não atribuída)
+
+Uso:
+    for cfg in build_cfgs(ir_program):
+        ssa = SSAForm(cfg, globals={'g'})
+        ssa.instructions()        # TAC com phis e nomes versionados
+        ssa.constants(fold)       # nome SSA → literal (propagação esparsa)
+        ssa.destruct()            # de volta ao TAC: phis viram cópias
+"""
+from ..ir.ir import TAC
+from .cfg import JUMP_OPS
+from .liveness import FUNCTION_OPS, definition, is_variable, uses
+
+SEPARATOR = '.'   # x.1: nunca colide com nomes do código fonte
+
+# Valor de uma variável que não é constante (a ausência no mapa é "ainda
+# desconhecido": o topo do reticulado)
+VARYING = object()
+
+
+def base_name(name):
+    """Nome original de uma versão SSA (x.3 → x)"""
+    return name.split(SEPARATOR, 1)[0] if isinstance(name, str) else name
+
+
+class SSAForm:
+    """
+    Um CFG em SSA
+
+    Args:
+        cfg (CFG): Grafo da função
+        globals (set[str]): Variáveis que ficam fora da renomeação
+
+    Atributos:
+        code: por bloco, a lista de TAC em SSA (phis primeiro)
+        origin: por bloco, o índice da instrução original de cada TAC
+                (None nos phis)
+        defs: nome SSA → TAC que o define
+        users: nome SSA → TACs que o usam
+    """
+
+    def __init__(self, cfg, globals=()):
+        self.cfg = cfg
+        self.globals = set(globals)
+        self.code = [[] for _ in cfg.blocks]
+        self.origin = [[] for _ in cfg.blocks]
+        self.defs = {}
+        self.users = {}
+        self.phi_count = 0
+        self._versions = {}
+        self._insert_phis()
+        self._rename()
+
+    # ---------------------------------------------------
+    # CONSTRUÇÃO
+    # ---------------------------------------------------
+    def _insert_phis(self):
+        cfg = self.cfg
+        instructions = cfg.instructions
+        idom = cfg.dominators()
+
+        # Locais definidas em cada bloco e nomes lidos antes de definidos em
+        # algum bloco (só estes precisam de phi: SSA semi-podado)
+        def_blocks = {}
+        crossing = set()
+        for block in cfg.blocks:
+            if idom[block.index] is None:
+                continue
+            defined = set()
+            for index in range(block.start, block.end):
+                instr = instructions[index]
+                for name in uses(instr):
+                    if name not in defined:
+                        crossing.add(name)
+                name = definition(instr)
+                if name is not None and name not in self.globals:
+                    defined.add(name)
+                    def_blocks.setdefault(name, set()).add(block.index)
+        self.locals = set(def_blocks)
+
+        frontiers = cfg.dominance_frontiers()
+        self._phis = [[] for _ in cfg.blocks]
+        for name in sorted(def_blocks):
+            if name not in crossing:
+                continue
+            has_phi = set()
+            worklist = list(def_blocks[name])
+            while worklist:
+                block = worklist.pop()
+                for frontier in frontiers[block]:
+                    if frontier in has_phi:
+                        continue
+                    has_phi.add(frontier)
+                    preds = list(cfg.blocks[frontier].preds)
+                    phi = TAC('phi', [name] * len(preds), preds, name)
+                    self._phis[frontier].append(phi)
+                    self.phi_count += 1
+                    if frontier not in def_blocks[name]:
+                        worklist.append(frontier)
+
+    def _new_version(self, name, stacks):
+        version = self._versions.get(name, 0) + 1
+        self._versions[name] = version
+        versioned = f"{name}{SEPARATOR}{version}"
+        stacks[name].append(versioned)
+        return versioned
+
+    def _rename(self):
+        cfg = self.cfg
+        instructions = cfg.instructions
+        stacks = {name: [name] for name in self.locals}
+        children = cfg.dominator_tree()
+        idom = cfg.dominators()
+
+        def current(value):
+            stack = stacks.get(value) if isinstance(value, str) else None
+            return stack[-1] if stack else value
+
+        order = cfg.reverse_postorder()
+        work = [(order[0], False)] if order else []
+        pushed = {}
+        while work:
+            block, leaving = work.pop()
+            if leaving:
+                for name in pushed.pop(block):
+                    stacks[name].pop()
+                continue
+
+            names = []
+            info = cfg.blocks[block]
+            # Phis logo depois do LABEL (ou begin_func) que abre o bloco
+            head = info.start + (instructions[info.start].op in ('LABEL', 'begin_func'))
+            for index in range(info.start, head):
+                self._rename_instruction(block, index, current, stacks, names)
+            for phi in self._phis[block]:
+                phi.result = self._new_version(phi.result, stacks)
+                names.append(base_name(phi.result))
+                self.code[block].append(phi)
+                self.origin[block].append(None)
+                self.defs[phi.result] = phi
+            for index in range(head, info.end):
+                self._rename_instruction(block, index, current, stacks, names)
+
+            for succ in info.succs:
+                position = cfg.blocks[succ].preds.index(block)
+                for phi in self._phis[succ]:
+                    phi.arg1[position] = current(base_name(phi.result))
+
+            pushed[block] = names
+            work.append((block, True))
+            work.extend((child, False) for child in reversed(children[block]))
+
+        # Blocos inalcançáveis ficam como estão (sem versões nem phis)
+        for block in cfg.blocks:
+            if idom[block.index] is None:
+                for index in range(block.start, block.end):
+                    instr = instructions[index]
+                    arg2 = list(instr.arg2) if isinstance(instr.arg2, list) else instr.arg2
+                    self.code[block.index].append(TAC(instr.op, instr.arg1, arg2, instr.result))
+                    self.origin[block.index].append(index)
+
+        # Cadeias def-uso (inclui os usos nos phis)
+        for block_code in self.code:
+            for tac in block_code:
+                for name in self._used_names(tac):
+                    self.users.setdefault(name, []).append(tac)
+
+    def _rename_instruction(self, block, index, current, stacks, names):
+        """Cópia da instrução index com os usos e a definição versionados"""
+        instr = self.cfg.instructions[index]
+        arg2 = list(instr.arg2) if isinstance(instr.arg2, list) else instr.arg2
+        tac = TAC(instr.op, instr.arg1, arg2, instr.result)
+        self._rename_uses(tac, current)
+        name = definition(instr)
+        if name is not None and name in stacks:
+            tac.result = self._new_version(name, stacks)
+            names.append(name)
+            self.defs[tac.result] = tac
+        self.code[block].append(tac)
+        self.origin[block].append(index)
+
+    @staticmethod
+    def _rename_uses(tac, current):
+        op = tac.op
+        if op in FUNCTION_OPS or op == 'LABEL' or op == 'GOTO':
+            return
+        if op == 'call':
+            if isinstance(tac.arg2, list):
+                tac.arg2 = [current(arg) for arg in tac.arg2]
+            return
+        tac.arg1 = current(tac.arg1)
+        if isinstance(tac.arg2, list):
+            tac.arg2 = [current(arg) for arg in tac.arg2]
+        else:
+            tac.arg2 = current(tac.arg2)
+
+    @staticmethod
+    def _used_names(tac):
+        if tac.op == 'phi':
+            return [arg for arg in tac.arg1 if is_variable(arg)]
+        return uses(tac)
+
+    # ---------------------------------------------------
+    # CONSULTA
+    # ---------------------------------------------------
+    def instructions(self):
+        """Lista de TAC em SSA, bloco a bloco na ordem original"""
+        return [tac for block_code in self.code for tac in block_code]
+
+    def pairs(self):
+        """(índice da instrução original, TAC em SSA) para cada instrução não-phi"""
+        for block_code, block_origin in zip(self.code, self.origin):
+            for tac, index in zip(block_code, block_origin):
+                if index is not None:
+                    yield index, tac
+
+    # ---------------------------------------------------
+    # PROPAGAÇÃO ESPARSA DE CONSTANTES
+    # ---------------------------------------------------
+    def constants(self, fold, varying=None):
+        """
+        Propagação de constantes sobre as cadeias def-uso
+
+        Args:
+            fold (callable): fold(op, a, b) → literal de a op b, ou None se
+                             op não é calculável em tempo de compilação
+            varying (callable): varying(nome original) → True para variáveis
+                                cujo valor não deve ser usado (ex.: modo simbólico)
+
+        Returns:
+            dict: nome SSA → literal, para todo nome com valor constante
+        """
+        values = {}
+        work = []
+        executable = {block for block, code in enumerate(self.code) if code}
+
+        def value_of(operand):
+            if not is_variable(operand):
+                return operand
+            if operand not in self.defs:
+                return VARYING          # versão 0: valor de entrada
+            return values.get(operand)  # None = ainda desconhecido
+
+        def evaluate(tac):
+            if varying is not None and varying(base_name(tac.result)):
+                return VARYING
+            op = tac.op
+            if op == 'phi':
+                result = None
+                for arg, pred in zip(tac.arg1, tac.arg2):
+                    if pred not in executable:
+                        continue
+                    value = value_of(arg)
+                    if value is None:
+                        continue
+                    if value is VARYING or (result is not None and value != result):
+                        return VARYING
+                    result = value
+                return result
+            if op == 'assign':
+                return value_of(tac.arg1)
+            if isinstance(tac.arg2, list) or op == 'call':
+                return VARYING
+            a, b = value_of(tac.arg1), value_of(tac.arg2)
+            if a is VARYING or b is VARYING:
+                return VARYING
+            if a is None or b is None:
+                return None
+            folded = fold(op, a, b)
+            return VARYING if folded is None else folded
+
+        def update(tac):
+            value = evaluate(tac)
+            old = values.get(tac.result)
+            if value is None or old is VARYING or value == old:
+                return
+            values[tac.result] = value if old is None else VARYING
+            work.append(tac.result)
+
+        for name, tac in self.defs.items():
+            update(tac)
+        while work:
+            for tac in self.users.get(work.pop(), ()):
+                if tac.result in self.defs and self.defs[tac.result] is tac:
+                    update(tac)
+
+        return {name: value for name, value in values.items() if value is not VARYING}
+
+    # ---------------------------------------------------
+    # SAÍDA DO SSA
+    # ---------------------------------------------------
+    def destruct(self):
+        """
+        TAC sem phis: cada phi vira cópias no fim dos predecessores (antes do
+        desvio final). Arestas críticas (predecessor com vários sucessores
+        indo a um bloco com vários predecessores) ganham um bloco novo com
+        as cópias. Os nomes versionados são mantidos
+
+        Returns:
+            list[TAC]: instruções da função
+        """
+        cfg = self.cfg
+        blocks = cfg.blocks
+        copies_at_end = [[] for _ in blocks]   # cópias no fim do predecessor
+        fallthrough_split = {}                 # pred → bloco novo logo depois dele
+        jump_split = []                        # blocos novos alcançados por desvio
+        retarget = {}                          # pred → novo alvo do desvio final
+
+        for block, phis in enumerate(self.code):
+            phis = [tac for tac in phis if tac.op == 'phi']
+            if not phis:
+                continue
+            for position, pred in enumerate(blocks[block].preds):
+                copies = self._parallel_copies(phis, position)
+                if not copies:
+                    continue
+                if len(blocks[pred].succs) == 1:
+                    copies_at_end[pred].extend(copies)
+                    continue
+                label = self._split_label(blocks[block].label, pred)
+                last = cfg.instructions[blocks[pred].end - 1]
+                split = [TAC('LABEL', None, None, label)] + copies + \
+                        [TAC('GOTO', None, None, blocks[block].label)]
+                if last.op in JUMP_OPS and last.result == blocks[block].label:
+                    retarget[pred] = label
+                    jump_split.append(split)
+                else:
+                    fallthrough_split[pred] = split
+
+        output = []
+        for block in blocks:
+            code = [tac for tac in self.code[block.index] if tac.op != 'phi']
+            tail = []
+            if code and code[-1].op in JUMP_OPS:
+                tail = [code.pop()]
+                if block.index in retarget:
+                    tail[0] = TAC(tail[0].op, tail[0].arg1, tail[0].arg2, retarget[block.index])
+            elif code and code[-1].op in ('return', 'end_func'):
+                tail = [code.pop()]
+            output.extend(code)
+            output.extend(copies_at_end[block.index])
+            output.extend(tail)
+            output.extend(fallthrough_split.get(block.index, ()))
+
+        if jump_split:
+            # Blocos novos antes do end_func, fora do caminho que cai por baixo
+            end = output.pop() if output and output[-1].op == 'end_func' else None
+            exit_label = None
+            if output and output[-1].op not in ('GOTO', 'return'):
+                exit_label = self._split_label(cfg.name or 'global', 'fim')
+                output.append(TAC('GOTO', None, None, exit_label))
+            for split in jump_split:
+                output.extend(split)
+            if exit_label is not None:
+                output.append(TAC('LABEL', None, None, exit_label))
+            if end is not None:
+                output.append(end)
+        return output
+
+    def _parallel_copies(self, phis, position):
+        """Cópias da aresta: phi.result = arg; com temporários se uma cópia lê o destino de outra"""
+        pairs = [(phi.result, phi.arg1[position]) for phi in phis
+                 if phi.arg1[position] != phi.result]
+        targets = {target for target, _ in pairs}
+        if any(source in targets for _, source in pairs):
+            staged = [(f"{target}{SEPARATOR}in", source) for target, source in pairs]
+            return ([TAC('assign', source, None, temp) for temp, source in staged] +
+                    [TAC('assign', temp, None, target)
+                     for (temp, _), (target, _) in zip(staged, pairs)])
+        return [TAC('assign', source, None, target) for target, source in pairs]
+
+    def _split_label(self, base, suffix):
+        return f"{base}{SEPARATOR}{suffix}"
+
@@ -4,6 +4,7 @@ Converte código-fonte em stream de tokens usando PLY (Python Lex-Yacc)
 Primeira fase do compilador: texto → tokens
 """
 import ply.lex as lex
+from .diagnostics import QUIET
 
 # Lista de tipos de tokens reconhecidos
 tokens = (
@@ -28,6 +29,10 @@ reserved = {
 # Adiciona palavras reservadas aos tokens
 tokens = tokens + tuple(reserved.values())
 
+# Códigos inteiros pequenos para cada tipo de token (cabem em 1 byte)
+TOKEN_CODES = {name: code for code, name in enumerate(tokens)}
+TOKEN_NAMES = tokens
+
 # ═══════════════════════════════════════════════════════
 # REGRAS DE TOKENIZAÇÃO (Expressões Regulares)
 # ═══════════════════════════════════════════════════════
@@ -57,6 +62,9 @@ t_FOR       = r'for'
 def t_ID(t):
     r'[a-zA-Z_][a-zA-Z0-9_]*'  # Identificadores e palavras reservadas
     t.type = reserved.get(t.value, 'ID')  # Verifica se é palavra reservada
+    interner = getattr(t.lexer, 'interner', None)
+    if interner is not None and t.type == 'ID':
+        t.value = interner.intern(t.value)  # Nome canônico da compilação
     return t
 
 def t_NUMBER(t):
@@ -72,16 +80,53 @@ def t_newline(t):
 t_ignore = ' \t'
 
 def t_error(t):
-    """Trata caracteres ilegais"""
-    print(f"[ERRO LÉXICO] Caractere ilegal '{t.value[0]}' na linha {t.lineno}")
+    """Trata caracteres ilegais: reporta no destino de diagnósticos e pula"""
+    diagnostics = getattr(t.lexer, 'diagnostics', None) or QUIET
+    diagnostics.error('lexer', f"[ERRO LÉXICO] Caractere ilegal '{t.value[0]}' na linha {t.lineno}",
+                      t.lineno)
     t.lexer.skip(1)
 
-# Cria lexer (força recriação a cada import)
+# Lexer mestre: a reflexão do módulo e a compilação da regex mestre
+# acontecem uma única vez, na importação
 lexer = lex.lex()
+lexer.interner = None
+lexer.diagnostics = None
 
-def tokenize(source_code):
-    """Tokeniza código fonte e retorna lista de tokens"""
-    # Recria lexer para evitar problemas de cache
-    local_lexer = lex.lex()
+def build_lexer(interner=None, diagnostics=None):
+    """
+    Cria um lexer independente a partir do lexer mestre
+    clone() copia apenas o estado (posição, linha) e reaproveita as
+    tabelas/regex já compiladas, então cada chamada tem seu próprio lineno
+    sem reconstruir o lexer
+    Com interner, os valores de ID saem canônicos (ver interner.py)
+    diagnostics (Diagnostics): destino dos erros léxicos (padrão: descarta)
+    """
+    local_lexer = lexer.clone()
+    local_lexer.lineno = 1
+    local_lexer.interner = interner
+    local_lexer.diagnostics = diagnostics
+    return local_lexer
+
+# Backends de tokenização disponíveis em tokenize()/compile()
+BACKENDS = ('ply', 'scanner')
+
+def iter_tokens(source_code, backend='ply', interner=None, diagnostics=None):
+    """
+    Gera os tokens sob demanda, sem materializar a lista
+    backend='ply' usa o lexer PLY (LexToken); backend='scanner' usa o
+    scanner manual de compiler/scanner.py (Token do parser)
+    interner (Interner): se dado, os nomes de ID são internados nele
+    diagnostics (Diagnostics): destino dos erros léxicos (padrão: descarta)
+    """
+    if backend == 'scanner':
+        from .scanner import scan
+        return scan(source_code, interner, diagnostics)
+    if backend != 'ply':
+        raise ValueError(f"Backend léxico desconhecido: {backend}")
+    local_lexer = build_lexer(interner, diagnostics)
     local_lexer.input(source_code)
-    return list(local_lexer)
\ No newline at end of file
+    return iter(local_lexer)
+
+def tokenize(source_code, backend='ply', interner=None, diagnostics=None):
+    """Tokeniza código fonte e retorna lista de tokens"""
+    return list(iter_tokens(source_code, backend, interner, diagnostics))
@@ -12,11 +12,16 @@ Uso:
 """
 
 import sys
-from .lexer import tokenize, lexer
+import time
+from .lexer import tokenize, iter_tokens, lexer, BACKENDS
 from .parser import parse_ll1, Token
-from .ast import build_ast
-from .ast import SemanticAnalyzer
+from .token_buffer import TokenBuffer
+from .interner import Interner
+from .ast import SemanticAnalyzer, FlatSymbolTable
 from .codegen import CodeGenerator
+from .parallel import analyze_and_lower
+from .cache import CompileCache, encode_result, decode_result
+from .diagnostics import Diagnostics, QUIET
 
 
 class CompilationError(Exception):
@@ -24,14 +29,15 @@ class CompilationError(Exception):
     pass
 
 
-def compile(source_code, optimize=True, verbose=False):
+def compile(source_code, optimize=True, verbose=False, backend='ply', keep_tokens=True,
+            flat_ast=False, frame_slots=False, parallel=False, workers=None, diagnostics=None):
     """
     **FUNÇÃO PRINCIPAL DO COMPILADOR**
     
     Pipeline completo de compilação:
     1. Análise Léxica (Tokenização)
-    2. Análise Sintática (Parse Tree)
-    3. Construção da AST
+    2. Análise Sintática
+    3. Construção da AST (feita pelo próprio parser)
     4. Análise Semântica
     5. Geração de IR (Three-Address Code)
     6. Otimizações (opcional)
@@ -41,17 +47,37 @@ def compile(source_code, optimize=True, verbose=False):
         source_code (str): Código fonte a compilar
         optimize (bool): Se True, aplica otimizações
         verbose (bool): Se True, imprime informações detalhadas
+        backend (str): Backend léxico ('ply' ou 'scanner')
+        keep_tokens (bool): Se False, o lexer alimenta o parser em stream
+                            e nenhuma lista de tokens é retida
+                            (result['tokens'] fica vazio)
+        flat_ast (bool): Se True, a AST é gravada numa arena de arrays
+                         (FlatAST) em vez de um objeto por nó
+        frame_slots (bool): Se True, o assembly endereça variáveis pelo slot
+                            no frame ([FP+n]/[GP+n]) em vez do nome
+        parallel (bool): Se True, análise semântica e geração de IR rodam
+                         por função num pool de processos (compiler/parallel.py);
+                         o IR é idêntico ao da execução serial
+        workers (int): Processos do pool no modo parallel (padrão: nº de CPUs)
+        diagnostics (Diagnostics): Destino do progresso e dos erros
+                                   léxicos/sintáticos (compiler/diagnostics.py);
+                                   padrão: stdout com verbose, senão nenhum
+                                   (compilar não escreve no terminal)
     
     Returns:
         dict: {
             'success': bool,
-            'tokens': list,
-            'parse_tree': tuple,
-            'ast': ASTNode,
+            'tokens': TokenBuffer,
+            'parse_tree': None (a parse tree em tuplas não é gerada),
+            'ast': ASTNode (ou FlatNode da raiz, com flat_ast=True),
             'symbol_table': SymbolTable,
             'ir': IRProgram,
+            'algebraic_ir': IRProgram (TAC após a simplificação algébrica),
             'optimized_ir': IRProgram,
             'assembly': list[str],
+            'interner': Interner (nomes canônicos da compilação),
+            'timings': dict fase → segundos (lexer, parser, semantic,
+                       ir, optimizer, assembly; só as fases executadas),
             'errors': list[str]
         }
     """
@@ -62,10 +88,16 @@ def compile(source_code, optimize=True, verbose=False):
         'ast': None,
         'symbol_table': None,
         'ir': None,
+        'algebraic_ir': None,
         'optimized_ir': None,
         'assembly': [],
+        'interner': None,
+        'timings': {},
         'errors': []
     }
+    timings = result['timings']
+    if diagnostics is None:
+        diagnostics = Diagnostics.stdout() if verbose else QUIET
     
     try:
         # ===== ETAPA 1: ANÁLISE LÉXICA =====
@@ -74,10 +106,20 @@ def compile(source_code, optimize=True, verbose=False):
             print("ETAPA 1: ANÁLISE LÉXICA")
             print("="*50)
         
-        tokens = tokenize(source_code)
-        result['tokens'] = tokens
+        # Um interner por compilação: nomes, temporários e literais
+        # compartilham o mesmo objeto str do lexer até o IR
+        interner = Interner()
+        result['interner'] = interner
         
-        if verbose:
+        start = time.perf_counter()
+        if keep_tokens:
+            tokens = TokenBuffer.from_tokens(iter_tokens(source_code, backend, interner, diagnostics))
+            result['tokens'] = tokens
+        else:
+            tokens = iter_tokens(source_code, backend, interner, diagnostics)
+        timings['lexer'] = time.perf_counter() - start
+        
+        if verbose and keep_tokens:
             print(f"✓ {len(tokens)} tokens gerados")
             for tok in tokens[:10]:  # Mostra primeiros 10
                 print(f"  {tok}")
@@ -90,31 +132,31 @@ def compile(source_code, optimize=True, verbose=False):
             print("ETAPA 2: ANÁLISE SINTÁTICA (LL(1) Top-Down)")
             print("="*50)
         
-        # Converte tokens PLY para formato do parser LL(1)
-        ll1_tokens = [Token(tok.type, tok.value, tok.lineno) for tok in tokens]
-        parse_tree, parse_errors = parse_ll1(ll1_tokens)
+        # O TokenBuffer já entrega visões no formato do parser LL(1); sem
+        # keep_tokens os tokens PLY são convertidos por um gerador e o
+        # parser os consome à medida que são lidos (o scanner já produz Token)
+        if keep_tokens or backend == 'scanner':
+            ll1_tokens = tokens
+        else:
+            ll1_tokens = (Token(tok.type, tok.value, tok.lineno) for tok in tokens)
+        # ===== ETAPA 3: CONSTRUÇÃO DA AST =====
+        # O parser constrói os nós da AST diretamente (emit='ast'), sem a
+        # parse tree em tuplas; ela fica só nos relatórios didáticos.
+        # Com flat_ast (e no modo parallel, que envia a arena aos workers)
+        # os nós vão para uma arena (ast/flat.py)
+        start = time.perf_counter()
+        ast, parse_errors = parse_ll1(ll1_tokens, emit='flat' if flat_ast or parallel else 'ast',
+                                      diagnostics=diagnostics)
+        timings['parser'] = time.perf_counter() - start
         
         if parse_errors:
             result['errors'].extend(parse_errors)
             return result
         
-        result['parse_tree'] = parse_tree
-        
-        if verbose:
-            print("✓ Parse Tree gerada com Recursive Descent (LL(1))")
-            print(f"  Estrutura: {str(parse_tree)[:100]}...")
-        
-        # ===== ETAPA 3: CONSTRUÇÃO DA AST =====
-        if verbose:
-            print("\n" + "="*50)
-            print("ETAPA 3: CONSTRUÇÃO DA AST")
-            print("="*50)
-        
-        ast = build_ast(parse_tree)
         result['ast'] = ast
         
         if verbose:
-            print("✓ AST construída")
+            print("✓ AST construída durante o parsing (Recursive Descent LL(1))")
         
         # ===== ETAPA 4: ANÁLISE SEMÂNTICA =====
         if verbose:
@@ -122,8 +164,15 @@ def compile(source_code, optimize=True, verbose=False):
             print("ETAPA 4: ANÁLISE SEMÂNTICA")
             print("="*50)
         
-        analyzer = SemanticAnalyzer()
-        success, errors, symbol_table = analyzer.analyze(ast)
+        start = time.perf_counter()
+        ir_program = None
+        if parallel:
+            success, errors, symbol_table, ir_program = analyze_and_lower(
+                ast, workers, FlatSymbolTable(), interner)
+        else:
+            analyzer = SemanticAnalyzer(FlatSymbolTable())
+            success, errors, symbol_table = analyzer.analyze(ast)
+        timings['semantic'] = time.perf_counter() - start
         
         result['symbol_table'] = symbol_table
         
@@ -145,8 +194,10 @@ def compile(source_code, optimize=True, verbose=False):
             print("ETAPAS 5-7: GERAÇÃO DE CÓDIGO")
             print("="*50)
         
-        codegen = CodeGenerator(symbol_table, enable_optimizations=optimize)
-        ir_program, optimized_ir, assembly = codegen.generate(ast)
+        codegen = CodeGenerator(symbol_table, enable_optimizations=optimize, interner=interner,
+                                frame_slots=frame_slots, diagnostics=diagnostics)
+        ir_program, optimized_ir, assembly = codegen.generate(ast, ir_program)
+        timings.update(codegen.timings)
         
         result['ir'] = ir_program
         result['algebraic_ir'] = codegen.algebraic_ir  # TAC após simplificação algébrica
@@ -176,7 +227,8 @@ def compile(source_code, optimize=True, verbose=False):
         return result
 
 
-def compile_file(filepath, optimize=True, verbose=False):
+def compile_file(filepath, optimize=True, verbose=False, backend='ply', cache_dir=None,
+                 diagnostics=None):
     """
     Compila um arquivo de código fonte
     
@@ -184,6 +236,12 @@ def compile_file(filepath, optimize=True, verbose=False):
         filepath (str): Caminho do arquivo
         optimize (bool): Se True, aplica otimizações
         verbose (bool): Se True, imprime informações detalhadas
+        backend (str): Backend léxico ('ply' ou 'scanner')
+        cache_dir (str): Diretório do cache em disco (compiler/cache.py);
+                         um fonte já compilado com as mesmas opções é lido
+                         do cache (result['cached'] = True, só
+                         optimized_ir e assembly preenchidos)
+        diagnostics (Diagnostics): Destino das mensagens (ver compile())
     
     Returns:
         dict: Resultado da compilação (mesmo formato de compile())
@@ -196,7 +254,19 @@ def compile_file(filepath, optimize=True, verbose=False):
             print(f"Compilando arquivo: {filepath}")
             print(f"Tamanho: {len(source_code)} caracteres")
         
-        return compile(source_code, optimize, verbose)
+        if cache_dir is None:
+            return compile(source_code, optimize, verbose, backend, diagnostics=diagnostics)
+        
+        cache = CompileCache(cache_dir)
+        key = cache.key(source_code, optimize=optimize, backend=backend)
+        entry = cache.load(key)
+        if entry is not None:
+            return decode_result(entry)
+        
+        result = compile(source_code, optimize, verbose, backend, diagnostics=diagnostics)
+        if result['success']:
+            cache.store(key, encode_result(result))
+        return result
         
     except FileNotFoundError:
         return {
@@ -214,7 +284,7 @@ def main():
     """
     Função main para uso via linha de comando
     
-    Uso: python main.py <arquivo.txt> [--no-optimize] [--verbose]
+    Uso: python main.py <arquivo.txt> [--no-optimize] [--verbose] [--cache-dir DIR]
     """
     import argparse
     
@@ -223,6 +293,8 @@ def main():
     parser.add_argument('--no-optimize', action='store_true', help='Desabilita otimizações')
     parser.add_argument('--verbose', '-v', action='store_true', help='Modo verboso')
     parser.add_argument('--output', '-o', help='Arquivo de saída para assembly')
+    parser.add_argument('--backend', choices=BACKENDS, default='ply', help='Backend léxico')
+    parser.add_argument('--cache-dir', help='Diretório do cache de compilação')
     
     args = parser.parse_args()
     
@@ -230,7 +302,10 @@ def main():
     result = compile_file(
         args.file,
         optimize=not args.no_optimize,
-        verbose=args.verbose
+        verbose=args.verbose,
+        backend=args.backend,
+        cache_dir=args.cache_dir,
+        diagnostics=Diagnostics.stdout()
     )
     
     # Verifica resultado
@@ -6,6 +6,8 @@ CSE, Constant Folding, Dead Code Elimination, etc.
 from .optimizer import (
     Optimizer,
     OptimizationPass,
+    copy_program,
+    compact,
     ConstantFolding,
     DeadCodeElimination,
     CopyPropagation,
@@ -16,6 +18,8 @@ from .peephole import PeepholeOptimizer, AlgebraicSimplification
 __all__ = [
     'Optimizer',
     'OptimizationPass',
+    'copy_program',
+    'compact',
     'ConstantFolding',
     'DeadCodeElimination',
     'CopyPropagation',
@@ -1,8 +1,40 @@
 """
 Optimizer - Pipeline de Otimizações do IR
 Implementa 6 tipos de otimizações clássicas de compiladores
+
+Os passes reescrevem a lista de instruções no lugar (run): uma instrução
+alterada é editada campo a campo, uma removida vira lápide (None) e some na
+compactação ao fim do passe. run devolve True se algo mudou, o que permite
+repetir o pipeline até um ponto fixo de verdade
 """
-from ..ir import IRProgram, TAC
+from ..ir import ColumnarIR, IRProgram, TAC
+from ..ir.cfg import build_cfgs, leader_mask
+from ..ir.liveness import Liveness, global_names
+from ..ir.ssa import SSAForm
+
+
+def copy_program(ir_program):
+    """IRProgram com cópias das instruções (os passes podem editá-las no lugar)"""
+    if isinstance(ir_program, ColumnarIR):
+        return ir_program.copy()  # Continua em colunas
+    program = IRProgram()
+    program.instructions = [TAC(instr.op, instr.arg1, instr.arg2, instr.result)
+                            for instr in ir_program.get_instructions()]
+    program.frames = ir_program.frames
+    return program
+
+
+def compact(instructions):
+    """Remove as lápides (None) deixadas por um passe"""
+    instructions[:] = [instr for instr in instructions if instr is not None]
+
+
+def rewrite(instr, op, arg1=None, arg2=None):
+    """Troca a operação de instr mantendo o destino"""
+    instr.op = op
+    instr.arg1 = arg1
+    instr.arg2 = arg2
+
 
 class Optimizer:
     """Gerenciador do pipeline de otimizações"""
@@ -13,67 +45,80 @@ class Optimizer:
         """Adiciona uma otimização ao pipeline"""
         self.optimizations.append(optimization)
     
-    def optimize(self, ir_program):
-        """Aplica todas otimizações sequencialmente"""
-        optimized = ir_program
+    def run(self, instructions):
+        """Aplica todas otimizações no lugar; True se alguma mudou algo"""
+        changed = False
         for optimization in self.optimizations:
-            optimized = optimization.apply(optimized)
+            changed = optimization.run(instructions) or changed
+        return changed
+    
+    def optimize(self, ir_program):
+        """Aplica todas otimizações sequencialmente (sobre uma cópia de ir_program)"""
+        optimized = copy_program(ir_program)  # Os passes não mudam o layout dos frames
+        self.run(optimized.instructions)
         return optimized
 
 
 class OptimizationPass:
     """Classe base para todas otimizações"""
+    def run(self, instructions):
+        """Reescreve instructions (lista de TAC) no lugar; retorna True se algo mudou"""
+        raise NotImplementedError("Subclasses devem implementar run()")
+    
     def apply(self, ir_program):
-        raise NotImplementedError("Subclasses devem implementar apply()")
+        """Aplica o passe sobre uma cópia e retorna o novo IRProgram"""
+        program = copy_program(ir_program)
+        self.run(program.instructions)
+        return program
 
 
 class ConstantFolding(OptimizationPass):
     """
     Constant Folding - Calcula expressões constantes em tempo de compilação
     Exemplo: t0 = 2 + 3  →  t0 = 5
+    Os valores vêm da propagação esparsa sobre o SSA de cada função
+    (compiler/ir/ssa.py): uma variável só é constante se toda definição que
+    alcança o uso dá o mesmo literal, inclusive pelas arestas de retorno dos laços
     """
     
-    def __init__(self, symbolic_only=False):
+    FOLDABLE = ('+', '-', '*', '/', '<<')
+    
+    def __init__(self, symbolic_only=False, interner=None, globals=()):
         """
         symbolic_only: Se True, não usa valores das variáveis do usuário (a, b, c)
                        apenas calcula literais puros (2+3→5, 10*2→20)
                        Útil para mostrar simplificação algébrica pura
+        interner: Interner da compilação; os literais calculados saem canônicos
+        globals: variáveis globais além das definidas no código global da lista
         """
         self.symbolic_only = symbolic_only
+        self.interner = interner
+        self.globals = set(globals)
     
-    def apply(self, ir_program):
-        new_program = IRProgram()
-        const_values = {}  # Rastreia valores constantes conhecidos
-        user_vars = set()  # Variáveis declaradas pelo usuário
+    def run(self, instructions):
+        changed = False
+        globals = self.globals | global_names(instructions)
+        varying = (lambda name: not self._is_temp(name)) if self.symbolic_only else None
         
-        # Identifica variáveis user (não-temporárias)
-        for instr in ir_program.get_instructions():
-            if instr.result and not self._is_temp(instr.result):
-                user_vars.add(instr.result)
-        
-        for instr in ir_program.get_instructions():
-            # Rastreia atribuições de constantes
-            if instr.op == 'assign' and self.is_literal(instr.arg1):
-                # Em modo simbólico, não propaga valores de variáveis user
-                if not self.symbolic_only or instr.result not in user_vars:
-                    const_values[instr.result] = instr.arg1
-                new_program.add(instr)
-                continue
-            
-            # Operações aritméticas
-            if instr.op in ('+', '-', '*', '/', '<<'):
-                arg1_val = const_values.get(instr.arg1, instr.arg1)
-                arg2_val = const_values.get(instr.arg2, instr.arg2)
-                
-                if self.is_literal(arg1_val) and self.is_literal(arg2_val):
-                    value = self.evaluate(instr.op, arg1_val, arg2_val)
-                    new_program.emit('assign', str(value), None, instr.result)
-                    const_values[instr.result] = str(value)
-                    continue
-            
-            new_program.add(instr)
+        for cfg in build_cfgs(instructions):
+            # Sem chamadas no trecho, nada além dele escreve nas globais
+            calls = any(instructions[i].op == 'call' for i in range(cfg.start, cfg.end))
+            ssa = SSAForm(cfg, globals if calls else ())
+            values = ssa.constants(self._fold, varying)
+            for index, tac in ssa.pairs():
+                instr = instructions[index]
+                if instr.op in self.FOLDABLE and tac.result in values:
+                    rewrite(instr, 'assign', values[tac.result])
+                    changed = True
         
-        return new_program
+        return changed
+    
+    def _fold(self, op, arg1, arg2):
+        """Literal de arg1 op arg2, ou None se não dá para calcular"""
+        if op not in self.FOLDABLE or not (self.is_literal(arg1) and self.is_literal(arg2)):
+            return None
+        value = self.evaluate(op, arg1, arg2)
+        return self.interner.const(value) if self.interner else str(value)
     
     def _is_temp(self, var):
         return var and str(var).startswith('t') and str(var)[1:].isdigit()
@@ -98,55 +143,42 @@ class ConstantFolding(OptimizationPass):
 class DeadCodeElimination(OptimizationPass):
     """
     Dead Code Elimination - Remove código não utilizado
-    Remove apenas temporários (t0, t1) que não são usados
-    Mantém SEMPRE declarações de variáveis do usuário (a, b, c, r)
+    Remove toda definição morta (temporário ou variável do usuário) que não
+    tem efeito colateral, usando a análise de variáveis vivas por bloco
+    (compiler/ir/liveness.py). call, param, print, return e desvios ficam
+    sempre; variáveis globais estão vivas na saída de toda função
     """
     
-    def apply(self, ir_program):
-        instructions = ir_program.get_instructions()
-        
-        # Passo 1: Marca variáveis do usuário (não-temp) como sempre usadas
-        used = set()
-        for instr in instructions:
-            if instr.result and not self._is_temp(instr.result):
-                used.add(instr.result)
-        
-        # Passo 2: Propagação backward - rastreia dependências
-        # Se uma variável é usada, seus operandos também são
-        changed = True
-        while changed:
-            changed = False
-            for instr in instructions:
-                # ...
-                    # Marca arg1 como usado
-                    if isinstance(instr.arg1, str) and instr.arg1 and not self._is_literal(instr.arg1) and instr.arg1 not in used:
-                        used.add(instr.arg1)
-                        changed = True
-                    # Marca arg2 como usado
-                    if isinstance(instr.arg2, str) and instr.arg2 and not self._is_literal(instr.arg2) and instr.arg2 not in used:
-                        used.add(instr.arg2)
-                        changed = True
+    def __init__(self, globals=()):
+        """globals: variáveis globais além das definidas no código global da lista"""
+        self.globals = set(globals)
+    
+    def run(self, instructions):
+        globals = self.globals | global_names(instructions)
+        removed = False
         
-        # Passo 3: Remove apenas temporários não usados
-        new_program = IRProgram()
-        for instr in instructions:
-            # Sempre mantém: controle de fluxo, variáveis user, temporários usados
-            if instr.op in ('begin_func', 'end_func', 'return', 'label', 'goto', 'print'):
-                new_program.add(instr)
-            elif instr.result and not self._is_temp(instr.result):
-                new_program.add(instr)
-            elif instr.result and instr.result in used:
-                new_program.add(instr)
+        for cfg in build_cfgs(instructions):
+            liveness = Liveness(cfg, globals)
+            defs, uses_of, start = liveness.defs, liveness.uses, cfg.start
+            for block in cfg.blocks:
+                # Percurso para trás a partir do que está vivo na saída do bloco
+                live = liveness.live_at_exit(block)
+                for index in range(block.end - 1, block.start - 1, -1):
+                    instr = instructions[index]
+                    name = defs[index - start]
+                    if name is not None:
+                        if name not in live and instr.op != 'call':
+                            instructions[index] = None
+                            removed = True
+                            continue
+                        live.discard(name)
+                    live.update(uses_of[index - start])
+                    if instr.op == 'call':
+                        live.update(globals)
         
-        return new_program
-    
-    def _is_temp(self, var):
-        return str(var).startswith('t') and str(var)[1:].isdigit()
-    
-    def _is_literal(self, val):
-        if isinstance(val, (int, float)):
-            return True
-        return str(val).lstrip('-').isdigit()
+        if removed:
+            compact(instructions)
+        return removed
 
 
 class CommonSubexpressionElimination(OptimizationPass):
@@ -154,27 +186,38 @@ class CommonSubexpressionElimination(OptimizationPass):
     CSE - Elimina Subexpressões Comuns
     Se a mesma expressão (a+b) é calculada 2x, reutiliza o resultado
     Exemplo: t0=a+b; t1=a+b  →  t0=a+b; t1=t0
+    O mapa vale dentro de um bloco básico (ver compiler/ir/cfg.py): num
+    label pode chegar uma aresta de retorno com outros valores. Uma chamada
+    pode escrever nas globais: expressões que as envolvem caem nela
     """
     
-    def apply(self, ir_program):
-        new_program = IRProgram()
+    def __init__(self, globals=()):
+        """globals: variáveis globais além das definidas no código global da lista"""
+        self.globals = set(globals)
+    
+    def run(self, instructions):
+        changed = False
         expressions = {}  # Mapa: (op, arg1, arg2) → resultado anterior
+        leaders = leader_mask([instr.op for instr in instructions])
+        globals = self.globals | global_names(instructions)
         
-        for instr in ir_program.get_instructions():
+        for index, instr in enumerate(instructions):
+            # Início de bloco básico: nada calculado antes é garantido aqui
+            if leaders[index]:
+                expressions.clear()
+            
             # Procura por operações aritméticas repetidas
             if instr.op in ('+', '-', '*', '/'):
                 expr_key = (instr.op, instr.arg1, instr.arg2)
                 
                 if expr_key in expressions:
                     # Expressão já foi calculada! Apenas copia resultado
-                    prev_result = expressions[expr_key]
-                    new_program.emit('assign', prev_result, None, instr.result)
-                    continue
+                    rewrite(instr, 'assign', expressions[expr_key])
+                    changed = True
                 else:
                     # Primeira vez que vemos essa expressão
                     expressions[expr_key] = instr.result
-                    new_program.add(instr)
-                    continue
+                continue
             
             # Invalidação: se variável muda, remove expressões que a usam
             if instr.op == 'assign':
@@ -186,48 +229,78 @@ class CommonSubexpressionElimination(OptimizationPass):
                 for key in to_remove:
                     expressions.pop(key, None)
             
+            # A função chamada pode mudar as globais
+            if instr.op == 'call':
+                for expr_key in [key for key, result in expressions.items()
+                                 if key[1] in globals or key[2] in globals or result in globals]:
+                    del expressions[expr_key]
+            
             # Limpa expressões entre funções
             if instr.op in ('begin_func', 'end_func'):
                 expressions.clear()
-            
-            new_program.add(instr)
         
-        return new_program
+        return changed
 
 
 class CopyPropagation(OptimizationPass):
     """
     Copy Propagation - Propaga cópias diretas
     Exemplo: t0=a; t1=t0+b  →  t0=a; t1=a+b (usa 'a' diretamente)
+    As cópias valem dentro de um bloco básico e caem quando a cópia ou o
+    original é reatribuído; numa chamada caem as que envolvem globais
     """
     
-    def apply(self, ir_program):
-        new_program = IRProgram()
-        copies = {}  # Rastreia quem é cópia de quem
+    def __init__(self, globals=()):
+        """globals: variáveis globais além das definidas no código global da lista"""
+        self.globals = set(globals)
+    
+    def run(self, instructions):
+        changed = False
+        copies = {}       # Rastreia quem é cópia de quem
+        copied_from = {}  # original → cópias feitas dele
+        leaders = leader_mask([instr.op for instr in instructions])
+        globals = self.globals | global_names(instructions)
         
-        for instr in ir_program.get_instructions():
+        for index, instr in enumerate(instructions):
+            if leaders[index]:
+                copies.clear()
+                copied_from.clear()
+            
             # Detecta cópias: x = y (onde y não é literal)
             if instr.op == 'assign' and not self.is_literal(instr.arg1):
+                self._kill(instr.result, copies, copied_from)
                 copies[instr.result] = instr.arg1
-                new_program.add(instr)
+                copied_from.setdefault(instr.arg1, []).append(instr.result)
                 continue
             
             # Substitui cópias pelos valores originais
-            new_instr = TAC(instr.op, instr.arg1, instr.arg2, instr.result)
-            
-            if isinstance(new_instr.arg1, str) and new_instr.arg1 in copies:
-                new_instr.arg1 = copies[new_instr.arg1]
-            
-            if isinstance(new_instr.arg2, str) and new_instr.arg2 in copies:
-                new_instr.arg2 = copies[new_instr.arg2]
+            if isinstance(instr.arg1, str) and instr.arg1 in copies:
+                original = copies[instr.arg1]
+                changed = changed or original != instr.arg1
+                instr.arg1 = original
             
-            new_program.add(new_instr)
+            if isinstance(instr.arg2, str) and instr.arg2 in copies:
+                original = copies[instr.arg2]
+                changed = changed or original != instr.arg2
+                instr.arg2 = original
             
             # Invalida cópia se variável é reatribuída
-            if new_instr.result:
-                copies.pop(new_instr.result, None)
+            if instr.result:
+                self._kill(instr.result, copies, copied_from)
+            
+            # A função chamada pode reatribuir qualquer global
+            if instr.op == 'call':
+                for var in globals:
+                    self._kill(var, copies, copied_from)
         
-        return new_program
+        return changed
+    
+    def _kill(self, var, copies, copied_from):
+        """var foi reatribuída: some a cópia var = y e toda cópia x = var"""
+        copies.pop(var, None)
+        for copy in copied_from.pop(var, ()):
+            if copies.get(copy) == var:
+                del copies[copy]
     
     def is_literal(self, value):
         try:
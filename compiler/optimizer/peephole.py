@@ -2,8 +2,8 @@
 Peephole Optimization - Otimizações Locais por Padrões
 Analisa pequenas "janelas" de instruções buscando padrões conhecidos
 """
-from ..ir import IRProgram, TAC
-from .optimizer import OptimizationPass
+from ..ir.cfg import leader_mask
+from .optimizer import OptimizationPass, compact, rewrite
 
 
 class PeepholeOptimizer(OptimizationPass):
@@ -26,19 +26,21 @@ class PeepholeOptimizer(OptimizationPass):
             return const_map.get(arg, arg)
         return arg # Retorna o argumento original se não for uma string (e.g., uma lista)
     
-    def __init__(self, symbolic_only=False):
+    def __init__(self, symbolic_only=False, interner=None):
         """
         symbolic_only: Se True, não propaga valores de variáveis do usuário
                        Útil para mostrar simplificação algébrica pura
+        interner: Interner da compilação; os literais de shift saem canônicos
         """
         self.symbolic_only = symbolic_only
+        self.interner = interner
     
     
-    def apply(self, ir_program):
-        """Aplica peephole optimization"""
-        new_program = IRProgram()
-        instructions = ir_program.get_instructions()
-        const_map = {}  # Rastreia valores constantes
+    def run(self, instructions):
+        """Aplica peephole optimization no lugar"""
+        changed = False
+        const_map = {}  # Rastreia valores constantes (dentro do bloco básico)
+        leaders = leader_mask([instr.op for instr in instructions])
         
         # Em modo simbólico, identifica variáveis user
         user_vars = set()
@@ -50,43 +52,53 @@ class PeepholeOptimizer(OptimizationPass):
         i = 0
         while i < len(instructions):
             instr = instructions[i]
-            
-            # Rastreia constantes (mas não de variáveis user em modo simbólico)
-            if instr.op == 'assign' and self.is_constant(instr.arg1):
-                if not self.symbolic_only or instr.result not in user_vars:
-                    const_map[instr.result] = instr.arg1
+            if leaders[i]:
+                const_map.clear()  # Num label pode chegar outro valor
             
             # Resolve valores através do mapa de constantes
             arg1 = self._resolve_const(instr.arg1, const_map)
             arg2 = self._resolve_const(instr.arg2, const_map)
             
+            # Toda definição troca o valor anterior; só assign de literal
+            # registra um novo (mas não de variáveis user em modo simbólico)
+            if isinstance(instr.result, str):
+                const_map.pop(instr.result, None)
+            if instr.op == 'assign' and self.is_constant(instr.arg1):
+                if not self.symbolic_only or instr.result not in user_vars:
+                    const_map[instr.result] = instr.arg1
+            
             # Padrão 1: x = x + 0 ou x = 0 + x (identidade aditiva)
             if instr.op == '+':
                 if arg2 == '0':
-                    new_program.emit('assign', instr.arg1, None, instr.result)
+                    rewrite(instr, 'assign', instr.arg1)
+                    changed = True
                     i += 1
                     continue
                 elif arg1 == '0':
-                    new_program.emit('assign', instr.arg2, None, instr.result)
+                    rewrite(instr, 'assign', instr.arg2)
+                    changed = True
                     i += 1
                     continue
             
             # Padrão 2: x = x * 1 ou x = 1 * x (identidade multiplicativa)
             if instr.op == '*':
                 if arg2 == '1':
-                    new_program.emit('assign', instr.arg1, None, instr.result)
+                    rewrite(instr, 'assign', instr.arg1)
+                    changed = True
                     i += 1
                     continue
                 elif arg1 == '1':
-                    new_program.emit('assign', instr.arg2, None, instr.result)
+                    rewrite(instr, 'assign', instr.arg2)
+                    changed = True
                     i += 1
                     continue
             
             # Padrão 3: x = x * 0 ou x = 0 * x (anulação)
             if instr.op == '*':
                 if arg1 == '0' or arg2 == '0':
-                    new_program.emit('assign', '0', None, instr.result)
+                    rewrite(instr, 'assign', '0')
                     const_map[instr.result] = '0'
+                    changed = True
                     i += 1
                     continue
             
@@ -96,30 +108,36 @@ class PeepholeOptimizer(OptimizationPass):
             if instr.op == '*':
                 shift_amount = self.is_power_of_two(instr.arg2)
                 if shift_amount is not None:
-                    new_program.emit('<<', instr.arg1, str(shift_amount), instr.result)
+                    rewrite(instr, '<<', instr.arg1, self._literal(shift_amount))
+                    changed = True
                     i += 1
                     continue
                 shift_amount = self.is_power_of_two(instr.arg1)
                 if shift_amount is not None:
-                    new_program.emit('<<', instr.arg2, str(shift_amount), instr.result)
+                    rewrite(instr, '<<', instr.arg2, self._literal(shift_amount))
+                    changed = True
                     i += 1
                     continue
             
             # Padrão 4: x = y - 0 (subtração de zero)
             if instr.op == '-' and arg2 == '0':
-                new_program.emit('assign', instr.arg1, None, instr.result)
+                rewrite(instr, 'assign', instr.arg1)
+                changed = True
                 i += 1
                 continue
             
             # Padrão 4.5: x = y / 1 (divisão por 1)
             if instr.op == '/' and arg2 == '1':
-                new_program.emit('assign', instr.arg1, None, instr.result)
+                rewrite(instr, 'assign', instr.arg1)
+                changed = True
                 i += 1
                 continue
             
             # Padrão 5: Atribuições redundantes (x = x)
             if instr.op == 'assign' and instr.arg1 == instr.result:
                 # x = x => (remove)
+                instructions[i] = None
+                changed = True
                 i += 1
                 continue
             
@@ -134,15 +152,24 @@ class PeepholeOptimizer(OptimizationPass):
                 # Verifica se temp não é usado em outro lugar
                 if self.is_temp(instr.result) and not self.is_used_later(instr.result, instructions[i+2:]):
                     # z = y (pula intermediário)
-                    new_program.emit('assign', instr.arg1, None, next_instr.result)
+                    rewrite(instr, 'assign', instr.arg1)
+                    instr.result = next_instr.result
+                    const_map.pop(instr.result, None)
+                    instructions[i + 1] = None
+                    changed = True
                     i += 2
                     continue
             
             # Nenhum padrão aplicado, mantém instrução
-            new_program.add(instr)
             i += 1
         
-        return new_program
+        if changed:
+            compact(instructions)
+        return changed
+    
+    def _literal(self, value):
+        """Literal do TAC para value (canônico, se houver interner)"""
+        return self.interner.const(value) if self.interner else str(value)
     
     def is_temp(self, var):
         """Verifica se é variável temporária"""
@@ -192,23 +219,20 @@ class AlgebraicSimplification(OptimizationPass):
     Identifica identidades algébricas conhecidas
     """
     
-    def apply(self, ir_program):
+    def run(self, instructions):
         """Aplica simplificações algébricas baseadas em propriedades matemáticas"""
-        new_program = IRProgram()
+        changed = False
         
-        for instr in ir_program.get_instructions():
+        for instr in instructions:
             # Padrão: x = a - a => x = 0 (qualquer coisa menos ela mesma é zero)
             if instr.op == '-' and instr.arg1 == instr.arg2:
-                new_program.emit('assign', '0', None, instr.result)
-                continue
+                rewrite(instr, 'assign', '0')
+                changed = True
             
             # Padrão: x = a / a => x = 1 (qualquer coisa dividida por ela mesma é 1)
             # Nota: assumimos a != 0 (análise semântica já verificou)
-            if instr.op == '/' and instr.arg1 == instr.arg2:
-                new_program.emit('assign', '1', None, instr.result)
-                continue
-            
-            # Nenhum padrão aplicado, mantém instrução
-            new_program.add(instr)
+            elif instr.op == '/' and instr.arg1 == instr.arg2:
+                rewrite(instr, 'assign', '1')
+                changed = True
         
-        return new_program
\ No newline at end of file
+        return changed
\ No newline at end of file
@@ -0,0 +1,180 @@
+"""
+Compilação Paralela - Análise semântica e geração de IR por função
+Depois que o passo global registra as assinaturas (em ordem de declaração),
+o corpo de cada função só depende dos globais já visíveis: funções são
+analisadas e convertidas para TAC em um ProcessPoolExecutor e os trechos
+de IR são unidos na ordem de declaração
+
+A numeração de temporários/labels é determinística: como a arena (AST plana)
+guarda cada declaração num intervalo contíguo de índices, o número de
+temporários e labels que cada função consome é contado direto na coluna
+kinds, e cada worker começa dos mesmos contadores da execução serial.
+O IR resultante é idêntico ao serial
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .ast import SemanticAnalyzer, FlatSymbolTable
+from .ast.flat import FlatNode, KIND_CODES, to_flat, from_flat
+from .interner import Interner
+from .ir import IRGenerator
+
+
+# Nós que consomem temporários (new_temp) e labels (new_label) no IRGenerator
+TEMP_KINDS = (KIND_CODES['binop'], KIND_CODES['call'])
+LABEL_KINDS = ((KIND_CODES['if'], 3), (KIND_CODES['while'], 2), (KIND_CODES['for'], 2))
+
+
+def count_numbering(kinds):
+    """(temporários, labels) gerados pelos nós de um trecho da coluna kinds"""
+    temps = sum(kinds.count(kind) for kind in TEMP_KINDS)
+    labels = sum(kinds.count(kind) * per_node for kind, per_node in LABEL_KINDS)
+    return temps, labels
+
+
+# ═══════════════════════════════════════════════════════
+# WORKER
+# ═══════════════════════════════════════════════════════
+
+class _VisibleGlobalsTable(FlatSymbolTable):
+    """
+    Tabela do worker: todos os globais do programa, mas só os com offset
+    menor que `visible` existiam quando a função foi declarada
+    """
+    visible = 0
+
+    def lookup(self, name, current_scope_only=False):
+        symbol = super().lookup(name, current_scope_only)
+        if symbol is not None and symbol['level'] == 0 and symbol['offset'] >= self.visible:
+            return None
+        return symbol
+
+
+_arena = None
+_table = None
+
+
+def _init_worker(arena, global_symbols):
+    """Recebe a arena e os globais uma vez por processo"""
+    global _arena, _table
+    _arena = arena
+    _table = _VisibleGlobalsTable()
+    for symbol in global_symbols:
+        _table.declare(symbol)
+
+
+def _lower_function(task):
+    """Analisa e gera o TAC de uma função: (erros, linhas do TAC, frames)"""
+    index, visible, temp_start, label_start = task
+    node = from_flat(_arena.node(index))
+    _table.visible = visible
+
+    analyzer = SemanticAnalyzer(_table)
+    analyzer.run(analyzer.analyze_function_body(node))
+    if analyzer.errors:
+        return analyzer.errors, None, None
+
+    generator = IRGenerator(_table, Interner())
+    generator.temp_counter = temp_start
+    generator.label_count = label_start
+    generator.visit(node)
+    rows = [(i.op, i.arg1, i.arg2, i.result) for i in generator.ir_program.instructions]
+    return [], rows, generator.ir_program.frames
+
+
+# ═══════════════════════════════════════════════════════
+# PASSO GLOBAL + JUNÇÃO
+# ═══════════════════════════════════════════════════════
+
+def analyze_and_lower(ast, workers=None, symbol_table=None, interner=None):
+    """
+    Análise semântica + geração de IR com as funções em paralelo
+
+    Args:
+        ast: raiz do programa (FlatNode ou ASTNode, convertido com to_flat)
+        workers (int): processos do pool (padrão: os.cpu_count())
+        symbol_table: tabela do passo global (padrão: FlatSymbolTable)
+        interner (Interner): nomes canônicos da compilação
+
+    Returns:
+        (success, errors, symbol_table, ir_program), os mesmos valores de
+        SemanticAnalyzer.analyze + IRGenerator.generate em série
+        (ir_program é None se houver erros)
+    """
+    root = ast if isinstance(ast, FlatNode) else to_flat(ast)
+    arena = root.arena
+    interner = interner if interner is not None else Interner()
+    analyzer = SemanticAnalyzer(symbol_table if symbol_table is not None else FlatSymbolTable())
+    table = analyzer.symbol_table
+
+    # Passo global em ordem de declaração: assinaturas e statements de topo
+    units = []     # (tipo, nó ou índice da tarefa, erros do passo global, temps, labels)
+    tasks = []
+    temps = labels = 0
+    start = 1
+    for decl in root.declarations:
+        if decl is None:
+            continue
+        unit_temps, unit_labels = count_numbering(arena.kinds[start:decl.index + 1])
+        start = decl.index + 1
+        first_error = len(analyzer.errors)
+
+        if decl.node_type == 'function':
+            if analyzer.declare_function(decl):
+                visible = len(table.global_scope.symbols)
+                tasks.append((decl.index, visible, temps, labels))
+                units.append(('function', len(tasks) - 1, [], temps, labels))
+            else:
+                units.append(('error', None, analyzer.errors[first_error:], temps, labels))
+        else:
+            node = from_flat(decl)
+            analyzer.visit(node)
+            units.append(('statement', node, analyzer.errors[first_error:], temps, labels))
+
+        temps += unit_temps
+        labels += unit_labels
+
+    results = []
+    if tasks:
+        workers = workers or os.cpu_count() or 1
+        global_symbols = list(table.global_scope.symbols.values())
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(arena, global_symbols)) as pool:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            results = list(pool.map(_lower_function, tasks, chunksize=chunksize))
+
+    errors = []
+    for kind, ref, unit_errors, _, _ in units:
+        errors.extend(results[ref][0] if kind == 'function' else unit_errors)
+    if errors:
+        return False, errors, table, None
+
+    # Junta os trechos de IR na ordem de declaração
+    generator = IRGenerator(table, interner)
+    program = generator.ir_program
+    intern = interner.intern
+
+    def canonical(value):
+        if isinstance(value, str):
+            return intern(value)
+        if isinstance(value, list):
+            return [intern(v) if isinstance(v, str) else v for v in value]
+        return value
+
+    for kind, ref, _, unit_temps, unit_labels in units:
+        if kind == 'statement':
+            generator.temp_counter = unit_temps
+            generator.label_count = unit_labels
+            generator.visit(ref)
+            continue
+        _, rows, frames = results[ref]
+        for op, arg1, arg2, result in rows:
+            program.emit(op, canonical(arg1), canonical(arg2), canonical(result))
+        for name, layout in frames.items():
+            if name is None:
+                for var, slot in layout.items():
+                    generator.global_frame.setdefault(intern(var), slot)
+            else:
+                program.frames[intern(name)] = {intern(var): slot for var, slot in layout.items()}
+
+    return True, [], table, program
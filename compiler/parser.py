@@ -3,13 +3,118 @@ Analisador Sintático - Parser LL(1) Top-Down
 Implementação: Recursive Descent com lookahead de 1 token
 Cada não-terminal da gramática = 1 função recursiva
 """
+from collections import deque
+
+from .lexer import TOKEN_CODES, TOKEN_NAMES
+from .ast.ast_builder import (
+    ProgramNode, FunctionNode, ParameterNode, DeclAssignNode, AssignNode,
+    ReturnNode, PrintNode, IfNode, WhileNode, ForNode, BinOpNode,
+    NumberNode, IdNode, CallNode,
+)
+from .ast.flat import FlatEmitter
+from .diagnostics import QUIET
+
+# Códigos inteiros dos tipos de token (ver lexer.TOKEN_CODES)
+T_ID        = TOKEN_CODES['ID']
+T_NUMBER    = TOKEN_CODES['NUMBER']
+T_PLUS      = TOKEN_CODES['PLUS']
+T_MINUS     = TOKEN_CODES['MINUS']
+T_TIMES     = TOKEN_CODES['TIMES']
+T_DIVIDE    = TOKEN_CODES['DIVIDE']
+T_EQUALS    = TOKEN_CODES['EQUALS']
+T_LT        = TOKEN_CODES['LT']
+T_GT        = TOKEN_CODES['GT']
+T_LE        = TOKEN_CODES['LE']
+T_GE        = TOKEN_CODES['GE']
+T_EQ        = TOKEN_CODES['EQ']
+T_NE        = TOKEN_CODES['NE']
+T_LPAREN    = TOKEN_CODES['LPAREN']
+T_RPAREN    = TOKEN_CODES['RPAREN']
+T_LBRACE    = TOKEN_CODES['LBRACE']
+T_RBRACE    = TOKEN_CODES['RBRACE']
+T_SEMICOLON = TOKEN_CODES['SEMICOLON']
+T_COMMA     = TOKEN_CODES['COMMA']
+T_IF        = TOKEN_CODES['IF']
+T_ELSE      = TOKEN_CODES['ELSE']
+T_WHILE     = TOKEN_CODES['WHILE']
+T_FOR       = TOKEN_CODES['FOR']
+T_RETURN    = TOKEN_CODES['RETURN']
+T_INT       = TOKEN_CODES['INT']
+T_PRINT     = TOKEN_CODES['PRINT']
+
+# Conjuntos FIRST pré-computados (evita montar listas a cada iteração)
+FIRST_DECLARATION = frozenset((T_INT, T_ID, T_RETURN, T_PRINT, T_IF, T_WHILE))
+FIRST_STATEMENT   = FIRST_DECLARATION | {T_FOR}
+RELOPS = frozenset((T_LT, T_GT, T_LE, T_GE, T_EQ, T_NE))
+ADDOPS = frozenset((T_PLUS, T_MINUS))
+MULOPS = frozenset((T_TIMES, T_DIVIDE))
+
+# Precedência dos operadores binários (maior = liga mais forte)
+BINARY_PRECEDENCE = {
+    code: prec
+    for prec, group in enumerate((RELOPS, ADDOPS, MULOPS), start=1)
+    for code in group
+}
+
+
+# ═══════════════════════════════════════════════════════
+# EMISSORES - O que o parser constrói para cada regra
+# ═══════════════════════════════════════════════════════
+
+class TupleEmitter:
+    """Parse tree em tuplas (modo didático, usado pelos relatórios)"""
+    program     = staticmethod(lambda declarations: ('program', declarations))
+    function    = staticmethod(lambda name, params, body: ('function', name, params, body))
+    param       = staticmethod(lambda name, param_type: ('param', name, param_type))
+    decl_assign = staticmethod(lambda name, value: ('decl_assign', name, value))
+    assign      = staticmethod(lambda name, value: ('assign', name, value))
+    return_     = staticmethod(lambda value: ('return', value))
+    print_      = staticmethod(lambda value: ('print', value))
+    if_         = staticmethod(lambda cond, then_block, else_block: ('if', cond, then_block, else_block))
+    while_      = staticmethod(lambda cond, body: ('while', cond, body))
+    for_        = staticmethod(lambda init, cond, increment, body: ('for', init, cond, increment, body))
+    binop       = staticmethod(lambda op, left, right: (op, left, right))
+    num         = staticmethod(lambda value: ('num', value))
+    id          = staticmethod(lambda name: ('id', name))
+    call        = staticmethod(lambda name, args: ('call', name, args))
+
+
+class ASTEmitter:
+    """Nós da AST construídos durante o parsing (sem parse tree intermediária)"""
+    program     = ProgramNode
+    function    = FunctionNode
+    param       = ParameterNode
+    decl_assign = DeclAssignNode
+    assign      = AssignNode
+    return_     = ReturnNode
+    print_      = PrintNode
+    # else vazio vira None, como em build_ast
+    if_         = staticmethod(lambda cond, then_block, else_block: IfNode(cond, then_block, else_block or None))
+    while_      = WhileNode
+    for_        = ForNode
+    binop       = BinOpNode
+    num         = NumberNode
+    id          = IdNode
+    call        = CallNode
+
+
+EMITTERS = {'tuple': TupleEmitter, 'ast': ASTEmitter, 'flat': FlatEmitter}
+
+
+def token_name(code):
+    """Nome do tipo de token a partir do código (None = fim da entrada)"""
+    return TOKEN_NAMES[code] if code is not None else None
+
 
 class Token:
     """Representação de um token do léxico"""
+    __slots__ = ('type', 'value', 'lineno', 'code')
+    
     def __init__(self, type, value, lineno=1):
         self.type = type
         self.value = value
         self.lineno = lineno
+        self.code = TOKEN_CODES[type]
     
     def __repr__(self):
         return f"Token({self.type}, {self.value}, {self.lineno})"
@@ -26,40 +131,70 @@ class LL1Parser:
     - comparison → term (relop term)*
     - relop → < | > | <= | >= | == | !=
     - factor() → (expr) | ID | NUMBER
+    
+    Statements seguem Recursive Descent; expressões usam precedência de
+    operadores com pilha explícita (profundidade limitada só pela memória)
+    
+    Os tokens (Token ou TokenView) são comparados pelo código inteiro
+    do tipo (token.code), nunca pela string
+    
+    emit='tuple' gera a parse tree em tuplas; emit='ast' constrói os nós
+    da AST diretamente (dispensa o build_ast); emit='flat' grava a AST
+    numa arena de arrays (ver ast/flat.py)
+    
+    Erros ficam em self.errors e também vão para diagnostics (padrão: descarta)
     """
     
-    def __init__(self, tokens):
-        self.tokens = tokens
+    def __init__(self, tokens, emit='tuple', diagnostics=None):
+        self.emit = EMITTERS[emit]()
+        self.diagnostics = diagnostics or QUIET
+        # Aceita qualquer iterável de tokens (lista ou gerador do lexer):
+        # os tokens são consumidos sob demanda e só os poucos tokens de
+        # lookahead além do atual ficam em buffer
+        self._stream = iter(tokens)
+        self._lookahead = deque()
         self.pos = 0
-        self.current_token = self.tokens[0] if tokens else None
+        self.current_token = next(self._stream, None)
+        self.current_code = self.current_token.code if self.current_token else None
         self.errors = []
     
     def error(self, msg):
-        line = self.current_token.lineno if self.current_token else '?'
-        error_msg = f"[ERRO SINTÁTICO] {msg} na linha {line}"
+        line = self.current_token.lineno if self.current_token else None
+        error_msg = f"[ERRO SINTÁTICO] {msg} na linha {line if line is not None else '?'}"
         self.errors.append(error_msg)
-        print(error_msg)
+        self.diagnostics.error('parser', error_msg, line)
     
     
     def advance(self):
         self.pos += 1
-        if self.pos < len(self.tokens):
-            self.current_token = self.tokens[self.pos]
+        if self._lookahead:
+            self.current_token = self._lookahead.popleft()
         else:
-            self.current_token = None
+            self.current_token = next(self._stream, None)
+        self.current_code = self.current_token.code if self.current_token else None
     
-    def match(self, expected_type):
-        if self.current_token and self.current_token.type == expected_type:
+    def match(self, expected_code):
+        if self.current_code == expected_code:
             token = self.current_token
             self.advance()
             return token
         else:
             current = self.current_token.type if self.current_token else 'EOF'
-            self.error(f"Esperado '{expected_type}', encontrado '{current}'")
+            self.error(f"Esperado '{TOKEN_NAMES[expected_code]}', encontrado '{current}'")
             return None
     
     def peek(self):
-        return self.current_token.type if self.current_token else None
+        """Código do token atual (None no fim da entrada)"""
+        return self.current_code
+    
+    def peek_ahead(self, k):
+        """Código do k-ésimo token após o atual (k=1 é o próximo), sem consumir"""
+        while len(self._lookahead) < k:
+            token = next(self._stream, None)
+            if token is None:
+                return None
+            self._lookahead.append(token)
+        return self._lookahead[k - 1].code
     
     # ═══════════════════════════════════════════════════════
     # FUNÇÕES DE PARSING - Uma por não-terminal da gramática
@@ -78,11 +213,11 @@ class LL1Parser:
     
     def program(self):
         declarations = self.declaration_list()
-        return ('program', declarations)
+        return self.emit.program(declarations)
     
     def declaration_list(self):
         declarations = []
-        while self.peek() in ['INT', 'ID', 'RETURN', 'PRINT', 'IF', 'WHILE']:
+        while self.current_code in FIRST_DECLARATION:
             decl = self.declaration()
             if decl:
                 declarations.append(decl)
@@ -91,42 +226,36 @@ class LL1Parser:
         return declarations
     
     def declaration(self):
-        if self.peek() == 'INT':
-            saved_pos = self.pos
-            self.advance()
-            
-            if self.peek() == 'ID':
-                self.advance()
-                if self.peek() == 'LPAREN':
-                    self.pos = saved_pos
-                    self.current_token = self.tokens[self.pos]
+        if self.peek() == T_INT:
+            # INT ID LPAREN → função; INT ID ... → declaração
+            if self.peek_ahead(1) == T_ID:
+                if self.peek_ahead(2) == T_LPAREN:
                     return self.function_declaration()
                 else:
-                    self.pos = saved_pos
-                    self.current_token = self.tokens[self.pos]
                     return self.statement()
             else:
+                self.advance()
                 self.error("Esperado ID após INT")
                 return None
         else:
             return self.statement()
     
     def function_declaration(self):
-        self.match('INT')
-        name_token = self.match('ID')
+        self.match(T_INT)
+        name_token = self.match(T_ID)
         name = name_token.value if name_token else 'unknown'
-        self.match('LPAREN')
+        self.match(T_LPAREN)
         
         params = []
-        if self.peek() != 'RPAREN':
+        if self.peek() != T_RPAREN:
             params = self.parameter_list()
         
-        self.match('RPAREN')
-        self.match('LBRACE')
+        self.match(T_RPAREN)
+        self.match(T_LBRACE)
         body = self.statement_list()
-        self.match('RBRACE')
+        self.match(T_RBRACE)
         
-        return ('function', name, params, body)
+        return self.emit.function(name, params, body)
     
     def parameter_list(self):
         params = []
@@ -134,7 +263,7 @@ class LL1Parser:
         if param:
             params.append(param)
         
-        while self.peek() == 'COMMA':
+        while self.peek() == T_COMMA:
             self.advance()
             param = self.parameter()
             if param:
@@ -143,7 +272,7 @@ class LL1Parser:
         return params
     def statement_list(self):
         statements = []
-        while self.peek() in ['INT', 'ID', 'RETURN', 'PRINT', 'IF', 'WHILE', 'FOR']:
+        while self.current_code in FIRST_STATEMENT:
             stmt = self.statement()
             statements.append(stmt)
         return statements
@@ -151,127 +280,179 @@ class LL1Parser:
 
         
     def parameter(self):
-        self.match('INT')
-        name_token = self.match('ID')
+        self.match(T_INT)
+        name_token = self.match(T_ID)
         name = name_token.value if name_token else 'unknown'
-        return ('param', name, 'int')
+        return self.emit.param(name, 'int')
     
     
     def statement(self):
         lookahead = self.peek()
 
-        if lookahead == 'INT':
+        if lookahead == T_INT:
             self.advance()
-            name_tok = self.match('ID')
-            self.match('EQUALS')
+            name_tok = self.match(T_ID)
+            self.match(T_EQUALS)
             expr = self.expression()
-            self.match('SEMICOLON')
-            return ('decl_assign', name_tok.value, expr)
+            self.match(T_SEMICOLON)
+            return self.emit.decl_assign(name_tok.value, expr)
 
-        elif lookahead == 'ID':
-            name_tok = self.match('ID')
-            self.match('EQUALS')
+        elif lookahead == T_ID:
+            name_tok = self.match(T_ID)
+            self.match(T_EQUALS)
             expr = self.expression()
-            self.match('SEMICOLON')
-            return ('assign', name_tok.value, expr)
+            self.match(T_SEMICOLON)
+            return self.emit.assign(name_tok.value, expr)
 
-        elif lookahead == 'RETURN':
+        elif lookahead == T_RETURN:
             self.advance()
-            if self.peek() != 'SEMICOLON':
+            if self.peek() != T_SEMICOLON:
                 expr = self.expression()
-                self.match('SEMICOLON')
-                return ('return', expr)
+                self.match(T_SEMICOLON)
+                return self.emit.return_(expr)
             else:
-                self.match('SEMICOLON')
-                return ('return', None)
+                self.match(T_SEMICOLON)
+                return self.emit.return_(None)
 
-        elif lookahead == 'PRINT':
+        elif lookahead == T_PRINT:
             self.advance()
-            self.match('LPAREN')
+            self.match(T_LPAREN)
             expr = self.expression()
-            self.match('RPAREN')
-            self.match('SEMICOLON')
-            return ('print', expr)
+            self.match(T_RPAREN)
+            self.match(T_SEMICOLON)
+            return self.emit.print_(expr)
 
-        elif lookahead == 'IF':
+        elif lookahead == T_IF:
             return self.if_statement()
 
-        elif lookahead == 'WHILE':
+        elif lookahead == T_WHILE:
             return self.while_statement()
         
-        elif lookahead == 'FOR':
+        elif lookahead == T_FOR:
             return self.for_statement()
 
 
         else:
-            self.error(f"Statement inválido: {lookahead}")
+            self.error(f"Statement inválido: {token_name(lookahead)}")
             return None
 
     def if_statement(self):
-        self.match('IF')
-        self.match('LPAREN')
+        self.match(T_IF)
+        self.match(T_LPAREN)
         condition = self.expression()
-        self.match('RPAREN')
-        self.match('LBRACE')
+        self.match(T_RPAREN)
+        self.match(T_LBRACE)
         then_block = self.statement_list()
-        self.match('RBRACE')
+        self.match(T_RBRACE)
 
         else_block = None
-        if self.peek() == 'ELSE':
+        if self.peek() == T_ELSE:
             self.advance()
-            self.match('LBRACE')
+            self.match(T_LBRACE)
             else_block = self.statement_list()
-            self.match('RBRACE')
+            self.match(T_RBRACE)
 
-        return ('if', condition, then_block, else_block)
+        return self.emit.if_(condition, then_block, else_block)
     def while_statement(self):
-        self.match('WHILE')
-        self.match('LPAREN')
+        self.match(T_WHILE)
+        self.match(T_LPAREN)
         condition = self.expression()
-        self.match('RPAREN')
-        self.match('LBRACE')
+        self.match(T_RPAREN)
+        self.match(T_LBRACE)
         body = self.statement_list()
-        self.match('RBRACE')
-        return ('while', condition, body)
+        self.match(T_RBRACE)
+        return self.emit.while_(condition, body)
 
     def expression(self):
-        return self.comparison()
-
-    
-    def comparison(self):
-        left = self.additive()
-
-        while self.peek() in ['LT','GT','LE','GE','EQ','NE']:
-            op = self.current_token.value      # '<', '>', '<=', '==', ...
-            self.advance()
-            right = self.additive()
-            left = (op, left, right)
-        return left
-
-    def additive(self):
-        left = self.term()
-        while self.peek() in ['PLUS', 'MINUS']:
-            op = self.current_token.value      # '+' ou '-'
-            self.advance()
-            right = self.term()
-            left = (op, left, right)
-        return left
-
-    def term(self):
-        left = self.factor()
-        while self.peek() in ['TIMES', 'DIVIDE']:
-            op = self.current_token.value      # '*' ou '/'
-            self.advance()
-            right = self.factor()
-            left = (op, left, right)
-        return left
+        """
+        Expressões por precedência de operadores (shunting-yard) com pilhas
+        explícitas: parênteses e chamadas aninhadas não consomem a pilha do
+        Python. Gera as mesmas tuplas da gramática recursiva equivalente:
+            expression → comparison
+            comparison → additive (relop additive)*
+            additive   → term ((+|-) term)*
+            term       → factor ((*|/) factor)*
+            factor     → NUMBER | ID | ID ( args ) | ( expression )
+        """
+        operands = []     # subárvores já construídas
+        operators = []    # (precedência, op) pendentes
+        groups = []       # '(' ou chamada abertos: (nome|None, base operandos, base operadores)
+        advance = self.advance
+        emit = self.emit
+        binop = emit.binop
+        
+        while True:
+            # ── Operando: abre grupos até encontrar um fator primário ──
+            while True:
+                code = self.current_code
+                if code == T_NUMBER:
+                    operand = emit.num(self.current_token.value)
+                    advance()
+                elif code == T_ID:
+                    name = self.current_token.value
+                    advance()
+                    # chamada de função
+                    if self.current_code == T_LPAREN:
+                        advance()
+                        if self.current_code != T_RPAREN:
+                            groups.append((name, len(operands), len(operators)))
+                            continue
+                        advance()
+                        operand = emit.call(name, [])
+                    else:
+                        operand = emit.id(name)
+                elif code == T_LPAREN:
+                    advance()
+                    groups.append((None, len(operands), len(operators)))
+                    continue
+                else:
+                    self.error(f"Fator inválido: '{token_name(code)}'")
+                    operand = emit.num(0)
+                break
+            operands.append(operand)
+            
+            # ── Operador binário, ou fechamento de grupos ──
+            # Ao desempilhar: right = pop(), left = topo → (op, left, right);
+            # desempilha enquanto a precedência do topo >= atual (assoc. à esquerda)
+            while True:
+                code = self.current_code
+                prec = BINARY_PRECEDENCE.get(code)
+                if prec is not None:
+                    limit = groups[-1][2] if groups else 0
+                    while len(operators) > limit and operators[-1][0] >= prec:
+                        right = operands.pop()
+                        operands[-1] = binop(operators.pop()[1], operands[-1], right)
+                    operators.append((prec, self.current_token.value))
+                    advance()
+                    break
+                
+                if not groups:
+                    while operators:
+                        right = operands.pop()
+                        operands[-1] = binop(operators.pop()[1], operands[-1], right)
+                    return operands[0]
+                
+                # Fecha o grupo mais interno: ',' separa argumentos, ')' encerra
+                name, operand_base, operator_base = groups[-1]
+                while len(operators) > operator_base:
+                    right = operands.pop()
+                    operands[-1] = binop(operators.pop()[1], operands[-1], right)
+                if name is not None and code == T_COMMA:
+                    advance()
+                    break
+                groups.pop()
+                self.match(T_RPAREN)
+                if name is not None:
+                    args = operands[operand_base:]
+                    del operands[operand_base:]
+                    operands.append(emit.call(name, args))
     
     def for_statement(self):
-        self.match('FOR')
-        self.match('LPAREN')
+        self.match(T_FOR)
+        self.match(T_LPAREN)
 
         # init
-        if self.peek() == 'INT':
+        if self.peek() == T_INT:
             init = self.statement()
         else:
             init = self.statement()
@@ -280,79 +461,30 @@ class LL1Parser:
         
         # condition
         cond = self.expression()
-        self.match('SEMICOLON')
+        self.match(T_SEMICOLON)
 
         # increment
         # mesma lógica do init
-        if self.peek() == 'ID':
-            expr_name = self.match('ID').value
-            self.match('EQUALS')
+        if self.peek() == T_ID:
+            expr_name = self.match(T_ID).value
+            self.match(T_EQUALS)
             expr = self.expression()
-            increment = ('assign', expr_name, expr)
+            increment = self.emit.assign(expr_name, expr)
         else:
             self.error("Esperado incremento (ex: x = x + 1)")
             increment = None
 
-        self.match('RPAREN')
+        self.match(T_RPAREN)
 
-        self.match('LBRACE')
+        self.match(T_LBRACE)
         body = self.statement_list()
-        self.match('RBRACE')
+        self.match(T_RBRACE)
 
-        return ('for', init, cond, increment, body)
-
-
-
-    def factor(self):
-        lookahead = self.peek()
-
-        if lookahead == 'NUMBER':
-            token = self.current_token
-            self.advance()
-            return ('num', token.value)
-
-        elif lookahead == 'ID':
-            name_token = self.current_token
-            name = name_token.value
-            self.advance()
-
-            # chamada de função
-            if self.peek() == 'LPAREN':
-                self.advance()
-                args = []
-                if self.peek() != 'RPAREN':
-                    args = self.argument_list()
-                self.match('RPAREN')
-                return ('call', name, args)
-            else:
-                return ('id', name)
-
-        elif lookahead == 'LPAREN':
-            self.advance()
-            expr = self.expression()
-            self.match('RPAREN')
-            return expr
-
-        else:
-            self.error(f"Fator inválido: '{lookahead}'")
-            return ('num', 0)
-
-    
-    def argument_list(self):
-        args = []
-        arg = self.expression()
-        args.append(arg)
-        
-        while self.peek() == 'COMMA':
-            self.advance()
-            arg = self.expression()
-            args.append(arg)
-        
-        return args
+        return self.emit.for_(init, cond, increment, body)
 
 
-def parse_ll1(tokens):
-    """Parser LL(1) - retorna parse tree e erros"""
-    parser = LL1Parser(tokens)
+def parse_ll1(tokens, emit='tuple', diagnostics=None):
+    """Parser LL(1) - retorna parse tree (ou AST, com emit='ast'/'flat') e erros"""
+    parser = LL1Parser(tokens, emit, diagnostics)
     parse_tree, errors = parser.parse()
     return parse_tree, errors
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""
+Scanner Manual - Backend alternativo ao lexer PLY
+Uma única regex compilada percorrida com finditer + tabela de despacho
+Produz o mesmo stream de tokens do lexer PLY, mas já no formato do parser
+(Token), sem a alternância de regras do PLY nem objetos LexToken
+"""
+import re
+
+from .lexer import reserved
+from .parser import Token
+from .diagnostics import QUIET
+
+# Uma alternativa por classe de token; a ordem resolve ambiguidades
+# (operadores de 2 caracteres antes dos de 1, como no PLY)
+_TOKEN_RE = re.compile(r'''
+      (?P<NEWLINE>\n+)
+    | (?P<SKIP>[ \t]+)
+    | (?P<ID>[a-zA-Z_][a-zA-Z0-9_]*)
+    | (?P<NUMBER>\d+)
+    | (?P<OP><=|>=|==|!=|[-+*/=<>(){};,])
+    | (?P<ERROR>.)
+''', re.VERBOSE | re.DOTALL)
+
+# Tabela de despacho: texto do operador → tipo do token
+OPERATORS = {
+    '+': 'PLUS', '-': 'MINUS', '*': 'TIMES', '/': 'DIVIDE', '=': 'EQUALS',
+    '<': 'LT', '>': 'GT', '<=': 'LE', '>=': 'GE', '==': 'EQ', '!=': 'NE',
+    '(': 'LPAREN', ')': 'RPAREN', '{': 'LBRACE', '}': 'RBRACE',
+    ';': 'SEMICOLON', ',': 'COMMA',
+}
+
+
+def scan(source_code, interner=None, diagnostics=None):
+    """
+    Gera os tokens do código fonte (mesmos tipos, valores e linhas do PLY)
+    Com interner, os valores de ID saem canônicos (ver interner.py)
+    Erros léxicos vão para diagnostics (padrão: descartados), como no PLY
+    """
+    diagnostics = diagnostics or QUIET
+    intern = interner.intern if interner is not None else None
+    lineno = 1
+    for match in _TOKEN_RE.finditer(source_code):
+        kind = match.lastgroup
+        text = match.group()
+
+        if kind == 'ID':
+            kind = reserved.get(text, 'ID')
+            if intern is not None and kind == 'ID':
+                text = intern(text)
+            yield Token(kind, text, lineno)
+        elif kind == 'OP':
+            yield Token(OPERATORS[text], text, lineno)
+        elif kind == 'NUMBER':
+            yield Token('NUMBER', int(text), lineno)
+        elif kind == 'NEWLINE':
+            lineno += len(text)
+        elif kind == 'ERROR':
+            diagnostics.error('lexer', f"[ERRO LÉXICO] Caractere ilegal '{text}' na linha {lineno}",
+                              lineno)
@@ -0,0 +1,145 @@
+"""
+Servidor de Compilação - Daemon com o compilador já carregado
+Mantém o pacote compiler (e as tabelas do PLY) em memória e atende pedidos
+por um socket Unix: cada linha recebida é um JSON com o fonte e as opções,
+cada linha devolvida é o JSON do resultado. Cada conexão roda numa thread
+e pode enviar vários pedidos em sequência
+
+Protocolo (uma linha JSON por mensagem):
+    → {"source": "...", "optimize": true, "backend": "ply", "frame_slots": false}
+    ← {"success": true, "errors": [], "diagnostics": [...], "ir": {...},
+       "optimized_ir": {...}, "assembly": [...], "timings": {...}}
+    → {"command": "ping"}       ← {"success": true, "pid": ...}
+    → {"command": "shutdown"}   ← {"success": true}
+
+O IR vai no formato de compiler/cache.py (encode_program)
+
+Uso:
+    python -m compiler.server [--socket CAMINHO]
+    python -m compiler.client arquivo.txt   (ver compiler/client.py)
+"""
+import json
+import os
+import socketserver
+import sys
+import threading
+
+from .main import compile
+from .cache import encode_program
+from .diagnostics import Diagnostics, PROGRESS
+from .client import default_socket_path
+
+
+# Opções de compile() aceitas num pedido
+REQUEST_OPTIONS = ('optimize', 'backend', 'frame_slots')
+
+
+def compile_request(request):
+    """Executa um pedido de compilação e monta a resposta JSON"""
+    source = request.get('source')
+    if not isinstance(source, str):
+        return {'success': False, 'errors': ["Pedido sem 'source'"]}
+    options = {name: request[name] for name in REQUEST_OPTIONS if name in request}
+
+    events = []
+    result = compile(source, diagnostics=Diagnostics(events), **options)
+    response = {
+        'success': result['success'],
+        'errors': result['errors'],
+        'diagnostics': [event.message for event in events if event.kind != PROGRESS],
+        'assembly': result['assembly'],
+        'timings': result.get('timings', {}),
+    }
+    for phase in ('ir', 'optimized_ir'):
+        if result.get(phase) is not None:
+            response[phase] = encode_program(result[phase])
+    return response
+
+
+class CompileHandler(socketserver.StreamRequestHandler):
+    """Uma conexão: lê pedidos linha a linha até o cliente fechar"""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                request = {}
+                response = {'success': False, 'errors': [f"Pedido inválido: {e}"]}
+            else:
+                if isinstance(request, dict):
+                    response = self.server.dispatch(request)
+                else:
+                    response = {'success': False,
+                                'errors': [f"Pedido inválido: esperado um objeto JSON, "
+                                           f"recebido {type(request).__name__}"]}
+                    request = {}
+            self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+            self.wfile.flush()
+            if request.get('command') == 'shutdown':
+                # Depois de responder; shutdown() espera serve_forever
+                # terminar, então não pode rodar nesta thread
+                threading.Thread(target=self.server.shutdown).start()
+                return
+
+
+class CompileServer(socketserver.ThreadingUnixStreamServer):
+    """Servidor de compilação num socket Unix (uma thread por conexão)"""
+    daemon_threads = True
+
+    def __init__(self, socket_path=None):
+        self.socket_path = socket_path or default_socket_path()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)   # socket órfão de uma execução anterior
+        super().__init__(self.socket_path, CompileHandler)
+
+    def dispatch(self, request):
+        command = request.get('command', 'compile')
+        if command == 'compile':
+            try:
+                return compile_request(request)
+            except Exception as e:
+                return {'success': False, 'errors': [f"Erro interno: {e}"]}
+        if command == 'ping':
+            return {'success': True, 'pid': os.getpid()}
+        if command == 'shutdown':
+            return {'success': True}   # o handler encerra o servidor após responder
+        return {'success': False, 'errors': [f"Comando desconhecido: {command}"]}
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def main(argv=None):
+    """
+    Inicia o servidor
+
+    Uso: python -m compiler.server [--socket CAMINHO]
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Servidor de compilação (socket Unix)')
+    parser.add_argument('--socket', default=default_socket_path(), help='Caminho do socket')
+    args = parser.parse_args(argv)
+
+    # Aquece o pipeline antes do primeiro pedido
+    compile("int main() { return 0; }")
+
+    server = CompileServer(args.socket)
+    print(f"Servidor de compilação em {server.socket_path} (pid {os.getpid()})")
+    sys.stdout.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
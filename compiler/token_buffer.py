@@ -0,0 +1,85 @@
+"""
+TokenBuffer - Armazenamento compacto de tokens (struct-of-arrays)
+Em vez de um objeto Python por token, guarda colunas paralelas:
+    kinds  → array('B') com o código inteiro do tipo (TOKEN_CODES)
+    values → lista de valores internados (cada lexema distinto existe 1 vez)
+    lines  → array('I') com o número da linha
+"""
+from array import array
+
+from .lexer import TOKEN_CODES, TOKEN_NAMES
+
+
+class TokenView:
+    """
+    Visão leve de um token dentro do TokenBuffer
+    Expõe a mesma interface de Token (type, value, lineno) mais o código
+    inteiro do tipo (code), lendo direto das colunas do buffer
+    """
+    __slots__ = ('buffer', 'index')
+
+    def __init__(self, buffer, index):
+        self.buffer = buffer
+        self.index = index
+
+    @property
+    def code(self):
+        return self.buffer.kinds[self.index]
+
+    @property
+    def type(self):
+        return TOKEN_NAMES[self.buffer.kinds[self.index]]
+
+    @property
+    def value(self):
+        return self.buffer.values[self.index]
+
+    @property
+    def lineno(self):
+        return self.buffer.lines[self.index]
+
+    def __repr__(self):
+        return f"Token({self.type}, {self.value}, {self.lineno})"
+
+
+class TokenBuffer:
+    """Sequência de tokens em colunas; indexar devolve TokenView"""
+    __slots__ = ('kinds', 'values', 'lines', '_interned')
+
+    def __init__(self):
+        self.kinds = array('B')
+        self.values = []
+        self.lines = array('I')
+        self._interned = {}
+
+    @classmethod
+    def from_tokens(cls, tokens):
+        """Constrói o buffer a partir de qualquer iterável de tokens (LexToken ou Token)"""
+        buffer = cls()
+        for tok in tokens:
+            buffer.append(tok.type, tok.value, tok.lineno)
+        return buffer
+
+    def append(self, type, value, lineno):
+        self.kinds.append(TOKEN_CODES[type])
+        self.values.append(self._interned.setdefault(value, value))
+        self.lines.append(lineno)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TokenView(self, i) for i in range(*index.indices(len(self.kinds)))]
+        if index < 0:
+            index += len(self.kinds)
+        if not 0 <= index < len(self.kinds):
+            raise IndexError("índice de token fora do buffer")
+        return TokenView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self.kinds)):
+            yield TokenView(self, index)
+
+    def __repr__(self):
+        return f"TokenBuffer({len(self.kinds)} tokens)"
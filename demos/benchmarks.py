@@ -0,0 +1,795 @@
+"""
+Benchmarks de Desempenho do Compilador
+Mede o custo das fases do pipeline em programas sintéticos
+
+Uso:
+    python demos/benchmarks.py            # roda todos os benchmarks
+    python demos/benchmarks.py lexer      # roda apenas um benchmark
+"""
+
+import sys
+import os
+import contextlib
+import gc
+import io
+import time
+import tracemalloc
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ply.lex as lex
+
+from compiler import lexer as lexer_module
+from compiler.lexer import tokenize, iter_tokens
+from compiler.parser import Token, parse_ll1
+from compiler.token_buffer import TokenBuffer
+from compiler.ast import build_ast
+from compiler.ast import SemanticAnalyzer, Visitor, SymbolTable, FlatSymbolTable
+from compiler.ast.ast_builder import BinOpNode, IdNode, NumberNode
+from compiler.ast.trampoline import trampoline
+from compiler.interner import Interner
+from compiler.main import compile
+from compiler.ir.ir_generator import IRGenerator
+
+
+# ═══════════════════════════════════════════════════════
+# PROGRAMAS SINTÉTICOS
+# ═══════════════════════════════════════════════════════
+
+def gerar_programa(num_funcoes=1, statements_por_funcao=10):
+    """Gera um programa válido com funções de statements aritméticos"""
+    linhas = []
+    for f in range(num_funcoes):
+        linhas.append(f"int f{f}(int a, int b) {{")
+        linhas.append("    int x = a + b;")
+        for s in range(statements_por_funcao):
+            linhas.append(f"    x = x * {s % 7 + 1} + (a - b) / 2;")
+        linhas.append("    return x;")
+        linhas.append("}")
+    linhas.append("int main() {")
+    linhas.append("    int r = f0(1, 2);")
+    linhas.append("    print(r);")
+    linhas.append("    return 0;")
+    linhas.append("}")
+    return "\n".join(linhas) + "\n"
+
+
+def medir_memoria(funcao, pico=False):
+    """
+    Executa funcao() e retorna (resultado, bytes alocados e ainda vivos)
+    Com pico=True retorna o pico de memória durante a execução
+    """
+    tracemalloc.start()
+    resultado = funcao()
+    memoria, maximo = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, (maximo if pico else memoria)
+
+
+def cronometrar(funcao, repeticoes):
+    """Executa funcao() repeticoes vezes e retorna o tempo total em segundos"""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return time.perf_counter() - inicio
+
+
+# ═══════════════════════════════════════════════════════
+# BENCHMARKS
+# ═══════════════════════════════════════════════════════
+
+def bench_lexer(repeticoes=300):
+    """
+    Tokens/s do tokenize(): lexer reconstruído a cada chamada (lex.lex(),
+    comportamento antigo), lexer mestre clonado e scanner manual
+    """
+    print("\n=== LEXER: reconstrução vs clone vs scanner ===")
+    codigo = gerar_programa(num_funcoes=2, statements_por_funcao=5)
+    num_tokens = len(tokenize(codigo))
+
+    def tokenize_reconstruindo():
+        local_lexer = lex.lex(module=lexer_module)
+        local_lexer.input(codigo)
+        return list(local_lexer)
+
+    antes = cronometrar(tokenize_reconstruindo, repeticoes)
+    depois = cronometrar(lambda: tokenize(codigo), repeticoes)
+    scanner = cronometrar(lambda: tokenize(codigo, backend='scanner'), repeticoes)
+
+    total = num_tokens * repeticoes
+    print(f"  Programa: {num_tokens} tokens x {repeticoes} compilações")
+    print(f"  lex.lex() por chamada: {total / antes:12,.0f} tokens/s")
+    print(f"  lexer.clone():         {total / depois:12,.0f} tokens/s")
+    print(f"  scanner manual:        {total / scanner:12,.0f} tokens/s")
+    print(f"  Speedup clone: {antes / depois:.1f}x | scanner: {antes / scanner:.1f}x")
+
+
+def bench_tokens():
+    """
+    Bytes por token: lista de LexToken + lista de Token (pipeline antigo)
+    contra TokenBuffer em colunas
+    """
+    print("\n=== TOKENS: LexToken + Token vs TokenBuffer ===")
+    codigo = gerar_programa(num_funcoes=200, statements_por_funcao=20)
+
+    def pares_de_objetos():
+        lex_tokens = tokenize(codigo)
+        ll1_tokens = [Token(tok.type, tok.value, tok.lineno) for tok in lex_tokens]
+        return lex_tokens, ll1_tokens
+
+    (lex_tokens, _), antes = medir_memoria(pares_de_objetos)
+    buffer, depois = medir_memoria(lambda: TokenBuffer.from_tokens(iter_tokens(codigo)))
+
+    num_tokens = len(lex_tokens)
+    print(f"  Programa: {num_tokens:,} tokens")
+    print(f"  LexToken + Token: {antes / num_tokens:6.1f} bytes/token")
+    print(f"  TokenBuffer:      {depois / num_tokens:6.1f} bytes/token")
+    print(f"  Redução: {antes / depois:.1f}x")
+
+
+def bench_parser(num_statements=100_000):
+    """Tempo do LL1Parser em um programa sintético de ~100k statements"""
+    print("\n=== PARSER: programa de 100k statements ===")
+    codigo = gerar_programa(num_funcoes=num_statements // 20, statements_por_funcao=18)
+    ll1_tokens = tokenize(codigo, backend='scanner')
+
+    inicio = time.perf_counter()
+    parse_tree, errors = parse_ll1(ll1_tokens)
+    tempo = time.perf_counter() - inicio
+    assert not errors, errors
+
+    print(f"  Programa: {len(ll1_tokens):,} tokens, {num_statements:,} statements")
+    print(f"  Parse: {tempo:.2f}s ({len(ll1_tokens) / tempo:,.0f} tokens/s)")
+
+
+def bench_ast():
+    """
+    Parse + construção da AST: parse tree em tuplas + build_ast (antigo)
+    contra LL1Parser(emit='ast'), que cria os nós durante o parsing
+    """
+    print("\n=== AST: tuplas + build_ast vs emit='ast' ===")
+    codigo = gerar_programa(num_funcoes=1000, statements_por_funcao=20)
+    ll1_tokens = tokenize(codigo, backend='scanner')
+
+    def via_tuplas():
+        parse_tree, _ = parse_ll1(ll1_tokens)
+        return build_ast(parse_tree)
+
+    def direto():
+        ast, _ = parse_ll1(ll1_tokens, emit='ast')
+        return ast
+
+    tempo_tuplas = cronometrar(via_tuplas, 3) / 3
+    tempo_direto = cronometrar(direto, 3) / 3
+    _, pico_tuplas = medir_memoria(via_tuplas, pico=True)
+    _, pico_direto = medir_memoria(direto, pico=True)
+
+    print(f"  Programa: {len(ll1_tokens):,} tokens")
+    print(f"  tuplas + build_ast: {tempo_tuplas:.3f}s | pico {pico_tuplas / 2**20:6.1f} MiB")
+    print(f"  emit='ast':         {tempo_direto:.3f}s | pico {pico_direto / 2**20:6.1f} MiB")
+    print(f"  Speedup: {tempo_tuplas / tempo_direto:.1f}x | memória: {pico_tuplas / pico_direto:.1f}x menor")
+
+
+class _NoComDict:
+    """Emulação dos nós antigos: atributos guardados em __dict__ por instância"""
+    def __init__(self, node_type, **attrs):
+        self.node_type = node_type
+        self.__dict__.update(attrs)
+
+
+def bench_ast_memory(num_nos=1_000_000):
+    """
+    Memória de uma expressão com ~1M nós (BinOp/Id/Number): nós com
+    __dict__ (comportamento antigo) contra nós com __slots__
+    """
+    print("\n=== AST: nós com __dict__ vs __slots__ (1M nós) ===")
+    folhas = num_nos // 2
+
+    def arvore_com_dict():
+        raiz = _NoComDict('number', value=0)
+        for i in range(folhas):
+            folha = _NoComDict('id', name='x') if i % 2 else _NoComDict('number', value=i)
+            raiz = _NoComDict('binop', op='+', left=raiz, right=folha)
+        return raiz
+
+    def arvore_com_slots():
+        raiz = NumberNode(0)
+        for i in range(folhas):
+            folha = IdNode('x') if i % 2 else NumberNode(i)
+            raiz = BinOpNode('+', raiz, folha)
+        return raiz
+
+    _, antes = medir_memoria(arvore_com_dict)
+    _, depois = medir_memoria(arvore_com_slots)
+
+    total = 2 * folhas + 1
+    print(f"  Expressão: {total:,} nós")
+    print(f"  __dict__:  {antes / 2**20:7.1f} MiB ({antes / total:5.1f} bytes/nó)")
+    print(f"  __slots__: {depois / 2**20:7.1f} MiB ({depois / total:5.1f} bytes/nó)")
+    print(f"  Redução: {antes / depois:.1f}x")
+
+
+class _ContadorDeNos(Visitor):
+    """Conta os nós da AST (generic_visit cobre todos os tipos)"""
+    def __init__(self):
+        self.total = 0
+
+    def generic_visit(self, node):
+        self.total += 1
+        for campo in node._fields:
+            valor = getattr(node, campo)
+            for filho in (valor if isinstance(valor, list) else [valor]):
+                if hasattr(filho, 'node_type'):
+                    yield filho
+
+
+class _DespachoPorGetattr:
+    """Mixin com o despacho antigo: f-string + getattr a cada nó visitado"""
+    def visit(self, node):
+        return trampoline(self._visit_step, node)
+
+    def _visit_step(self, node):
+        if node is None:
+            return None
+        visitor = getattr(self, f'visit_{node.node_type}', self.generic_visit)
+        return visitor(node)
+
+
+class _AnalyzerGetattr(_DespachoPorGetattr, SemanticAnalyzer):
+    pass
+
+
+class _IRGeneratorGetattr(_DespachoPorGetattr, IRGenerator):
+    pass
+
+
+def bench_visitor(repeticoes=5):
+    """
+    Nós/s visitados pelo SemanticAnalyzer e pelo IRGenerator: despacho por
+    getattr (antigo) contra a tabela de despacho do Visitor
+    """
+    print("\n=== VISITOR: getattr vs tabela de despacho ===")
+    codigo = gerar_programa(num_funcoes=1000, statements_por_funcao=20)
+    ast, _ = parse_ll1(tokenize(codigo, backend='scanner'), emit='ast')
+    contador = _ContadorDeNos()
+    contador.visit(ast)
+    total = contador.total * repeticoes
+
+    def analisar(classe):
+        return lambda: classe().analyze(ast)
+
+    def gerar_ir(classe):
+        _, _, tabela = SemanticAnalyzer().analyze(ast)
+        return lambda: classe(tabela).generate(ast)
+
+    print(f"  AST: {contador.total:,} nós x {repeticoes} percursos")
+    for nome, antigo, novo in (('SemanticAnalyzer', analisar(_AnalyzerGetattr), analisar(SemanticAnalyzer)),
+                               ('IRGenerator', gerar_ir(_IRGeneratorGetattr), gerar_ir(IRGenerator))):
+        antes = cronometrar(antigo, repeticoes)
+        depois = cronometrar(novo, repeticoes)
+        print(f"  {nome + ':':18} getattr {total / antes:12,.0f} nós/s | "
+              f"tabela {total / depois:12,.0f} nós/s | {antes / depois:.2f}x")
+
+
+def contar_coletas(funcao):
+    """Executa funcao() e retorna (resultado, coletas do GC disparadas)"""
+    coletas = []
+    callback = lambda fase, info: fase == 'start' and coletas.append(info['generation'])
+    gc.callbacks.append(callback)
+    try:
+        resultado = funcao()
+    finally:
+        gc.callbacks.remove(callback)
+    return resultado, len(coletas)
+
+
+def bench_flat_ast():
+    """
+    Front-end com AST de objetos (emit='ast') contra a arena plana
+    (emit='flat'): tempo de parsing, memória retida, coletas do GC e o
+    custo de percorrer as visões na análise semântica
+    """
+    print("\n=== AST: objetos vs arena plana ===")
+    codigo = gerar_programa(num_funcoes=5000, statements_por_funcao=20)
+    ll1_tokens = tokenize(codigo, backend='scanner')
+
+    print(f"  Programa: {len(ll1_tokens):,} tokens")
+    for emit in ('ast', 'flat'):
+        parse = lambda: parse_ll1(ll1_tokens, emit=emit)[0]
+        gc.collect()
+        inicio = time.perf_counter()
+        _, coletas = contar_coletas(parse)
+        tempo = time.perf_counter() - inicio
+        ast, retida = medir_memoria(parse)
+        inicio = time.perf_counter()
+        SemanticAnalyzer().analyze(ast)
+        analise = time.perf_counter() - inicio
+        print(f"  emit={emit + ':':6} parse {tempo:.2f}s | {retida / 2**20:6.1f} MiB retidos | "
+              f"{coletas:5} coletas do GC | análise {analise:.2f}s")
+        del ast
+
+
+class _IRGeneratorSemInterner(IRGenerator):
+    """Comportamento antigo: cada temporário/literal é uma f-string nova"""
+    def new_temp(self):
+        self.temp_counter += 1
+        return f"t{self.temp_counter - 1}"
+
+    def visit_number(self, node):
+        return str(node.value)
+
+
+def bench_interner():
+    """
+    Memória retida por AST + IR de um programa grande, com os tokens em
+    stream (sem TokenBuffer): strings duplicadas (antigo) contra um
+    Interner compartilhado do scanner ao IR
+    """
+    print("\n=== INTERNER: nomes, temporários e literais ===")
+    codigo = gerar_programa(num_funcoes=2000, statements_por_funcao=20)
+    # Literais de vários dígitos: str de 1 caractere o CPython já compartilha
+    codigo = codigo.replace("(a - b) / 2", "(a - b) / 256")
+
+    def pipeline(interner):
+        ast, _ = parse_ll1(iter_tokens(codigo, 'scanner', interner), emit='ast')
+        _, _, tabela = SemanticAnalyzer().analyze(ast)
+        if interner is None:
+            ir = _IRGeneratorSemInterner(tabela).generate(ast)
+        else:
+            ir = IRGenerator(tabela, interner).generate(ast)
+        return ast, ir
+
+    (_, ir), antes = medir_memoria(lambda: pipeline(None))
+    (_, _), depois = medir_memoria(lambda: pipeline(Interner()))
+
+    strings = {id(v) for instr in ir.instructions for v in (instr.arg1, instr.arg2, instr.result)
+               if isinstance(v, str)}
+    print(f"  Programa: {len(ir.instructions):,} instruções TAC, {len(strings):,} str distintas no IR sem interner")
+    print(f"  Sem interner: {antes / 2**20:7.1f} MiB retidos")
+    print(f"  Com interner: {depois / 2**20:7.1f} MiB retidos")
+    print(f"  Economia: {(antes - depois) / 2**20:.1f} MiB ({1 - depois / antes:.0%})")
+
+
+def bench_symbol_table(buscas=200_000):
+    """
+    Lookup de um nome global a partir do bloco mais interno, com N escopos
+    aninhados: SymbolTable (sobe pelos pais) vs FlatSymbolTable (O(1))
+    """
+    print("\n=== TABELA DE SÍMBOLOS: escopos aninhados ===")
+    for profundidade in (1, 10, 100, 500):
+        tempos = []
+        for classe in (SymbolTable, FlatSymbolTable):
+            tabela = classe()
+            tabela.insert('g', 'int')
+            for nivel in range(profundidade):
+                tabela.enter_scope(f"bloco{nivel}")
+                tabela.insert(f"x{nivel}", 'int')
+            lookup = tabela.lookup
+            tempos.append(cronometrar(lambda: lookup('g'), buscas))
+            for _ in range(profundidade):
+                tabela.exit_scope()
+        antes, depois = tempos
+        print(f"  {profundidade:4} níveis: SymbolTable {buscas / antes:12,.0f} lookups/s | "
+              f"FlatSymbolTable {buscas / depois:12,.0f} lookups/s | {antes / depois:6.1f}x")
+
+
+def bench_parallel(workers=4):
+    """
+    Análise semântica + IR em série contra o pool de processos por função
+    (compile(parallel=True)) em um programa com milhares de funções
+    """
+    print("\n=== PARALELO: análise + IR por função ===")
+    codigo = gerar_programa(num_funcoes=4000, statements_por_funcao=20)
+
+    def compilar(**opcoes):
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            resultado = compile(codigo, optimize=False, backend='scanner', **opcoes)
+        return resultado, time.perf_counter() - inicio
+
+    serial, tempo_serial = compilar()
+    paralelo, tempo_paralelo = compilar(parallel=True, workers=workers)
+    identico = ([str(i) for i in serial['ir'].instructions] ==
+                [str(i) for i in paralelo['ir'].instructions])
+
+    print(f"  Programa: 4,000 funções, {len(serial['ir'].instructions):,} instruções TAC "
+          f"({os.cpu_count()} CPUs)")
+    print(f"  Serial:             {tempo_serial:.2f}s")
+    print(f"  Paralelo ({workers} proc.): {tempo_paralelo:.2f}s | speedup {tempo_serial / tempo_paralelo:.2f}x")
+    print(f"  IR idêntico: {identico}")
+
+
+def bench_incremental(num_funcoes=500):
+    """
+    Recompilação completa contra IncrementalCompiler depois de editar uma
+    única função de um programa grande
+    """
+    from compiler.incremental import IncrementalCompiler
+
+    print("\n=== INCREMENTAL: edição de uma função ===")
+    codigo = gerar_programa(num_funcoes=num_funcoes, statements_por_funcao=20)
+    editado = codigo.replace("int f0(int a, int b) {\n    int x = a + b;",
+                             "int f0(int a, int b) {\n    int x = a - b;")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        inicio = time.perf_counter()
+        compile(editado, backend='scanner')
+        tempo_completo = time.perf_counter() - inicio
+
+        compilador = IncrementalCompiler(backend='scanner')
+        compilador.compile(codigo)
+        inicio = time.perf_counter()
+        resultado = compilador.compile(editado)
+        tempo_incremental = time.perf_counter() - inicio
+
+    print(f"  Programa: {num_funcoes:,} funções, {len(resultado['ir'].instructions):,} instruções TAC")
+    print(f"  Compilação completa:  {tempo_completo * 1000:8.1f} ms")
+    print(f"  Incremental:          {tempo_incremental * 1000:8.1f} ms "
+          f"| speedup {tempo_completo / tempo_incremental:.1f}x")
+    print(f"  Funções refeitas: {resultado['incremental']['recompiled']}")
+
+
+def bench_cache(num_arquivos=50):
+    """compile_file sem cache contra releitura do cache em disco (build repetido)"""
+    import tempfile
+    from compiler.main import compile_file
+
+    print("\n=== CACHE: build repetido de arquivos inalterados ===")
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivos = []
+        for n in range(num_arquivos):
+            caminho = os.path.join(pasta, f"prog{n}.txt")
+            with open(caminho, 'w', encoding='utf-8') as f:
+                f.write(gerar_programa(num_funcoes=5 + n % 5, statements_por_funcao=20))
+            arquivos.append(caminho)
+        cache_dir = os.path.join(pasta, 'cache')
+
+        def build(**opcoes):
+            inicio = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                resultados = [compile_file(a, backend='scanner', **opcoes) for a in arquivos]
+            return resultados, time.perf_counter() - inicio
+
+        _, tempo_sem_cache = build()
+        build(cache_dir=cache_dir)
+        resultados, tempo_com_cache = build(cache_dir=cache_dir)
+        acertos = sum(1 for r in resultados if r.get('cached'))
+
+    print(f"  {num_arquivos} arquivos")
+    print(f"  Sem cache:        {tempo_sem_cache * 1000:8.1f} ms")
+    print(f"  Cache (acertos):  {tempo_com_cache * 1000:8.1f} ms "
+          f"| speedup {tempo_sem_cache / tempo_com_cache:.0f}x ({acertos}/{num_arquivos} acertos)")
+
+
+def bench_batch(num_arquivos=20, workers=4):
+    """
+    Um processo por arquivo (CLI compiler.main, imports e tabelas do PLY a
+    cada execução) contra compile-many com workers aquecidos
+    """
+    import subprocess
+    import tempfile
+    from compiler.batch import compile_many
+
+    print("\n=== LOTE: um processo por arquivo vs compile-many ===")
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivos = []
+        for n in range(num_arquivos):
+            caminho = os.path.join(pasta, f"prog{n}.txt")
+            with open(caminho, 'w', encoding='utf-8') as f:
+                f.write(gerar_programa(num_funcoes=3, statements_por_funcao=10))
+            arquivos.append(caminho)
+
+        inicio = time.perf_counter()
+        for caminho in arquivos:
+            subprocess.run([sys.executable, '-m', 'compiler.main', caminho,
+                            '-o', caminho + '.asm'],
+                           cwd=raiz, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        tempo_processos = time.perf_counter() - inicio
+
+        resumo = compile_many(arquivos, workers=workers)
+
+    print(f"  {num_arquivos} arquivos ({os.cpu_count()} CPUs)")
+    print(f"  Processo por arquivo:     {tempo_processos:.2f}s | {num_arquivos / tempo_processos:.1f} arquivos/s")
+    print(f"  compile-many ({workers} proc.):  {resumo['wall_time']:.2f}s | "
+          f"{resumo['throughput']:.1f} arquivos/s | speedup {tempo_processos / resumo['wall_time']:.1f}x")
+
+
+def bench_server(repeticoes=10):
+    """
+    Latência de compilar um arquivo pequeno: CLI a frio (compiler.main),
+    cliente CLI do servidor (compiler.client) e pedido numa conexão aberta
+    """
+    import subprocess
+    import tempfile
+    import threading
+    from compiler.server import CompileServer
+    from compiler.client import CompileClient
+
+    print("\n=== SERVIDOR: latência por arquivo pequeno ===")
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    codigo = gerar_programa(num_funcoes=2, statements_por_funcao=5)
+    with tempfile.TemporaryDirectory() as pasta:
+        fonte = os.path.join(pasta, 'prog.txt')
+        with open(fonte, 'w', encoding='utf-8') as f:
+            f.write(codigo)
+        server = CompileServer(os.path.join(pasta, 'compiler.sock'))
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+
+        def executar(*argumentos):
+            subprocess.run([sys.executable, '-m', *argumentos], cwd=raiz,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        try:
+            frio = cronometrar(lambda: executar('compiler.main', fonte), repeticoes)
+            cliente = cronometrar(lambda: executar('compiler.client', fonte,
+                                                   '--socket', server.socket_path), repeticoes)
+            with CompileClient(server.socket_path) as conexao:
+                conexao.compile(codigo)
+                conectado = cronometrar(lambda: conexao.compile(codigo), repeticoes * 10) / 10
+                conexao.shutdown()
+        finally:
+            thread.join()
+            server.server_close()
+
+    print(f"  CLI a frio (compiler.main):   {frio / repeticoes * 1000:8.1f} ms/arquivo")
+    print(f"  CLI cliente (compiler.client): {cliente / repeticoes * 1000:8.1f} ms/arquivo "
+          f"| {frio / cliente:.1f}x")
+    print(f"  Conexão aberta (CompileClient): {conectado / repeticoes * 1000:7.1f} ms/arquivo "
+          f"| {frio / conectado:.0f}x")
+
+
+def bench_columnar(num_instrucoes=1_000_000):
+    """
+    IR de ~1M instruções: IRProgram (um objeto TAC por instrução) contra
+    ColumnarIR (arrays de códigos e IDs), em memória e no tempo de
+    CopyPropagation (passe de objetos e passe por coluna)
+    """
+    from compiler.ir import IRProgram, TAC, ColumnarIR, copy_propagation
+    from compiler.optimizer import CopyPropagation
+
+    print("\n=== IR COLUNAR: objetos TAC vs colunas (1M instruções) ===")
+    base = compile(gerar_programa(num_funcoes=50, statements_por_funcao=20),
+                   optimize=False)['ir'].instructions
+    copias = num_instrucoes // len(base) + 1
+
+    def programa_tac():
+        programa = IRProgram()
+        for _ in range(copias):
+            for instr in base:
+                programa.add(TAC(instr.op, instr.arg1, instr.arg2, instr.result))
+        return programa
+
+    def programa_colunar():
+        programa = ColumnarIR()
+        for _ in range(copias):
+            for instr in base:
+                programa.add(instr)
+        return programa
+
+    objetos, memoria_tac = medir_memoria(programa_tac)
+    colunas, memoria_colunar = medir_memoria(programa_colunar)
+    total = len(colunas)
+
+    inicio = time.perf_counter()
+    CopyPropagation().apply(objetos)
+    tempo_objetos = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    CopyPropagation().apply(colunas)
+    tempo_visoes = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    copy_propagation(colunas)
+    tempo_colunas = time.perf_counter() - inicio
+
+    print(f"  Programa: {total:,} instruções, {len(colunas.operands):,} operandos distintos")
+    print(f"  IRProgram:  {memoria_tac / 2**20:7.1f} MiB ({memoria_tac / total:5.1f} bytes/instrução)")
+    print(f"  ColumnarIR: {memoria_colunar / 2**20:7.1f} MiB ({memoria_colunar / total:5.1f} bytes/instrução)")
+    print(f"  Redução: {memoria_tac / memoria_colunar:.1f}x")
+    print(f"  CopyPropagation (TAC):        {tempo_objetos * 1000:8.1f} ms")
+    print(f"  CopyPropagation (visões):     {tempo_visoes * 1000:8.1f} ms")
+    print(f"  copy_propagation (colunas):   {tempo_colunas * 1000:8.1f} ms "
+          f"| speedup {tempo_objetos / tempo_colunas:.1f}x")
+
+
+def bench_passes(num_funcoes=200):
+    """
+    Uma rodada dos passes da fase 2: cada passe devolvendo um IRProgram
+    novo (apply, comportamento antigo) contra todos editando uma única
+    cópia no lugar (run)
+    """
+    from compiler.optimizer import (AlgebraicSimplification, ConstantFolding, PeepholeOptimizer,
+                                    CommonSubexpressionElimination, CopyPropagation,
+                                    DeadCodeElimination, copy_program)
+
+    print("\n=== PASSES: IRProgram novo por passe vs edição no lugar ===")
+    ir = compile(gerar_programa(num_funcoes=num_funcoes, statements_por_funcao=20),
+                 optimize=False)['ir']
+    passes = [AlgebraicSimplification(), ConstantFolding(), PeepholeOptimizer(),
+              CommonSubexpressionElimination(), CopyPropagation(), DeadCodeElimination()]
+
+    def por_apply():
+        programa = ir
+        for otimizacao in passes:
+            programa = otimizacao.apply(programa)
+        return programa
+
+    def no_lugar():
+        programa = copy_program(ir)
+        for otimizacao in passes:
+            otimizacao.run(programa.instructions)
+        return programa
+
+    assert [str(i) for i in por_apply().instructions] == [str(i) for i in no_lugar().instructions]
+    _, pico_apply = medir_memoria(por_apply, pico=True)
+    _, pico_lugar = medir_memoria(no_lugar, pico=True)
+    tempo_apply = cronometrar(por_apply, 3) / 3
+    tempo_lugar = cronometrar(no_lugar, 3) / 3
+
+    print(f"  Programa: {len(ir.instructions):,} instruções TAC")
+    print(f"  apply por passe: {tempo_apply * 1000:8.1f} ms | pico {pico_apply / 2**20:6.1f} MiB")
+    print(f"  run no lugar:    {tempo_lugar * 1000:8.1f} ms | pico {pico_lugar / 2**20:6.1f} MiB")
+    print(f"  Speedup: {tempo_apply / tempo_lugar:.1f}x")
+
+
+def bench_cfg():
+    """
+    Construção dos CFGs (blocos, dominadores e laços) em programas de
+    tamanho dobrando: o tempo por instrução deve ficar estável
+    """
+    from compiler.ir.cfg import build_cfgs
+
+    print("\n=== CFG: blocos básicos, dominadores e laços ===")
+    corpo = "int s = 0; int i = 0; while (i < n) { if (s > i) { s = s - i; } else { s = s + i; } i = i + 1; }"
+    for num_lacos in (250, 500, 1000, 2000):
+        codigo = "int f(int n) {\n" + "\n".join([corpo.replace('int ', '') if k else corpo
+                                                  for k in range(num_lacos)]) + "\nreturn 0; }"
+        ir = compile(codigo, optimize=False, backend='scanner')['ir']
+
+        def construir():
+            for cfg in build_cfgs(ir):
+                cfg.loops()
+
+        tempo = cronometrar(construir, 3) / 3
+        total = len(ir.instructions)
+        print(f"  {total:7,} instruções: {tempo * 1000:7.1f} ms ({tempo / total * 1e6:.2f} µs/instrução)")
+
+
+def _dce_antiga(instructions):
+    """
+    Uma passada da DeadCodeElimination antiga: todo operando conta como
+    usado e só temporários nunca lidos saem (uma cadeia morta perde um elo
+    por passada)
+    """
+    def temporario(var):
+        return str(var).startswith('t') and str(var)[1:].isdigit()
+
+    used = set()
+    for instr in instructions:
+        for arg in (instr.arg1, instr.arg2):
+            if isinstance(arg, str) and arg and not arg.lstrip('-').isdigit():
+                used.add(arg)
+    return [instr for instr in instructions
+            if instr.op in ('begin_func', 'end_func', 'return', 'print')
+            or (instr.result and (not temporario(instr.result) or instr.result in used))]
+
+
+def _cadeia(tamanho, viva=True):
+    """f(a): t0 = a + 1; t1 = t0 + 1; ...; return t(n-1) (ou return 0: cadeia morta)"""
+    from compiler.ir import TAC
+    instrucoes = [TAC('begin_func', 'f'), TAC('+', 'a', '1', 't0')]
+    instrucoes += [TAC('+', f't{k - 1}', '1', f't{k}') for k in range(1, tamanho)]
+    instrucoes += [TAC('return', f't{tamanho - 1}' if viva else '0'), TAC('end_func', 'f')]
+    return instrucoes
+
+
+def bench_liveness(tamanho=200_000):
+    """
+    DCE numa cadeia de dependências: a passada antiga remove um elo de uma
+    cadeia morta por vez (O(n²) até convergir) e a liveness com lista de
+    trabalho sobre o CFG remove a cadeia inteira numa passada
+    """
+    from compiler.optimizer import DeadCodeElimination
+
+    print("\n=== DCE: passadas até convergir vs liveness por lista de trabalho ===")
+    for n in (1_000, 2_000, 4_000):
+        def antiga():
+            instrucoes = _cadeia(n, viva=False)
+            passadas = 0
+            while True:
+                passadas += 1
+                restantes = _dce_antiga(instrucoes)
+                if len(restantes) == len(instrucoes):
+                    return passadas
+                instrucoes = restantes
+        inicio = time.perf_counter()
+        passadas = antiga()
+        tempo = time.perf_counter() - inicio
+        print(f"  Antiga, cadeia morta de {n:7,}: {tempo * 1000:9.1f} ms ({passadas:,} passadas)")
+
+    cadeia = _cadeia(tamanho)
+    inicio = time.perf_counter()
+    removida = DeadCodeElimination().run(cadeia)
+    tempo_viva = time.perf_counter() - inicio
+    print(f"  Liveness, cadeia viva de {tamanho:,}: {tempo_viva * 1000:9.1f} ms (removeu algo: {removida})")
+
+    morta = _cadeia(tamanho, viva=False)
+    inicio = time.perf_counter()
+    DeadCodeElimination().run(morta)
+    tempo_morta = time.perf_counter() - inicio
+    print(f"  Liveness, cadeia morta de {tamanho:,}: {tempo_morta * 1000:9.1f} ms "
+          f"({tamanho + 3:,} → {len(morta)} instruções)")
+
+
+def _diamantes(quantidade):
+    """f(c): x = 0 e quantidade de if/else seguidos, cada lado atribuindo x"""
+    from compiler.ir import TAC
+    instrucoes = [TAC('begin_func', 'f'), TAC('assign', '0', None, 'x')]
+    for k in range(quantidade):
+        instrucoes += [TAC('IF_GOTO', 'c', None, f'Lt{k}'), TAC('+', 'x', '1', 'x'),
+                       TAC('GOTO', None, None, f'Le{k}'), TAC('LABEL', None, None, f'Lt{k}'),
+                       TAC('*', 'x', '2', 'x'), TAC('LABEL', None, None, f'Le{k}')]
+    instrucoes += [TAC('return', 'x'), TAC('end_func', 'f')]
+    return instrucoes
+
+
+def bench_ssa():
+    """
+    Construção do SSA (phis pelas fronteiras de dominância + renomeação),
+    propagação esparsa de constantes e destruição: custo por instrução
+    constante com o tamanho da função
+    """
+    from compiler.ir.cfg import build_cfgs
+    from compiler.ir.ssa import SSAForm
+    from compiler.optimizer import ConstantFolding
+
+    print("\n=== SSA: construção, constantes esparsas e destruição ===")
+    fold = ConstantFolding()._fold
+    for quantidade in (1_000, 10_000, 50_000):
+        instrucoes = _diamantes(quantidade)
+        inicio = time.perf_counter()
+        cfg = build_cfgs(instrucoes)[0]
+        ssa = SSAForm(cfg)
+        tempo_ssa = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        constantes = ssa.constants(fold)
+        tempo_constantes = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        saida = ssa.destruct()
+        tempo_saida = time.perf_counter() - inicio
+        total = tempo_ssa + tempo_constantes + tempo_saida
+        print(f"  {len(instrucoes):7,} instruções, {ssa.phi_count:6,} phis: "
+              f"SSA {tempo_ssa * 1000:7.1f} ms | constantes {tempo_constantes * 1000:6.1f} ms "
+              f"({len(constantes):,}) | saída {tempo_saida * 1000:6.1f} ms "
+              f"({len(saida):,} instruções) | {total / len(instrucoes) * 1e6:.1f} µs/instrução")
+
+
+BENCHMARKS = {
+    'lexer': bench_lexer,
+    'tokens': bench_tokens,
+    'parser': bench_parser,
+    'ast': bench_ast,
+    'ast_memory': bench_ast_memory,
+    'visitor': bench_visitor,
+    'flat_ast': bench_flat_ast,
+    'interner': bench_interner,
+    'symbol_table': bench_symbol_table,
+    'parallel': bench_parallel,
+    'incremental': bench_incremental,
+    'cache': bench_cache,
+    'batch': bench_batch,
+    'server': bench_server,
+    'columnar': bench_columnar,
+    'passes': bench_passes,
+    'cfg': bench_cfg,
+    'liveness': bench_liveness,
+    'ssa': bench_ssa,
+}
+
+
+if __name__ == "__main__":
+    nomes = sys.argv[1:] or list(BENCHMARKS)
+    for nome in nomes:
+        if nome not in BENCHMARKS:
+            print(f"Benchmark desconhecido: {nome} (opções: {', '.join(BENCHMARKS)})")
+            sys.exit(1)
+        BENCHMARKS[nome]()
@@ -269,14 +269,9 @@ def demo_completo():
             print(f"   ... e mais {len(result['tokens']) - 15} tokens")
         
         print("\n" + "─"*70)
-        print("ETAPA 2: ANÁLISE SINTÁTICA")
-        print("─"*70)
-        print("Parse Tree:")
-        print(f"   {str(result['parse_tree'])[:200]}...")
-        
-        print("\n" + "─"*70)
-        print("ETAPA 3: CONSTRUÇÃO DA AST")
+        print("ETAPAS 2-3: ANÁLISE SINTÁTICA E CONSTRUÇÃO DA AST")
         print("─"*70)
+        print("O parser LL(1) constrói a AST diretamente:")
         from compiler.ast import print_ast
         print_ast(result['ast'])
         
@@ -7,8 +7,9 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from compiler.lexer import tokenize
-from compiler.parser import parse_ll1, Token
+from compiler.lexer import iter_tokens
+from compiler.parser import parse_ll1
+from compiler.token_buffer import TokenBuffer
 from compiler.ast import build_ast, SemanticAnalyzer, print_ast
 from compiler.ir import IRGenerator
 from compiler.optimizer import Optimizer, CommonSubexpressionElimination, ConstantFolding, DeadCodeElimination, AlgebraicSimplification
@@ -322,12 +323,11 @@ def gerar_relatorio_completo(codigo_fonte):
     
     try:
         # 1. LÉXICO
-        tokens = tokenize(codigo_fonte)
+        tokens = TokenBuffer.from_tokens(iter_tokens(codigo_fonte))
         imprimir_tokens_detalhado(tokens)
         
         # 2. SINTÁTICO
-        ll1_tokens = [Token(tok.type, tok.value, tok.lineno) for tok in tokens]
-        parse_tree, errors = parse_ll1(ll1_tokens)
+        parse_tree, errors = parse_ll1(tokens)
         
         if errors:
             print(f"\n❌ Erros sintáticos encontrados:")
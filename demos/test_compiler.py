@@ -30,11 +30,17 @@ def test_hello_world():
     
     assert result['success'], f"Compilação falhou: {result['errors']}"
     assert len(result['tokens']) > 0, "Nenhum token gerado"
-    assert result['parse_tree'] is not None, "Parse tree não gerada"
     assert result['ast'] is not None, "AST não construída"
     assert result['ir'] is not None, "IR não gerado"
     assert len(result['assembly']) > 0, "Assembly não gerado"
     
+    # compile() constrói a AST direto; a parse tree em tuplas segue disponível
+    from compiler.lexer import tokenize
+    from compiler.parser import parse_ll1
+    parse_tree, erros = parse_ll1(tokenize(code, backend='scanner'))
+    assert result['parse_tree'] is None and result['ast'].node_type == 'program'
+    assert not erros and parse_tree[0] == 'program', "Parse tree não gerada"
+    
     print("✓ Teste Hello World passou!")
     return True
 
@@ -222,6 +228,1203 @@ def test_nested_calls():
     return True
 
 
+def test_lexer_backends():
+    """Teste 7: Scanner manual produz o mesmo stream de tokens do PLY"""
+    print("\n" + "="*60)
+    print("TESTE 7: Conformidade dos Backends Léxicos")
+    print("="*60)
+    
+    from compiler.lexer import tokenize
+    
+    tests_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests')
+    fontes = {}
+    for nome in sorted(os.listdir(tests_dir)):
+        with open(os.path.join(tests_dir, nome), 'r', encoding='utf-8') as f:
+            fontes[nome] = f.read()
+    # Caracteres ilegais e quebras de linha múltiplas também devem coincidir
+    fontes['<ilegal>'] = "int a = 1;\r\n\n  b @ 2 != 3 $\n\tfor(x<=y)"
+    
+    for nome, codigo in fontes.items():
+        ply_tokens = [(t.type, t.value, t.lineno) for t in tokenize(codigo, backend='ply')]
+        scanner_tokens = [(t.type, t.value, t.lineno) for t in tokenize(codigo, backend='scanner')]
+        assert ply_tokens == scanner_tokens, f"Streams diferentes em {nome}"
+    
+    result = compile(fontes['function.txt'], backend='scanner')
+    assert result['success'], f"Compilação falhou: {result['errors']}"
+    
+    print(f"✓ {len(fontes)} fontes com streams idênticos")
+    print("✓ Teste Backends Léxicos passou!")
+    return True
+
+
+def test_streaming_tokens():
+    """Teste 8: Compilação em stream (keep_tokens=False) equivale à normal"""
+    print("\n" + "="*60)
+    print("TESTE 8: Tokens em Stream")
+    print("="*60)
+    
+    code = """
+    int dobro(int x) {
+        return x + x;
+    }
+    
+    int main() {
+        int y = dobro(4);
+        print(y);
+        return 0;
+    }
+    """
+    
+    for backend in ('ply', 'scanner'):
+        result = compile(code, backend=backend)
+        streamed = compile(code, backend=backend, keep_tokens=False)
+        assert streamed['success'], f"Compilação falhou: {streamed['errors']}"
+        assert streamed['tokens'] == [], "Tokens não deveriam ser retidos"
+        assert streamed['assembly'] == result['assembly'], "Assembly diferente em stream"
+    
+    print("✓ Teste Tokens em Stream passou!")
+    return True
+
+
+def test_deep_nesting():
+    """Teste 9: Expressões muito aninhadas não estouram a recursão"""
+    print("\n" + "="*60)
+    print("TESTE 9: Aninhamento Profundo")
+    print("="*60)
+    
+    depth = sys.getrecursionlimit() * 3
+    code = (
+        "int id(int a) { return a; }\n"
+        "int main() {\n"
+        "    int x = " + "(" * depth + "1 + 2" + ")" * depth + ";\n"
+        "    int y = " + "id(" * depth + "x" + ")" * depth + ";\n"
+        "    print(y);\n"
+        "    return 0;\n"
+        "}\n"
+    )
+    
+    result = compile(code, optimize=True, verbose=False)
+    
+    assert result['success'], f"Compilação falhou: {result['errors']}"
+    
+    print(f"✓ {depth} níveis de parênteses e chamadas compilados")
+    print("✓ Teste Aninhamento Profundo passou!")
+    return True
+
+
+def test_flat_ast():
+    """Teste 10: AST plana (arena) equivalente à AST de objetos"""
+    print("\n" + "="*60)
+    print("TESTE 10: AST Plana")
+    print("="*60)
+    
+    from compiler.ast.flat import to_flat, from_flat
+    
+    code = """
+    int soma(int a, int b) { return a + b; }
+    int main() {
+        int x = soma(2, 3) * 4;
+        if (x > 10) { print(x); } else { print(0); }
+        for (int i = 0; i < 3; i = i + 1) { x = x - 1; }
+        return x;
+    }
+    """
+    
+    objetos = compile(code)
+    plana = compile(code, flat_ast=True)
+    
+    assert plana['success'], f"Compilação falhou: {plana['errors']}"
+    assert repr(plana['ast']) == repr(objetos['ast'])
+    assert plana['assembly'] == objetos['assembly']
+    assert repr(from_flat(plana['ast'])) == repr(objetos['ast'])
+    assert repr(to_flat(objetos['ast'])) == repr(objetos['ast'])
+    
+    print(f"✓ {plana['ast'].arena}")
+    print("✓ Teste AST Plana passou!")
+    return True
+
+
+def test_flat_symbol_table():
+    """Teste 11: FlatSymbolTable resolve sombreamento como SymbolTable"""
+    print("\n" + "="*60)
+    print("TESTE 11: Tabela de Símbolos Achatada")
+    print("="*60)
+    
+    from compiler.ast import SymbolTable, FlatSymbolTable
+    
+    for classe in (SymbolTable, FlatSymbolTable):
+        tabela = classe()
+        tabela.insert('x', 'int')
+        tabela.enter_scope('f')
+        assert tabela.lookup('x')['scope'] == 'global'
+        tabela.insert('x', 'int', is_param=True)
+        assert tabela.lookup('x')['scope'] == 'f'
+        assert tabela.lookup('y') is None
+        tabela.exit_scope()
+        assert tabela.lookup('x')['scope'] == 'global'
+        assert tabela.lookup('x', current_scope_only=True)['is_param'] is False
+        print(f"✓ {classe.__name__}: sombreamento e saída de escopo")
+    
+    print("✓ Teste Tabela de Símbolos Achatada passou!")
+    return True
+
+
+def test_frame_slots():
+    """Teste 12: Identificadores resolvidos para (nível, slot) no frame"""
+    print("\n" + "="*60)
+    print("TESTE 12: Slots de Frame")
+    print("="*60)
+    
+    code = """
+    int g = 5;
+    int f(int a, int b) {
+        int c = a + g;
+        c = c * b;
+        return c;
+    }
+    """
+    
+    result = compile(code, frame_slots=True)
+    
+    assert result['success'], f"Compilação falhou: {result['errors']}"
+    
+    decl_c, assign_c, _ = result['ast'].declarations[1].body
+    assert (decl_c.depth, decl_c.slot) == (1, 2)
+    assert (decl_c.value.left.depth, decl_c.value.left.slot) == (1, 0)
+    assert (decl_c.value.right.depth, decl_c.value.right.slot) == (0, 0)
+    assert (assign_c.value.right.depth, assign_c.value.right.slot) == (1, 1)
+    assert result['ir'].frames == {None: {'g': 0}, 'f': {'a': 0, 'b': 1, 'c': 2}}
+    assert "  ENTER 3" in result['assembly']
+    assert "  STORE R0, [GP+0]" in result['assembly']
+    
+    print(f"✓ Frames: {result['ir'].frames}")
+    print("✓ Teste Slots de Frame passou!")
+    return True
+
+
+def test_parallel():
+    """Teste 13: Compilação paralela por função idêntica à serial"""
+    print("\n" + "="*60)
+    print("TESTE 13: Compilação Paralela")
+    print("="*60)
+    
+    code = """
+    int g = 1;
+    int f(int a) {
+        int x = a * 2 + g;
+        if (x > 3) { print(x); } else { print(0); }
+        return x;
+    }
+    int h = f(3) + 4;
+    int k(int b) {
+        for (int i = 0; i < b; i = i + 1) { h = h + f(i); }
+        return h;
+    }
+    int main() { print(k(2)); return 0; }
+    """
+    
+    serial = compile(code)
+    paralela = compile(code, parallel=True, workers=2)
+    
+    assert paralela['success'], f"Compilação falhou: {paralela['errors']}"
+    assert [str(i) for i in paralela['ir'].instructions] == [str(i) for i in serial['ir'].instructions]
+    assert paralela['ir'].frames == serial['ir'].frames
+    assert paralela['assembly'] == serial['assembly']
+    
+    # Função usando global declarado depois dela: mesmo erro da execução serial
+    erro = "int f() { return g; } int g = 1;"
+    assert compile(erro, parallel=True, workers=2)['errors'] == compile(erro)['errors']
+    
+    print(f"✓ {len(serial['ir'].instructions)} instruções idênticas à execução serial")
+    print("✓ Teste Compilação Paralela passou!")
+    return True
+
+
+def test_incremental():
+    """Teste 14: Recompilação incremental só das funções alteradas"""
+    print("\n" + "="*60)
+    print("TESTE 14: Compilação Incremental")
+    print("="*60)
+    
+    from compiler.incremental import IncrementalCompiler
+    
+    code = """
+    int g = 1;
+    int dobro(int a) { return a * 2 + g; }
+    int soma(int a, int b) { int x = a + b; while (x < 10) { x = x + 1; } return x; }
+    int usa(int n) { return dobro(n) + 1; }
+    int main() { print(usa(3)); print(soma(1, 2)); return 0; }
+    """
+    
+    def saida(resultado):
+        return ([str(i) for i in resultado['ir'].instructions],
+                [str(i) for i in resultado['optimized_ir'].instructions],
+                resultado['assembly'], resultado['ir'].frames)
+    
+    compilador = IncrementalCompiler()
+    primeira = compilador.compile(code)
+    assert primeira['success'], f"Compilação falhou: {primeira['errors']}"
+    assert primeira['incremental']['recompiled'] == ['dobro', 'soma', 'usa', 'main']
+    
+    # Corpo alterado: só a própria função é refeita
+    editado = code.replace("x + 1;", "x + 2;")
+    segunda = compilador.compile(editado)
+    assert segunda['incremental']['recompiled'] == ['soma']
+    assert saida(segunda) == saida(IncrementalCompiler().compile(editado))
+    
+    # Assinatura alterada: a função e quem a chama
+    editado = editado.replace("int dobro(int a)", "int dobro(int a, int b)").replace("dobro(n)", "dobro(n, n)")
+    terceira = compilador.compile(editado)
+    assert terceira['incremental']['recompiled'] == ['dobro', 'usa']
+    assert saida(terceira) == saida(IncrementalCompiler().compile(editado))
+    
+    # Sem otimização o resultado é o mesmo do compile() completo
+    assert saida(IncrementalCompiler(optimize=False).compile(code)) == saida(compile(code, optimize=False))
+    
+    # Mesmas chaves de compile() (mais 'incremental') no caminho incremental,
+    # com erro semântico e no fallback para a compilação completa
+    chaves = set(compile(code)) | {'incremental'}
+    fases = {'lexer', 'parser', 'semantic', 'ir', 'optimizer', 'assembly'}
+    assert set(segunda) == chaves and set(segunda['timings']) == fases
+    com_erro = compilador.compile(code.replace("return a * 2 + g;", "return a * 2 + h;"))
+    assert not com_erro['success'] and set(com_erro) == chaves
+    fallback = compilador.compile(code.replace("int x = a + b;", "int x = ;"))
+    assert fallback['incremental']['fallback'] and not segunda['incremental']['fallback']
+    assert set(fallback) == chaves and set(fallback['incremental']) == set(segunda['incremental'])
+    
+    print(f"✓ Reaproveitadas: {terceira['incremental']['reused']}")
+    print("✓ Teste Compilação Incremental passou!")
+    return True
+
+
+def test_compile_cache():
+    """Teste 15: Cache de compilação em disco (compile_file com cache_dir)"""
+    print("\n" + "="*60)
+    print("TESTE 15: Cache de Compilação")
+    print("="*60)
+    
+    import tempfile
+    from compiler.main import compile_file
+    from compiler.cache import CompileCache
+    
+    code = """
+    int soma(int a, int b) { int r = a + b; return r; }
+    int main() { print(soma(2, 3)); return 0; }
+    """
+    
+    with tempfile.TemporaryDirectory() as pasta:
+        fonte = os.path.join(pasta, 'prog.txt')
+        cache_dir = os.path.join(pasta, 'cache')
+        with open(fonte, 'w', encoding='utf-8') as f:
+            f.write(code)
+        
+        primeira = compile_file(fonte, cache_dir=cache_dir)
+        segunda = compile_file(fonte, cache_dir=cache_dir)
+        assert primeira['success'] and 'cached' not in primeira
+        assert segunda['cached'], "Segunda compilação deveria vir do cache"
+        assert segunda['assembly'] == primeira['assembly']
+        assert ([str(i) for i in segunda['optimized_ir'].instructions] ==
+                [str(i) for i in primeira['optimized_ir'].instructions])
+        assert segunda['optimized_ir'].frames == primeira['optimized_ir'].frames
+        assert set(segunda) == set(primeira) | {'cached'}
+        assert segunda['timings'] == {} and segunda['algebraic_ir'] is None
+        
+        # Outras opções → outra entrada
+        assert 'cached' not in compile_file(fonte, optimize=False, cache_dir=cache_dir)
+        
+        # A versão inclui o hash dos fontes do compilador: outro compilador → outra chave
+        from compiler import __version__
+        from compiler.cache import compiler_version
+        assert compiler_version().startswith(__version__ + '+')
+        assert CompileCache(cache_dir).key(code) != CompileCache(cache_dir, version=__version__).key(code)
+
+        # package: o hash é do pacote que compila (src/ usa o próprio diretório)
+        from compiler.cache import compiler_fingerprint
+        pacote = os.path.join(pasta, 'pacote')
+        os.makedirs(pacote)
+        modulo = os.path.join(pacote, 'ir_generator.py')
+        with open(modulo, 'w', encoding='utf-8') as f:
+            f.write("X = 1\n")
+        antes = CompileCache(cache_dir, package=pacote).key(code)
+        assert antes != CompileCache(cache_dir).key(code)
+        with open(modulo, 'w', encoding='utf-8') as f:
+            f.write("X = 2\n")
+        compiler_fingerprint.cache_clear()
+        assert CompileCache(cache_dir, package=pacote).key(code) != antes, \
+            "Mudar um fonte do pacote deveria invalidar o cache"
+
+        # Limite de tamanho: as entradas antigas são apagadas primeiro
+        cache = CompileCache(cache_dir, max_bytes=64)
+        chave = cache.key("int x = 1;")
+        cache.store(chave, {'assembly': []})
+        assert os.listdir(cache_dir) == [chave + '.json']
+    
+    print("✓ Fonte inalterado lido do cache")
+    print("✓ Teste Cache de Compilação passou!")
+    return True
+
+
+def test_batch():
+    """Teste 16: Compilação em lote (compile-many) num pool de processos"""
+    print("\n" + "="*60)
+    print("TESTE 16: Compilação em Lote")
+    print("="*60)
+    
+    import tempfile
+    from compiler.batch import expand_paths, compile_many
+    
+    programas = {
+        'a.txt': "int main() { int x = 2 + 3; print(x); return 0; }",
+        'sub/b.txt': "int f(int a) { return a * 2; } int main() { print(f(4)); return 0; }",
+        'sub/erro.txt': "int main() { print(y); return 0; }",
+    }
+    
+    with tempfile.TemporaryDirectory() as pasta:
+        for nome, code in programas.items():
+            caminho = os.path.join(pasta, 'src', nome)
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            with open(caminho, 'w', encoding='utf-8') as f:
+                f.write(code)
+        
+        raiz = os.path.join(pasta, 'src')
+        arquivos = expand_paths([raiz])
+        assert len(arquivos) == 3
+        
+        saida = os.path.join(pasta, 'out')
+        resumo = compile_many(arquivos, output_dir=saida, workers=2, root=raiz)
+        assert resumo['files'] == 3 and resumo['succeeded'] == 2
+        assert [os.path.basename(p) for p, _ in resumo['failures']] == ['erro.txt']
+        assert resumo['phases']['parser'] > 0
+        
+        # Saída por arquivo igual à compilação individual
+        with open(os.path.join(saida, 'sub', 'b.asm'), encoding='utf-8') as f:
+            gerado = f.read().splitlines()
+        assert gerado == "\n".join(compile(programas['sub/b.txt'])['assembly']).splitlines()
+    
+    print(f"✓ {resumo['succeeded']}/{resumo['files']} arquivos, {resumo['throughput']:.0f} arquivos/s")
+    print("✓ Teste Compilação em Lote passou!")
+    return True
+
+
+def test_compile_server():
+    """Teste 17: Servidor de compilação por socket Unix com pedidos concorrentes"""
+    print("\n" + "="*60)
+    print("TESTE 17: Servidor de Compilação")
+    print("="*60)
+    
+    import tempfile
+    import threading
+    from compiler.server import CompileServer
+    from compiler.client import CompileClient
+    
+    programas = [
+        "int f(int a) { return a * 2; } int main() { print(f(4)); return 0; }",
+        "int main() { int x = 2 + 3; while (x < 10) { x = x + 1; } print(x); return 0; }",
+        "int main() { print(y); return 0; }",
+    ]
+    esperados = [compile(code) for code in programas]
+    
+    with tempfile.TemporaryDirectory() as pasta:
+        server = CompileServer(os.path.join(pasta, 'compiler.sock'))
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        
+        respostas = {}
+        
+        def cliente(n):
+            with CompileClient(server.socket_path, timeout=30) as conexao:
+                respostas[n] = [conexao.compile(code) for code in programas]
+        
+        clientes = [threading.Thread(target=cliente, args=(n,)) for n in range(4)]
+        for c in clientes:
+            c.start()
+        for c in clientes:
+            c.join()
+        
+        with CompileClient(server.socket_path) as conexao:
+            # JSON válido que não é objeto: erro como pedido inválido, conexão continua
+            for invalido in ([1, 2], "texto", 3):
+                resposta = conexao.request(invalido)
+                assert not resposta['success'] and 'Pedido inválido' in resposta['errors'][0]
+            assert conexao.ping()['success']
+            conexao.shutdown()
+        thread.join(timeout=10)
+        server.server_close()
+    
+    assert not thread.is_alive(), "Servidor não encerrou"
+    assert len(respostas) == 4
+    for resposta in respostas.values():
+        for recebido, esperado in zip(resposta, esperados):
+            assert recebido['success'] == esperado['success']
+            assert recebido['errors'] == esperado['errors']
+            assert recebido['assembly'] == esperado['assembly']
+    
+    print(f"✓ {4 * len(programas)} pedidos concorrentes com o mesmo resultado de compile()")
+    print("✓ Teste Servidor de Compilação passou!")
+    return True
+
+
+def test_compile_async():
+    """Teste 18: compile_async com limite de pedidos, timeout e lotes"""
+    print("\n" + "="*60)
+    print("TESTE 18: Compilação Assíncrona")
+    print("="*60)
+    
+    import asyncio
+    import contextlib
+    import io
+    from compiler.aio import AsyncCompiler
+    
+    codigos = [f"int f(int a) {{ return a * {n}; }} int main() {{ print(f({n})); return 0; }}"
+               for n in range(12)] + ["int main() { print(y); return 0; }"]
+    
+    async def compilar_todos():
+        async with AsyncCompiler(max_workers=2, max_in_flight=6, batch_size=3) as compilador:
+            resultados = await asyncio.gather(*(compilador.compile(c) for c in codigos))
+            try:
+                await compilador.compile(codigos[0], timeout=0)
+                expirou = False
+            except asyncio.TimeoutError:
+                expirou = True
+            return resultados, expirou, compilador.round_trips
+    
+    saida = io.StringIO()
+    with contextlib.redirect_stdout(saida):
+        resultados, expirou, idas = asyncio.run(compilar_todos())
+    with contextlib.redirect_stdout(io.StringIO()):
+        esperados = [compile(c) for c in codigos]
+    
+    assert saida.getvalue() == "", "compile_async não deve escrever no stdout"
+    assert expirou, "timeout=0 deveria expirar"
+    assert idas < len(codigos), f"Pedidos não foram agrupados ({idas} idas ao pool)"
+    for resultado, esperado in zip(resultados, esperados):
+        assert resultado['success'] == esperado['success']
+        assert resultado['errors'] == esperado['errors']
+        assert resultado['assembly'] == esperado['assembly']
+    assert not resultados[-1]['success']
+
+    # Pedidos que expiram continuam ocupando a vaga até o worker terminar
+    class Medidor(AsyncCompiler):
+        pico = 0
+        def _flush(self):
+            super()._flush()
+            self.pico = max(self.pico, self.running)
+
+    lento = ("int main() { int x = 0; " + " ".join(f"x = x + {i} * 2;" for i in range(400))
+             + " print(x); return 0; }")
+
+    async def expirar_todos():
+        async with Medidor(max_workers=2, max_in_flight=2, batch_size=1) as compilador:
+            pedidos = [compilador.compile(lento, timeout=0.01) for _ in range(8)]
+            respostas = await asyncio.gather(*pedidos, return_exceptions=True)
+            return respostas, compilador.pico
+
+    respostas, pico = asyncio.run(expirar_todos())
+    assert all(isinstance(r, asyncio.TimeoutError) for r in respostas)
+    assert pico <= 2, f"{pico} pedidos no pool com max_in_flight=2"
+
+    # Pedidos na fila de outro event loop ainda vivo: erro em vez de abandoná-los
+    compilador = AsyncCompiler(max_workers=1, batch_size=100, batch_delay=60)
+    outro_loop = asyncio.new_event_loop()
+    try:
+        tarefa = outro_loop.create_task(compilador.compile(codigos[0]))
+        outro_loop.run_until_complete(asyncio.sleep(0))
+        try:
+            asyncio.run(compilador.compile(codigos[1]))
+            rejeitou = False
+        except RuntimeError:
+            rejeitou = True
+        outro_loop.run_until_complete(compilador.close())
+        assert rejeitou, "Uso com pedidos pendentes em outro loop deveria falhar"
+        assert outro_loop.run_until_complete(tarefa)['assembly'] == esperados[0]['assembly']
+    finally:
+        outro_loop.close()
+
+    print(f"✓ {len(codigos)} pedidos em {idas} idas ao pool")
+    print("✓ Teste Compilação Assíncrona passou!")
+    return True
+
+
+def test_diagnostics():
+    """Teste 19: Diagnósticos vão para o destino escolhido, nunca para o stdout"""
+    print("\n" + "="*60)
+    print("TESTE 19: Diagnósticos")
+    print("="*60)
+    
+    import contextlib
+    import io
+    import logging
+    from compiler.diagnostics import Diagnostics
+    
+    code = "int main() { int x = 1 $ 2; return x; }"
+    codigo_valido = "int main() { int x = 1 + 2; return x; }"
+    
+    saida = io.StringIO()
+    with contextlib.redirect_stdout(saida):
+        for backend in ('ply', 'scanner'):
+            compile(code, backend=backend)
+            compile(codigo_valido, backend=backend)
+    assert saida.getvalue() == "", f"compile() escreveu no stdout: {saida.getvalue()!r}"
+    
+    # Lista: erro léxico, erro sintático e progresso do backend
+    eventos = []
+    result = compile(code, diagnostics=Diagnostics(eventos))
+    tipos = [(e.kind, e.phase) for e in eventos]
+    assert ('error', 'lexer') in tipos and ('error', 'parser') in tipos
+    assert [e.message for e in eventos if e.phase == 'parser'] == result['errors']
+    total_erros = len(eventos)
+    eventos = []
+    compile(codigo_valido, diagnostics=Diagnostics(eventos))
+    assert [e.kind for e in eventos] == ['progress'] * 4
+    
+    # Logger e função
+    registros = []
+    logger = logging.getLogger('compilador.teste')
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = logging.Handler()
+    handler.emit = registros.append
+    logger.addHandler(handler)
+    compile(code, diagnostics=Diagnostics(logger))
+    logger.removeHandler(handler)
+    assert any(r.levelno == logging.ERROR for r in registros)
+    
+    chamadas = []
+    compile(code, diagnostics=Diagnostics(chamadas.append))
+    assert len(chamadas) == total_erros
+    
+    # verbose continua imprimindo o progresso
+    saida = io.StringIO()
+    with contextlib.redirect_stdout(saida):
+        compile(codigo_valido, verbose=True)
+    assert "[1/4]" in saida.getvalue()
+    
+    print("✓ Nenhuma E/S no terminal sem verbose; lista, logger e função recebem os eventos")
+    print("✓ Teste Diagnósticos passou!")
+    return True
+
+
+def test_columnar_ir():
+    """Teste 20: IR em colunas roda os passes existentes com o mesmo resultado"""
+    print("\n" + "="*60)
+    print("TESTE 20: IR Colunar")
+    print("="*60)
+    
+    from compiler.codegen import CodeGenerator
+    from compiler.codegen.assembly import AssemblyGenerator
+    from compiler.ir import ColumnarIR, IRGenerator, copy_propagation
+    from compiler.optimizer import CopyPropagation
+    
+    code = """
+    int g = 3;
+    int f(int a, int b) { int c = a; int d = c + b; if (d > 2) { d = d - 1; } return d * 2; }
+    int main() { int x = f(1, g); int y = x; while (y < 10) { y = y + x; } print(y); return 0; }
+    """
+    result = compile(code, optimize=False)
+    assert result['success'], f"Compilação falhou: {result['errors']}"
+    
+    def linhas(programa):
+        return [str(i) for i in programa.get_instructions()]
+    
+    # Gerado direto em colunas: mesmo IR de compile()
+    gerador = IRGenerator(result['symbol_table'], result['interner'], ir_program=ColumnarIR())
+    colunar = gerador.generate(result['ast'])
+    assert isinstance(colunar, ColumnarIR)
+    assert linhas(colunar) == linhas(result['ir'])
+    assert colunar.frames == result['ir'].frames
+    assert max(colunar.ops) < 256 and len(colunar.operands) < len(colunar)
+    
+    # Passes existentes sobre as visões: mesmo IR otimizado e mesmo assembly
+    def otimiza(programa):
+        otimizado = CodeGenerator(result['symbol_table']).optimize(programa)
+        return linhas(otimizado), AssemblyGenerator().generate(otimizado)
+    assert otimiza(colunar) == otimiza(ColumnarIR.from_program(result['ir']).to_program())
+    
+    # Passe por coluna igual ao passe de objetos
+    assert linhas(copy_propagation(colunar)) == linhas(CopyPropagation().apply(result['ir']))
+    
+    # Ida e volta, edição por visão e compactação
+    volta = colunar.to_program()
+    assert linhas(volta) == linhas(colunar)
+    colunar.instructions[0].arg1 = '99'
+    assert colunar.instructions[0].arg1 == '99' and volta.instructions[0].arg1 != '99'
+    pares = colunar.compact([i % 2 == 0 for i in range(len(colunar))])
+    assert linhas(pares) == linhas(colunar)[::2]
+    
+    print(f"✓ {len(colunar)} instruções, {len(colunar.operands)} operandos distintos")
+    print("✓ Teste IR Colunar passou!")
+    return True
+
+
+def test_inplace_passes():
+    """Teste 21: Passes editam o IR no lugar e informam se algo mudou"""
+    print("\n" + "="*60)
+    print("TESTE 21: Passes no Lugar")
+    print("="*60)
+    
+    from compiler.codegen import CodeGenerator
+    from compiler.ir import TAC
+    from compiler.optimizer import (CopyPropagation, DeadCodeElimination,
+                                    PeepholeOptimizer, copy_program)
+    
+    # Edição no lugar, lápides compactadas e sinal de mudança
+    instrucoes = [TAC('begin_func', 'f'), TAC('assign', 'a', None, 't0'), TAC('+', 't0', '1', 't1'),
+                  TAC('assign', 'x', None, 'x'), TAC('assign', 't1', None, 'b'),
+                  TAC('return', 'b'), TAC('end_func', 'f')]
+    primeira = instrucoes[2]
+    assert CopyPropagation().run(instrucoes) is True
+    assert instrucoes[2] is primeira and str(primeira) == "t1 = a + 1"
+    assert CopyPropagation().run(instrucoes) is False
+    assert PeepholeOptimizer().run(instrucoes) is True
+    assert None not in instrucoes and "x = x" not in [str(i) for i in instrucoes]
+    assert DeadCodeElimination().run(instrucoes) is True
+    assert [str(i) for i in instrucoes] == ["begin_func f", "t1 = a + 1", "return t1", "end_func f"]
+    assert DeadCodeElimination().run(instrucoes) is False
+    
+    code = """
+    int main() { int a = 4; int b = a * 2 + 0; int c = (a + b) - (a + b); int d = b / b; print(c + d); return 0; }
+    """
+    result = compile(code, optimize=False)
+    original = [str(i) for i in result['ir'].instructions]
+    
+    # apply() e optimize() não alteram o IR recebido
+    CopyPropagation().apply(result['ir'])
+    codegen = CodeGenerator(result['symbol_table'])
+    otimizado = codegen.optimize(result['ir'])
+    assert [str(i) for i in result['ir'].instructions] == original
+    assert not set(map(id, otimizado.instructions)) & set(map(id, result['ir'].instructions))
+    
+    # Ponto fixo: mais uma rodada do pipeline não muda nada
+    assert 1 <= codegen.optimizer_passes < codegen.max_passes
+    de_novo = codegen.optimize(otimizado)
+    assert codegen.optimizer_passes == 1
+    assert [str(i) for i in de_novo.instructions] == [str(i) for i in otimizado.instructions]
+    assert [str(i) for i in compile(code)['optimized_ir'].instructions] == [str(i) for i in otimizado.instructions]
+    
+    # Os mesmos passes rodam sobre as colunas de um ColumnarIR, com o mesmo resultado
+    from compiler.ir import ColumnarIR
+    from compiler.optimizer import (AlgebraicSimplification, CommonSubexpressionElimination,
+                                    ConstantFolding)
+    # (o segundo programa tem store morto e x = x: DCE e Peephole deixam lápides)
+    morto = compile("int main() { int a = 4; int m = a + 1; int b = a; b = b; print(b); return 0; }",
+                    optimize=False)['ir']
+    for programa in (result['ir'], morto):
+        for passe in (AlgebraicSimplification(), ConstantFolding(), PeepholeOptimizer(),
+                      CommonSubexpressionElimination(), CopyPropagation(), DeadCodeElimination()):
+            esperado = copy_program(programa)
+            mudou = passe.run(esperado.instructions)
+            colunas = ColumnarIR.from_program(programa)
+            assert passe.run(colunas.instructions) is mudou
+            assert [str(i) for i in colunas.instructions] == [str(i) for i in esperado.instructions]
+            aplicado = passe.apply(ColumnarIR.from_program(programa))
+            assert isinstance(aplicado, ColumnarIR)
+            assert [str(i) for i in aplicado.instructions] == [str(i) for i in esperado.instructions]
+    
+    print(f"✓ {len(original)} → {len(otimizado.instructions)} instruções em {codegen.optimizer_passes} rodada(s)")
+    print("✓ Teste Passes no Lugar passou!")
+    return True
+
+
+def test_cfg():
+    """Teste 22: Blocos básicos, dominadores e laços do TAC"""
+    print("\n" + "="*60)
+    print("TESTE 22: Grafo de Fluxo de Controle")
+    print("="*60)
+    
+    from compiler.ir.cfg import build_cfgs
+    
+    code = """
+    int g = 2;
+    int f(int n) {
+        int s = 0; int i = 0;
+        for (i = 0; i < n; i = i + 1) {
+            while (s < 10) { s = s + i; }
+            if (s > 3) { s = s - 1; } else { return s; }
+        }
+        return s;
+    }
+    int main() { print(f(3)); return 0; }
+    """
+    result = compile(code, optimize=False)
+    assert result['success'], f"Compilação falhou: {result['errors']}"
+    
+    cfgs = build_cfgs(result['ir'])
+    assert [cfg.name for cfg in cfgs] == [None, 'f', 'main']
+    cfg = cfgs[1]
+    
+    # Blocos cobrem a função sem buracos; desvios só no fim de um bloco
+    assert cfg.blocks[0].start == cfg.start and cfg.blocks[-1].end == cfg.end
+    for bloco, seguinte in zip(cfg.blocks, cfg.blocks[1:]):
+        assert bloco.end == seguinte.start
+        assert all(i.op not in ('GOTO', 'IF_GOTO', 'IF_FALSE_GOTO')
+                   for i in cfg.instructions_of(bloco)[:-1])
+        for succ in bloco.succs:
+            assert bloco.index in cfg.blocks[succ].preds
+    
+    # for externo e while interno: dois laços naturais aninhados
+    interno, externo = sorted(cfg.loops(), key=lambda l: len(l.blocks))
+    assert interno.blocks < externo.blocks
+    assert cfg.dominates(externo.header, interno.header)
+    for loop in cfg.loops():
+        assert cfg.blocks[loop.header].label.startswith('Lbegin')
+        assert all(cfg.dominates(loop.header, b) for b in loop.blocks)
+        assert all(loop.header in cfg.blocks[tail].succs for tail, _ in loop.back_edges)
+    
+    # O return do else sai do laço; a entrada domina todo bloco alcançável
+    retorno = next(b for b in cfg.blocks if b.label and b.label.startswith('Lfalse'))
+    assert retorno.succs == [] and retorno.index not in externo
+    assert cfg.dominators()[0] == 0
+    assert all(cfg.dominates(0, b) for b in cfg.reverse_postorder())
+    
+    # Cópias e subexpressões não atravessam blocos nem sobrevivem à reatribuição
+    otimizado = compile("int f(int a) { int x = a; a = a + 1; return x + a; } "
+                        "int main() { print(f(2)); return 0; }")['optimized_ir']
+    # (a = t0 é um store morto e sai; x continua sendo o a original)
+    assert "t1 = a + t0" in [str(i) for i in otimizado.instructions]
+    
+    # Uma chamada pode mudar as globais: g + a é recalculado e x = g não vira g
+    from compiler.ir import copy_propagation
+    from compiler.optimizer import CopyPropagation
+    chamada = """
+    int g = 1;
+    int bump(int k) { g = g + k; return 0; }
+    int main() { int a = 5; int x = g + a; int c = g; int z = bump(10); int y = g + a;
+                 print(x); print(y); print(c); return 0; }
+    """
+    instrucoes = [str(i) for i in compile(chamada)['optimized_ir'].instructions]
+    assert sum(1 for i in instrucoes if i.endswith("= g + a")) == 2
+    assert "print c" in instrucoes
+    ir_chamada = compile(chamada, optimize=False)['ir']
+    assert [str(i) for i in copy_propagation(ir_chamada).get_instructions()] == \
+           [str(i) for i in CopyPropagation().apply(ir_chamada).instructions]
+    
+    print(f"✓ f: {len(cfg.blocks)} blocos, laços {cfg.loops()}")
+    print("✓ Teste Grafo de Fluxo de Controle passou!")
+    return True
+
+
+def test_liveness():
+    """Teste 23: Variáveis vivas por bloco e DCE de definições mortas"""
+    print("\n" + "="*60)
+    print("TESTE 23: Liveness e Dead Code Elimination")
+    print("="*60)
+    
+    from compiler.incremental import IncrementalCompiler
+    from compiler.ir.cfg import build_cfgs
+    from compiler.ir.liveness import Liveness
+    
+    code = """
+    int g = 0;
+    int conta(int n, int k) {
+        int i = k; int morto = n + k; int s = k;
+        while (i < n) { s = s + i; i = i + 1; }
+        g = s; morto = s * 3;
+        return s;
+    }
+    int main() { int x = conta(4, 1); print(g); return 0; }
+    """
+    result = compile(code, optimize=False)
+    assert result['success'], f"Compilação falhou: {result['errors']}"
+    
+    # Dentro do laço i, s e n seguem vivos (aresta de retorno); na saída só g
+    cfg = build_cfgs(result['ir'])[1]
+    liveness = Liveness(cfg, {'g'})
+    laco = cfg.loops()[0]
+    assert {'i', 's', 'n'} <= liveness.live_at_entry(laco.header)
+    assert liveness.live_at_exit(cfg.blocks[-1]) == {'g'}
+    assert 'morto' not in set().union(*(liveness.live_at_exit(b) for b in cfg.blocks))
+    
+    # Stores mortos do usuário saem; global, param, call e print ficam
+    otimizado = [str(i) for i in compile(code)['optimized_ir'].instructions]
+    assert not any(i.startswith(('morto =', 'x =')) for i in otimizado)
+    assert "g = s" in otimizado and "print g" in otimizado
+    assert "param 4" in otimizado and any("call conta" in i for i in otimizado)
+    
+    # Função compilada isolada (incremental): a global continua viva na saída
+    incremental = IncrementalCompiler().compile(code)
+    assert "g = s" in [str(i) for i in incremental['optimized_ir'].instructions]
+    
+    print(f"✓ {liveness.iterations} blocos processados pela lista de trabalho")
+    print("✓ Teste Liveness passou!")
+    return True
+
+
+def test_ssa():
+    """Teste 24: Construção e destruição do SSA e constantes sobre laços"""
+    print("\n" + "="*60)
+    print("TESTE 24: SSA")
+    print("="*60)
+    
+    from compiler.ir import TAC
+    from compiler.ir.cfg import build_cfgs
+    from compiler.ir.ssa import SSAForm, base_name
+    
+    def executa(instructions, args):
+        """Interpretador mínimo de TAC (uma função, sem chamadas)"""
+        ops = {'+': lambda a, b: a + b, '-': lambda a, b: a - b,
+               '*': lambda a, b: a * b, '<': lambda a, b: int(a < b),
+               '>': lambda a, b: int(a > b)}
+        labels = {instr.result: i for i, instr in enumerate(instructions) if instr.op == 'LABEL'}
+        env = dict(args)
+        valor = lambda x: int(x) if x.lstrip('-').isdigit() else env[x]
+        saida, pc = [], 0
+        while True:
+            instr = instructions[pc]
+            pc += 1
+            if instr.op == 'assign':
+                env[instr.result] = valor(instr.arg1)
+            elif instr.op in ops:
+                env[instr.result] = ops[instr.op](valor(instr.arg1), valor(instr.arg2))
+            elif instr.op == 'GOTO':
+                pc = labels[instr.result]
+            elif instr.op in ('IF_GOTO', 'IF_FALSE_GOTO'):
+                if bool(valor(instr.arg1)) == (instr.op == 'IF_GOTO'):
+                    pc = labels[instr.result]
+            elif instr.op == 'print':
+                saida.append(valor(instr.arg1))
+            elif instr.op == 'return':
+                return saida, valor(instr.arg1)
+    
+    code = """
+    int soma(int n) {
+        int i = 0; int s = 0;
+        while (i < n) { if (i > 2) { s = s + i; } else { s = s - 1; } i = i + 1; }
+        print(s); return s;
+    }
+    int main() { int r = soma(6); print(r); return 0; }
+    """
+    result = compile(code, optimize=False)
+    assert result['success'], f"Compilação falhou: {result['errors']}"
+    
+    # Cada nome é definido uma vez; o cabeçalho do laço recebe phis de i e s
+    cfg = build_cfgs(result['ir'])[0]
+    ssa = SSAForm(cfg)
+    definidos = [t.result for t in ssa.instructions() if t.result in ssa.defs]
+    assert len(definidos) == len(set(definidos))
+    cabecalho = cfg.loops()[0].header
+    assert {base_name(t.result) for t in ssa.code[cabecalho] if t.op == 'phi'} == {'i', 's'}
+    
+    # Ida e volta: o TAC sem phis calcula o mesmo que o original
+    original = cfg.instructions[cfg.start:cfg.end]
+    destruido = ssa.destruct()
+    assert not any(t.op == 'phi' for t in destruido)
+    for n in (0, 2, 6):
+        assert executa(destruido, {'n': n}) == executa(original, {'n': n})
+    
+    # Aresta crítica (o laço volta por um desvio condicional): ganha bloco novo
+    laco = [TAC('begin_func', 'f'), TAC('assign', '0', None, 'x'),
+            TAC('LABEL', None, None, 'L'), TAC('+', 'x', '1', 'x'),
+            TAC('<', 'x', 'n', 't'), TAC('IF_GOTO', 't', None, 'L'),
+            TAC('return', 'x'), TAC('end_func', 'f')]
+    destruido = SSAForm(build_cfgs(laco)[0]).destruct()
+    assert sum(1 for t in destruido if t.op == 'LABEL') == 2
+    assert executa(destruido, {'n': 5}) == executa(laco, {'n': 5}) == ([], 5)
+    
+    # Constantes: i = 0 antes do laço não vira i = 1 dentro dele
+    otimizado = compile(code)
+    assert otimizado['success']
+    instrucoes = [str(t) for t in otimizado['optimized_ir'].instructions]
+    assert "i = 1" not in instrucoes and "s = -1" not in instrucoes
+    assert executa(otimizado['optimized_ir'].instructions, {'n': 6}) == executa(original, {'n': 6})
+    
+    # Peephole: uma reatribuição não literal derruba a constante anterior
+    from compiler.optimizer import PeepholeOptimizer
+    reatribuida = [TAC('begin_func', 'f'), TAC('assign', '0', None, 'x'), TAC('assign', 'a', None, 'x'),
+                   TAC('+', 'x', 'a', 'r'), TAC('return', 'r'), TAC('end_func', 'f')]
+    PeepholeOptimizer().run(reatribuida)
+    assert "r = x + a" in [str(t) for t in reatribuida]
+    otimizado = compile("int f(int a) { int x = 0; x = a; int r = x + a; return r; } "
+                        "int main() { print(f(3)); return 0; }")['optimized_ir']
+    assert "return a" not in [str(t) for t in otimizado.instructions]
+    
+    print(f"✓ {ssa.phi_count} phis, {len(ssa.defs)} nomes SSA")
+    print("✓ Teste SSA passou!")
+    return True
+
+
+def test_emit_ast_parity():
+    """Teste 25: emit='ast' e emit='flat' constroem a mesma AST que build_ast sobre a parse tree"""
+    print("\n" + "="*60)
+    print("TESTE 25: Paridade emit='ast'/'flat' × build_ast")
+    print("="*60)
+    
+    from compiler.ast import build_ast
+    from compiler.ast.flat import from_flat
+    from compiler.lexer import tokenize
+    from compiler.parser import parse_ll1
+    
+    tests_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests')
+    fontes = {}
+    for nome in sorted(os.listdir(tests_dir)):
+        with open(os.path.join(tests_dir, nome), 'r', encoding='utf-8') as f:
+            fontes[nome] = f.read()
+    # Entradas com erro: arquivos cortados ao meio e construções inválidas
+    for nome, codigo in list(fontes.items()):
+        fontes[f"{nome}[:metade]"] = codigo[:len(codigo) // 2]
+    fontes['<else vazio>'] = "int main() { int x = 1; if (x > 0) { x = 2; } else { } return x; }"
+    fontes['<erros>'] = "int main() { int = 5; x = ; if (x { print(x) } return; }"
+    fontes['<vazio>'] = ""
+    
+    com_erros = 0
+    for nome, codigo in fontes.items():
+        tokens = tokenize(codigo, backend='scanner')
+        tuplas, erros_tuplas = parse_ll1(tokens, emit='tuple')
+        ast, erros_ast = parse_ll1(tokens, emit='ast')
+        plana, erros_plana = parse_ll1(tokens, emit='flat')
+        assert erros_ast == erros_tuplas == erros_plana, f"Erros diferentes em {nome}"
+        esperado = build_ast(tuplas) if tuplas is not None else None
+        assert repr(ast) == repr(esperado), f"ASTs diferentes em {nome}"
+        plana = from_flat(plana) if plana is not None else None
+        assert repr(plana) == repr(esperado), f"AST plana diferente em {nome}"
+        com_erros += bool(erros_ast)
+    assert com_erros >= 2
+    
+    print(f"✓ {len(fontes)} fontes ({com_erros} com erros) com a mesma AST")
+    print("✓ Teste Paridade emit='ast' passou!")
+    return True
+
+
+def test_token_buffer():
+    """Teste 26: TokenBuffer devolve os mesmos tokens da lista do léxico"""
+    print("\n" + "="*60)
+    print("TESTE 26: TokenBuffer")
+    print("="*60)
+    
+    from compiler.lexer import tokenize
+    from compiler.token_buffer import TokenBuffer
+    
+    code = "int main() {\n  int x = 42;\n  int y = x + 42;\n\n  print(y);\n  return 0;\n}"
+    tokens = tokenize(code, backend='scanner')
+    buffer = TokenBuffer.from_tokens(tokens)
+    
+    # Indexação (positiva, negativa, fatias) e iteração iguais à lista
+    trio = lambda t: (t.type, t.value, t.lineno)
+    assert len(buffer) == len(tokens)
+    assert [trio(t) for t in buffer] == [trio(t) for t in tokens]
+    assert trio(buffer[-1]) == trio(tokens[-1]) and trio(buffer[3]) == trio(tokens[3])
+    assert [trio(t) for t in buffer[2:9:3]] == [trio(t) for t in tokens[2:9:3]]
+    assert [t.lineno for t in buffer] == [t.lineno for t in tokens]
+    try:
+        buffer[len(tokens)]
+        assert False, "Índice fora do buffer deveria falhar"
+    except IndexError:
+        pass
+    
+    # Refazer o buffer a partir das visões preserva tudo; lexemas repetidos são internados
+    copia = TokenBuffer.from_tokens(buffer)
+    assert [trio(t) for t in copia] == [trio(t) for t in tokens]
+    quarenta_e_dois = [t.value for t in buffer if t.type == 'NUMBER' and t.value == 42]
+    assert len(quarenta_e_dois) == 2
+    valores = [v for v in buffer.values if v == 'x']
+    assert len(valores) == 2 and valores[0] is valores[1]
+    
+    print(f"✓ {len(buffer)} tokens, {buffer[-1].lineno} linhas")
+    print("✓ Teste TokenBuffer passou!")
+    return True
+
+
+def test_parser_token_codes():
+    """Teste 27: Parser com códigos inteiros de token gera a mesma árvore e os mesmos erros"""
+    print("\n" + "="*60)
+    print("TESTE 27: Parser com Códigos de Token")
+    print("="*60)
+    
+    from compiler.lexer import tokenize
+    from compiler.parser import Token, parse_ll1
+    from compiler.token_buffer import TokenBuffer
+    
+    # Saídas esperadas: as do parser que comparava token.type (strings)
+    code = ("int f(int a) { if (a <= 2) { return a * (a - 1); } return f(a - 1) + 3; } "
+            "int main() { print(f(4)); return 0; }")
+    esperado = ('program', [
+        ('function', 'f', [('param', 'a', 'int')], [
+            ('if', ('<=', ('id', 'a'), ('num', 2)),
+             [('return', ('*', ('id', 'a'), ('-', ('id', 'a'), ('num', 1))))], None),
+            ('return', ('+', ('call', 'f', [('-', ('id', 'a'), ('num', 1))]), ('num', 3)))]),
+        ('function', 'main', [], [('print', ('call', 'f', [('num', 4)])), ('return', ('num', 0))])])
+    invalido = "int main() { int x = ; return 0 }"
+    esperado_invalido = ('program', [('function', 'main', [], [('decl_assign', 'x', ('num', 0)),
+                                                                ('return', ('num', 0))])])
+    erros_invalido = ["[ERRO SINTÁTICO] Fator inválido: 'SEMICOLON' na linha 1",
+                      "[ERRO SINTÁTICO] Esperado 'SEMICOLON', encontrado 'RBRACE' na linha 1"]
+    
+    # Mesma saída com Token, tokens do scanner e visões do TokenBuffer
+    def fontes_de_tokens(codigo):
+        yield [Token(t.type, t.value, t.lineno) for t in tokenize(codigo)]
+        yield tokenize(codigo, backend='scanner')
+        yield TokenBuffer.from_tokens(tokenize(codigo))
+    
+    for tokens in fontes_de_tokens(code):
+        assert parse_ll1(tokens) == (esperado, [])
+    for tokens in fontes_de_tokens(invalido):
+        assert parse_ll1(tokens) == (esperado_invalido, erros_invalido)
+    
+    print("✓ Mesma parse tree e mensagens de erro com nomes de token")
+    print("✓ Teste Parser com Códigos de Token passou!")
+    return True
+
+
+def test_slotted_nodes():
+    """Teste 28: Nós da AST com __slots__ (campos fixos, sem __dict__)"""
+    print("\n" + "="*60)
+    print("TESTE 28: Nós com __slots__")
+    print("="*60)
+    
+    from compiler.ast.ast_builder import ASTNode, BinOpNode, IdNode, NumberNode, RESOLVED
+    
+    classes = ASTNode.__subclasses__()
+    assert len(classes) >= 14
+    for cls in classes:
+        assert '__dict__' not in dir(cls), f"{cls.__name__} ainda tem __dict__"
+        assert cls.node_type and not set(cls._fields) & set(RESOLVED)
+    
+    # Campos desconhecidos são recusados; os de RESOLVED podem ser anotados
+    no = BinOpNode('+', IdNode('a'), NumberNode(1))
+    try:
+        no.tipo = 'int'
+        assert False, "Atributo desconhecido deveria falhar"
+    except AttributeError:
+        pass
+    folha = IdNode('a')
+    folha.depth, folha.slot = 1, 0
+    assert (folha.depth, folha.slot) == (1, 0)
+    assert no.node_type == 'binop' and no.left.name == 'a' and no.right.value == 1
+    
+    # Os nós da compilação também são os slotted (sem atributos extras)
+    ast = compile("int main() { int x = 1 + 2; print(x); return 0; }", optimize=False)['ast']
+    assert type(ast) in classes and not hasattr(ast, '__dict__')
+    
+    print(f"✓ {len(classes)} classes de nó sem __dict__")
+    print("✓ Teste Nós com __slots__ passou!")
+    return True
+
+
+def test_visitor_dispatch():
+    """Teste 29: Despacho do Visitor respeita herança e sobrescrita"""
+    print("\n" + "="*60)
+    print("TESTE 29: Despacho do Visitor")
+    print("="*60)
+    
+    from compiler.ast import Visitor
+    from compiler.ast.ast_builder import BinOpNode, IdNode, NumberNode
+    
+    class Avaliador(Visitor):
+        def visit_number(self, node):
+            return node.value
+        
+        def visit_binop(self, node):
+            esquerda = yield node.left
+            direita = yield node.right
+            return esquerda + direita if node.op == '+' else esquerda * direita
+    
+    class Dobrado(Avaliador):
+        def visit_number(self, node):          # sobrescreve só as folhas
+            return 2 * node.value
+    
+    class Neto(Dobrado):
+        def generic_visit(self, node):      # herda num e binop, trata o resto
+            return 100
+    
+    expr = BinOpNode('+', NumberNode(3), BinOpNode('*', NumberNode(4), IdNode('x')))
+    soma = BinOpNode('+', NumberNode(3), NumberNode(4))
+    assert Avaliador().visit(soma) == 7
+    assert Dobrado().visit(soma) == 14
+    assert Neto().visit(expr) == 6 + 8 * 100
+    assert Avaliador._dispatch['number'] is not Dobrado._dispatch['number']
+    assert Neto._dispatch['binop'] is Avaliador._dispatch['binop']
+    try:
+        Dobrado().visit(expr)
+        assert False, "Nó sem visit_* deveria cair em generic_visit"
+    except NotImplementedError:
+        pass
+    
+    print("✓ Subclasses herdam e sobrescrevem visit_* com tabelas próprias")
+    print("✓ Teste Despacho do Visitor passou!")
+    return True
+
+
+def test_interned_names():
+    """Teste 30: Nomes internados são o mesmo objeto em todas as fases"""
+    print("\n" + "="*60)
+    print("TESTE 30: Nomes Internados")
+    print("="*60)
+    
+    code = """
+    int contador = 1;
+    int main() { int total = contador + 2; contador = total * 2; print(contador); return 0; }
+    """
+    for backend in ('ply', 'scanner'):
+        result = compile(code, backend=backend, optimize=False)
+        assert result['success'], f"Compilação falhou: {result['errors']}"
+        interner = result['interner']
+        canonico = interner.intern('contador')
+        
+        # Tokens, AST, tabela de símbolos e operandos do TAC
+        nomes = [t.value for t in result['tokens'] if t.value == 'contador']
+        global_decl, main = result['ast'].declarations
+        total, atribuicao, impressao = main.body[:3]
+        nomes += [global_decl.name, total.value.left.name, atribuicao.name, impressao.value.name]
+        nomes += [nome for nome in result['symbol_table'].global_scope.symbols if nome == 'contador']
+        nomes += [valor for i in result['ir'].instructions for valor in (i.arg1, i.arg2, i.result)
+                  if valor == 'contador']
+        assert len(nomes) >= 9
+        assert all(nome is canonico for nome in nomes), f"Nome duplicado ({backend})"
+        
+        # Temporários e literais do IR também são canônicos
+        temporarios = [i.result for i in result['ir'].instructions if i.result == 't0']
+        assert temporarios and all(t is interner.temp(0) for t in temporarios)
+        assert all(i.arg2 is interner.const(2) for i in result['ir'].instructions if i.arg2 == '2')
+    
+    print(f"✓ {len(nomes)} ocorrências de 'contador' com um único objeto")
+    print("✓ Teste Nomes Internados passou!")
+    return True
+
+
+def test_expression_trees():
+    """Teste 31: Árvores de expressões (precedência, associatividade e recuperação de erros)"""
+    print("\n" + "="*60)
+    print("TESTE 31: Árvores de Expressões")
+    print("="*60)
+    
+    from compiler.lexer import tokenize
+    from compiler.parser import parse_ll1
+    
+    # Árvores e erros esperados: os da gramática recursiva anterior ao
+    # parser por precedência com pilhas explícitas. Não há menos unário:
+    # o '-' vira erro e o fator inválido é recuperado como 0
+    n, i = lambda v: ('num', v), lambda v: ('id', v)
+    fator = "[ERRO SINTÁTICO] Fator inválido: '{}' na linha 1"
+    casos = [
+        ("1 + 2 * 3", ('+', n(1), ('*', n(2), n(3))), []),
+        ("10 - 4 - 3", ('-', ('-', n(10), n(4)), n(3)), []),
+        ("8 / 4 / 2 * 3", ('*', ('/', ('/', n(8), n(4)), n(2)), n(3)), []),
+        ("a < b + 1 == c", ('==', ('<', i('a'), ('+', i('b'), n(1))), i('c')), []),
+        ("(1 + 2) * (3 - f(4, g(5)))",
+         ('*', ('+', n(1), n(2)), ('-', n(3), ('call', 'f', [n(4), ('call', 'g', [n(5)])]))), []),
+        ("((x))", i('x'), []),
+        ("-1", ('-', n(0), n(1)), [fator.format('MINUS')]),
+        ("a * -b", ('-', ('*', i('a'), n(0)), i('b')), [fator.format('MINUS')]),
+        ("1 + * 2", ('+', n(1), ('*', n(0), n(2))), [fator.format('TIMES')]),
+        ("f(1, )", ('call', 'f', [n(1), n(0)]), [fator.format('RPAREN')]),
+        ("(1 + 2", ('+', n(1), n(2)),
+         ["[ERRO SINTÁTICO] Esperado 'RPAREN', encontrado 'SEMICOLON' na linha 1"]),
+    ]
+    for expressao, arvore, erros_esperados in casos:
+        tokens = tokenize(f"int main() {{ int r = {expressao}; return r; }}", backend='scanner')
+        parse_tree, erros = parse_ll1(tokens)
+        assert parse_tree[1][0][3][0] == ('decl_assign', 'r', arvore), f"Árvore errada: {expressao}"
+        assert erros == erros_esperados, f"Erros diferentes: {expressao}"
+    
+    # Argumento sem vírgula: a chamada fecha no primeiro erro
+    parse_tree, erros = parse_ll1(tokenize("int main() { int r = f(a b); return r; }", backend='scanner'))
+    assert parse_tree[1][0][3][0] == ('decl_assign', 'r', ('call', 'f', [i('a')]))
+    assert erros[0] == "[ERRO SINTÁTICO] Esperado 'RPAREN', encontrado 'ID' na linha 1"
+    
+    print(f"✓ {len(casos) + 1} expressões com as árvores da gramática recursiva")
+    print("✓ Teste Árvores de Expressões passou!")
+    return True
+
+
 def run_all_tests():
     """Executa todos os testes"""
     print("\n" + "#"*60)
@@ -234,7 +1437,32 @@ def run_all_tests():
         test_expressions,
         test_optimizations,
         test_semantic_errors,
-        test_nested_calls
+        test_nested_calls,
+        test_lexer_backends,
+        test_streaming_tokens,
+        test_deep_nesting,
+        test_flat_ast,
+        test_flat_symbol_table,
+        test_frame_slots,
+        test_parallel,
+        test_incremental,
+        test_compile_cache,
+        test_batch,
+        test_compile_server,
+        test_compile_async,
+        test_diagnostics,
+        test_columnar_ir,
+        test_inplace_passes,
+        test_cfg,
+        test_liveness,
+        test_ssa,
+        test_emit_ast_parity,
+        test_token_buffer,
+        test_parser_token_codes,
+        test_slotted_nodes,
+        test_visitor_dispatch,
+        test_interned_names,
+        test_expression_trees
     ]
     
     passed = 0
@@ -33,6 +33,11 @@ def main():
         action="store_true",
         help="Gera código assembly"
     )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        help="Diretório do cache de compilação (reaproveita fontes inalterados)"
+    )
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -53,7 +58,8 @@ def main():
             str(input_path),
             args.output,
             optimize=not args.no_optimize,
-            generate_assembly=args.assembly
+            generate_assembly=args.assembly,
+            cache_dir=args.cache_dir
         )
         
         # Cria compilador para imprimir resultados
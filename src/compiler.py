@@ -3,15 +3,18 @@ Pipeline Principal do Compilador
 Orquestra todas as fases de compilação: lexer -> parser -> semantic -> IR -> optimizer -> assembly
 """
 
+import os
 from typing import Optional, Dict, Any
 from .lexer import lexer
 from .parser import parser
 from .semantic import SemanticAnalyzer
-from .ir_generator import IRGenerator
+from .ir_generator import IRGenerator, IRInstruction
 from .optimizer import Optimizer
 from .assembly_generator import AssemblyGenerator
 from .symbol_table import SymbolTable
 from .ast_builder import ASTNode, tuple_to_ast
+from compiler.cache import CompileCache
+from compiler.diagnostics import Diagnostics
 
 
 class CompilationError(Exception):
@@ -123,7 +126,9 @@ class Compiler:
     def _ir_generation(self):
         """Fase 4: Geração de Código Intermediário"""
         try:
-            generator = IRGenerator(self.symbol_table)
+            # Avisos do gerador vão para result["warnings"], não para o stdout
+            diagnostics = Diagnostics(lambda event: self.warnings.append(event.message))
+            generator = IRGenerator(self.symbol_table, diagnostics)
             self.ir_instructions = generator.generate(self.ast)
         except Exception as e:
             self.errors.append(f"Erro na geração de IR: {str(e)}")
@@ -206,8 +211,44 @@ class Compiler:
         print("=" * 60)
 
 
+def _cache_entry(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Parte de um resultado bem-sucedido que vai para o cache em disco"""
+    def rows(instructions):
+        if instructions is None:
+            return None
+        return [[i.op, i.arg1, i.arg2, i.result] for i in instructions]
+    
+    return {
+        "ir": rows(result["ir"]),
+        "optimized_ir": rows(result["optimized_ir"]),
+        "assembly": result["assembly"],
+        "warnings": result["warnings"],
+    }
+
+
+def _result_from_cache(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Resultado no formato de Compiler.compile a partir de uma entrada do cache"""
+    def instructions(rows):
+        if rows is None:
+            return None
+        return [IRInstruction(*row) for row in rows]
+    
+    return {
+        "success": True,
+        "ast": None,
+        "ir": instructions(entry["ir"]),
+        "optimized_ir": instructions(entry["optimized_ir"]),
+        "assembly": entry["assembly"],
+        "symbol_table": None,
+        "errors": [],
+        "warnings": entry["warnings"],
+        "cached": True,
+    }
+
+
 def compile_file(input_file: str, output_file: Optional[str] = None, 
-                 optimize: bool = True, generate_assembly: bool = False) -> Dict[str, Any]:
+                 optimize: bool = True, generate_assembly: bool = False,
+                 cache_dir: Optional[str] = None) -> Dict[str, Any]:
     """
     Compila um arquivo de código fonte
     
@@ -216,6 +257,8 @@ def compile_file(input_file: str, output_file: Optional[str] = None,
         output_file: Caminho do arquivo de saída (opcional)
         optimize: Se True, aplica otimizações
         generate_assembly: Se True, gera código assembly
+        cache_dir: Diretório do cache em disco (opcional); fonte e opções
+                   já compilados são lidos do cache sem recompilar
     
     Returns:
         Dicionário com resultados da compilação
@@ -223,8 +266,21 @@ def compile_file(input_file: str, output_file: Optional[str] = None,
     with open(input_file, 'r') as f:
         source_code = f.read()
     
-    compiler = Compiler(optimize=optimize, generate_assembly=generate_assembly)
-    result = compiler.compile(source_code)
+    result = None
+    if cache_dir is not None:
+        # A versão do cache é o hash dos fontes de src/, não de compiler/
+        cache = CompileCache(cache_dir, package=os.path.dirname(os.path.abspath(__file__)))
+        key = cache.key(source_code, pipeline="src", optimize=optimize,
+                        generate_assembly=generate_assembly)
+        entry = cache.load(key)
+        if entry is not None:
+            result = _result_from_cache(entry)
+    
+    if result is None:
+        compiler = Compiler(optimize=optimize, generate_assembly=generate_assembly)
+        result = compiler.compile(source_code)
+        if cache_dir is not None and result["success"]:
+            cache.store(key, _cache_entry(result))
     
     if output_file and result["success"]:
         # Salva o código IR
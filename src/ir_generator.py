@@ -6,6 +6,7 @@ Gera código TAC (Three-Address Code) a partir da AST
 from typing import List, Optional, Union
 from .ast_builder import ASTNode, tuple_to_ast
 from .symbol_table import SymbolTable
+from compiler.diagnostics import Diagnostics, QUIET
 
 
 class IRInstruction:
@@ -47,9 +48,11 @@ class IRGenerator:
     Converte AST em código TAC (Three-Address Code)
     """
     
-    def __init__(self, symbol_table: Optional[SymbolTable] = None):
+    def __init__(self, symbol_table: Optional[SymbolTable] = None,
+                 diagnostics: Optional[Diagnostics] = None):
         self.instructions: List[IRInstruction] = []
         self.symbol_table = symbol_table or SymbolTable()
+        self.diagnostics = diagnostics or QUIET  # avisos (padrão: descartados)
         self.temp_count = 0
         self.label_count = 0
     
@@ -171,7 +174,7 @@ class IRGenerator:
             var_name = node.value
             # Verifica se variável existe
             if not self.symbol_table.lookup(var_name):
-                print(f"Warning: Variável '{var_name}' usada antes de ser declarada")
+                self.diagnostics.warning("ir", f"Warning: Variável '{var_name}' usada antes de ser declarada")
             return var_name
         
         elif node_type == "function_call":